@@ -0,0 +1,95 @@
+"""Compara o endpoint de analytics (snapshot colunar) com reprocessar o CSV.
+
+Gera um log sintético de --requests solicitações e mede: construção inicial
+do snapshot, atualização incremental após novos appends, agregação sobre o
+snapshot e a mesma agregação feita com pandas lendo o CSV inteiro.
+
+Uso: python -m benchmarks.bench_analytics [--clients N] [--requests N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.datasets import generate_dataset, write_limit_requests
+from benchmarks.stubs import use_data_dir
+
+
+def _timed(func, repeat: int = 1) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def pandas_reparse(settings) -> None:
+    import pandas as pd
+
+    requests = pd.read_csv(settings.limit_requests_csv_path, dtype={"cpf_cliente": str})
+    clients = pd.read_csv(settings.clients_csv_path, dtype={"cpf": str})
+    joined = requests.merge(
+        clients[["cpf", "score"]], left_on="cpf_cliente", right_on="cpf", how="left"
+    )
+    joined.groupby("status_pedido").agg(
+        count=("cpf_cliente", "size"),
+        avg_current=("limite_atual", "mean"),
+        avg_requested=("novo_limite_solicitado", "mean"),
+        avg_score=("score", "mean"),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=1_000_000)
+    parser.add_argument("--appended", type=int, default=1_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-analytics-") as data_dir:
+        data_path = Path(data_dir)
+        generate_dataset(data_path, args.clients, args.requests)
+        use_data_dir(data_path)
+
+        from src.config import get_settings
+        from src.services.analytics_service import AnalyticsService
+
+        settings = get_settings()
+        service = AnalyticsService(settings)
+
+        def summarize() -> None:
+            asyncio.run(service.summarize("status"))
+
+        results = {"snapshot build": _timed(summarize)}
+
+        extra = data_path / "extra.csv"
+        write_limit_requests(extra, args.appended, args.clients, seed=1)
+        tail = extra.read_text().split("\n", 1)[1]
+        with open(settings.limit_requests_csv_path, "a") as f:
+            f.write(tail)
+        results[f"incremental (+{args.appended:,} rows)"] = _timed(summarize)
+
+        results["summarize (status)"] = _timed(summarize, repeat=20)
+        results["summarize (score_band)"] = _timed(
+            lambda: asyncio.run(service.summarize("score_band")), repeat=20
+        )
+        results["pandas re-parse + groupby"] = _timed(
+            lambda: pandas_reparse(settings), repeat=3
+        )
+
+        size_mb = settings.analytics_snapshot_path.stat().st_size / 1024 / 1024
+        csv_mb = settings.limit_requests_csv_path.stat().st_size / 1024 / 1024
+
+    print(f"{args.requests:,} requests, snapshot {size_mb:.1f} MB vs CSV {csv_mb:.1f} MB")
+    for name, ms in results.items():
+        print(f"{name:<32}{ms:>12.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
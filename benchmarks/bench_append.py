@@ -0,0 +1,93 @@
+"""Compara append_limit_request por linha com o group commit.
+
+Dispara --requests appends com --concurrency chamadores simultâneos em três
+modos: "per-row" (caminho anterior: lock e escrita por linha, sem fsync),
+"per-row+fsync" (mesma durabilidade do group commit, uma linha por vez) e
+"group-commit" (lotes com um lock, uma escrita e um fsync por flush).
+
+Uso: python -m benchmarks.bench_append [--requests N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.stubs import use_data_dir, write_fixture_data
+
+MODES = ["per-row", "per-row+fsync", "group-commit"]
+
+
+def _request(index: int) -> dict:
+    return {
+        "cpf_cliente": "12345678901",
+        "data_hora_solicitacao": datetime.now(timezone.utc).isoformat(),
+        "limite_atual": 5000.0,
+        "novo_limite_solicitado": 5000.0 + index,
+        "status_pedido": "pending",
+    }
+
+
+async def run_mode(mode: str, requests: int, concurrency: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench-append-") as data_dir:
+        os.environ["LIMIT_REQUEST_GROUP_COMMIT"] = str(mode == "group-commit")
+        use_data_dir(write_fixture_data(Path(data_dir)))
+        from src.services.csv_service import CSVService
+
+        service = CSVService()
+
+        async def append(row: dict) -> None:
+            if mode == "per-row+fsync":
+                service._write_limit_requests([row])
+            else:
+                await service.append_limit_request(row)
+
+        queue = list(range(requests))
+        latencies: list[float] = []
+
+        async def worker() -> None:
+            while queue:
+                row = _request(queue.pop())
+                start = time.perf_counter()
+                await append(row)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        writer = service._limit_request_writer
+        latencies.sort()
+        return {
+            "rows_per_second": requests / elapsed,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+            "writes": writer.batches_written if mode == "group-commit" else requests,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    args = parser.parse_args()
+
+    print(f"{'mode':<16}{'rows/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'writes':>10}")
+    for mode in args.modes:
+        result = asyncio.run(run_mode(mode, args.requests, args.concurrency))
+        print(
+            f"{mode:<16}{result['rows_per_second']:>12,.0f}"
+            f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+            f"{result['writes']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
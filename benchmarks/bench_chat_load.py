@@ -0,0 +1,342 @@
+"""Carga das rotas /api/unified/chat e /api/chat com conversas roteirizadas.
+
+Executa conversas completas (autenticação, limite, aumento, entrevista e
+câmbio) com LLM e câmbio simulados, e reporta throughput, p50/p95/p99 por
+estado e crescimento de memória. Com --check compara throughput e p50/p95
+gerais com a baseline salva e termina com código 1 em caso de regressão.
+
+Uso:
+    python -m benchmarks.bench_chat_load [--users N] [--iterations N]
+    python -m benchmarks.bench_chat_load --transport socket
+    python -m benchmarks.bench_chat_load --save-baseline
+    python -m benchmarks.bench_chat_load --check
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import resource
+import socket
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.stubs import (
+    StubExchangeAgent,
+    StubLLMService,
+    use_data_dir,
+    write_fixture_data,
+)
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "chat_load.json"
+
+AUTH = ["12345678901", "15/05/1990"]
+
+UNIFIED_SCRIPTS = {
+    "auth": AUTH,
+    "limit": AUTH + ["qual meu limite de crédito?"],
+    "increase": AUTH + ["quero aumento de limite", "15000"],
+    "interview": AUTH
+    + ["quero atualizar meu perfil", "6000", "CLT", "3000", "2", "não"],
+    "exchange": AUTH + ["cotação do dólar", "USD", "BRL"],
+}
+
+CHAT_SCRIPTS = {
+    "auth": ["meu cpf é 12345678901", "nasci em 15/05/1990"],
+    "limit": [
+        "meu cpf é 12345678901",
+        "nasci em 15/05/1990",
+        "qual meu limite de crédito?",
+    ],
+    "exchange": [
+        "meu cpf é 12345678901",
+        "nasci em 15/05/1990",
+        "cotação do dólar",
+        "tchau",
+    ],
+}
+
+ENDPOINTS = {
+    "unified": ("/unified/init", "/unified/chat", UNIFIED_SCRIPTS),
+    "chat": ("/chat/init", "/chat", CHAT_SCRIPTS),
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _latency_stats(values: list[float]) -> dict:
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+    }
+
+
+class LoadResult:
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.conversations = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self.rss_growth = 0
+        self.sessions = 0
+
+    @property
+    def turns(self) -> int:
+        return sum(len(values) for values in self.samples.values())
+
+    def summary(self) -> dict:
+        every = [value for values in self.samples.values() for value in values]
+        return {
+            "throughput": self.turns / self.elapsed if self.elapsed else 0.0,
+            "conversations_per_second": (
+                self.conversations / self.elapsed if self.elapsed else 0.0
+            ),
+            "errors": self.errors,
+            "rss_growth_kb_per_conversation": (
+                self.rss_growth / 1024 / self.conversations
+                if self.conversations
+                else 0.0
+            ),
+            "sessions_retained": self.sessions,
+            "overall": _latency_stats(every),
+            "states": {
+                state: _latency_stats(values)
+                for state, values in sorted(self.samples.items())
+            },
+        }
+
+
+async def run_conversation(
+    client: AsyncClient, endpoint: str, messages: list[str], result: LoadResult
+) -> None:
+    init_path, chat_path, _ = ENDPOINTS[endpoint]
+
+    start = time.perf_counter()
+    response = await client.post(init_path)
+    result.samples["init"].append(time.perf_counter() - start)
+    data = response.json()
+    session_id, state = data["session_id"], data["state"]
+
+    for message in messages:
+        start = time.perf_counter()
+        response = await client.post(
+            chat_path, json={"session_id": session_id, "message": message}
+        )
+        result.samples[state].append(time.perf_counter() - start)
+        if response.status_code != 200:
+            result.errors += 1
+            return
+        state = response.json()["state"]
+
+    result.conversations += 1
+
+
+async def run_endpoint(
+    client: AsyncClient, endpoint: str, users: int, iterations: int
+) -> LoadResult:
+    scripts = list(ENDPOINTS[endpoint][2].values())
+    result = LoadResult(endpoint)
+
+    async def user(index: int) -> None:
+        for i in range(iterations):
+            messages = scripts[(index + i) % len(scripts)]
+            await run_conversation(client, endpoint, messages, result)
+
+    gc.collect()
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    result.elapsed = time.perf_counter() - start
+    gc.collect()
+    result.rss_growth = max(0, rss_bytes() - rss_before)
+    return result
+
+
+def build_app(data_dir: Path, llm_latency_ms: float, exchange_latency_ms: float):
+    """Monta a aplicação com provedores simulados e dados temporários"""
+    use_data_dir(write_fixture_data(data_dir))
+
+    from src.api import dependencies
+    from src.main import app
+
+    # Os stubs entram pelos singletons das dependências: app.dependency_overrides
+    # faz o FastAPI reanalisar as subdependências a cada requisição
+    for name in dir(dependencies):
+        factory = getattr(dependencies, name)
+        if name.startswith("get_") and hasattr(factory, "override"):
+            factory.cache_clear()
+    dependencies.get_llm_service.override(StubLLMService(llm_latency_ms))
+    dependencies.get_exchange_agent.override(StubExchangeAgent(exchange_latency_ms))
+
+    agents = {
+        "unified": dependencies.get_orchestrator(),
+        "chat": dependencies.get_chat_agent(),
+    }
+    return app, agents
+
+
+@asynccontextmanager
+async def serve(app, transport: str) -> AsyncIterator[AsyncClient]:
+    if transport == "asgi":
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench/api"
+        ) as client:
+            yield client
+        return
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn is required for --transport socket")
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, log_level="warning", lifespan="off", access_log=False)
+    )
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    try:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}/api") as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await task
+
+
+def compare(
+    current: dict, baseline: dict, tolerance: float, min_delta_ms: float
+) -> list[str]:
+    regressions = []
+    for endpoint, summary in current.items():
+        reference = baseline.get(endpoint)
+        if reference is None:
+            continue
+
+        floor = reference["throughput"] * (1 - tolerance)
+        if summary["throughput"] < floor:
+            regressions.append(
+                f"{endpoint}: throughput {summary['throughput']:.0f}/s "
+                f"< {floor:.0f}/s"
+            )
+
+        overall, ref = summary["overall"], reference["overall"]
+        for key, allowed in (("p50_ms", tolerance), ("p95_ms", 2 * tolerance)):
+            limit = max(ref[key] * (1 + allowed), ref[key] + min_delta_ms)
+            if overall[key] > limit:
+                regressions.append(
+                    f"{endpoint}: {key[:3]} {overall[key]:.2f}ms > {limit:.2f}ms"
+                )
+    return regressions
+
+
+def print_report(summaries: dict) -> None:
+    for endpoint, summary in summaries.items():
+        print(
+            f"\n{endpoint}: {summary['throughput']:,.0f} turns/s, "
+            f"{summary['conversations_per_second']:,.1f} conversations/s, "
+            f"{summary['errors']} errors, "
+            f"{summary['rss_growth_kb_per_conversation']:.1f} KB RSS/conversation, "
+            f"{summary['sessions_retained']} sessions retained"
+        )
+        print(f"{'state':<24}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        rows = [*summary["states"].items(), ("overall", summary["overall"])]
+        for state, stats in rows:
+            print(
+                f"{state:<24}{stats['count']:>8}{stats['p50_ms']:>10.2f}"
+                f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+            )
+
+
+async def run(args: argparse.Namespace) -> dict:
+    summaries = {}
+    with tempfile.TemporaryDirectory(prefix="bench-chat-") as data_dir:
+        app, agents = build_app(
+            Path(data_dir), args.llm_latency_ms, args.exchange_latency_ms
+        )
+        async with serve(app, args.transport) as client:
+            for endpoint in args.endpoints:
+                await run_endpoint(client, endpoint, users=2, iterations=2)
+                agents[endpoint]._sessions.clear()
+
+                result = await run_endpoint(
+                    client, endpoint, args.users, args.iterations
+                )
+                result.sessions = len(agents[endpoint]._sessions)
+                summaries[endpoint] = result.summary()
+    return summaries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument(
+        "--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS)
+    )
+    parser.add_argument("--transport", choices=["asgi", "socket"], default="asgi")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--exchange-latency-ms", type=float, default=0.0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.35)
+    parser.add_argument("--min-delta-ms", type=float, default=2.0)
+    parser.add_argument("--json", type=Path, help="write the raw results here")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    summaries = asyncio.run(run(args))
+    print_report(summaries)
+
+    if args.json:
+        args.json.write_text(json.dumps(summaries, indent=2))
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(summaries, indent=2) + "\n")
+        print(f"\nbaseline saved to {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            raise SystemExit(f"no baseline at {args.baseline}")
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(summaries, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("\nregressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nno regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
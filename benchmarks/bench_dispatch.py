@@ -0,0 +1,125 @@
+"""Mede o custo de despacho do roteador de estados do orquestrador.
+
+Compara a cadeia de `if session.state == ...` / `in [...]` usada antes com a
+consulta à tabela de transições (Orchestrator._dispatch_state), com handlers
+que não fazem nada, para isolar o custo do roteamento em cada estado.
+
+Uso: python -m benchmarks.bench_dispatch [--iterations N]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.stubs import use_data_dir, write_fixture_data
+
+
+def _legacy_dispatch(state, states, handlers):
+    S = states
+    if state == S.COLLECTING_CPF:
+        return handlers["cpf"]
+    if state == S.COLLECTING_BIRTHDATE:
+        return handlers["birthdate"]
+    if state == S.AUTHENTICATED:
+        return handlers["authenticated"]
+    if state in [S.CREDIT_FLOW, S.CREDIT_INCREASE_FLOW]:
+        return handlers["credit"]
+    if state in [
+        S.INTERVIEW_FLOW,
+        S.INTERVIEW_INCOME,
+        S.INTERVIEW_EMPLOYMENT,
+        S.INTERVIEW_EXPENSES,
+        S.INTERVIEW_DEPENDENTS,
+        S.INTERVIEW_DEBTS,
+    ]:
+        if state == S.INTERVIEW_INCOME:
+            return handlers["interview"]
+        if state == S.INTERVIEW_EMPLOYMENT:
+            return handlers["interview"]
+        if state == S.INTERVIEW_EXPENSES:
+            return handlers["interview"]
+        if state == S.INTERVIEW_DEPENDENTS:
+            return handlers["interview"]
+        if state == S.INTERVIEW_DEBTS:
+            return handlers["interview"]
+        return handlers["interview"]
+    if state in [S.EXCHANGE_FLOW, S.EXCHANGE_FROM, S.EXCHANGE_TO]:
+        if state == S.EXCHANGE_FROM:
+            return handlers["exchange"]
+        if state == S.EXCHANGE_TO:
+            return handlers["exchange"]
+        return handlers["exchange"]
+    return None
+
+
+async def _noop(*args):
+    return None
+
+
+async def run(iterations: int) -> list[tuple[str, float, float]]:
+    from src.agents.orchestrator import (
+        TRANSITIONS,
+        Orchestrator,
+        OrchestratorSession,
+        OrchestratorState,
+        Transition,
+    )
+
+    orchestrator = Orchestrator()
+    for state in TRANSITIONS:
+        orchestrator.register_transition(state, Transition(_noop))
+    handlers = {
+        name: _noop
+        for name in (
+            "cpf",
+            "birthdate",
+            "authenticated",
+            "credit",
+            "interview",
+            "exchange",
+        )
+    }
+
+    results = []
+    session = OrchestratorSession()
+    for state in TRANSITIONS:
+        session.state = state
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await _legacy_dispatch(session.state, OrchestratorState, handlers)(
+                orchestrator, "s", session, "m"
+            )
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await orchestrator._dispatch_state("s", session, "m")
+        table = time.perf_counter() - start
+
+        results.append(
+            (state.value, legacy / iterations * 1e9, table / iterations * 1e9)
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-dispatch-") as data_dir:
+        use_data_dir(write_fixture_data(Path(data_dir)))
+        results = asyncio.run(run(args.iterations))
+
+    print(f"{'state':<24}{'if-chain ns':>14}{'table ns':>12}")
+    for state, legacy, table in results:
+        print(f"{state:<24}{legacy:>14.0f}{table:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
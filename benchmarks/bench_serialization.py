@@ -0,0 +1,114 @@
+"""Mede o custo de montar e serializar uma resposta do chat unificado.
+
+Separa as duas etapas de cada resposta: construção do UnifiedChatResponse
+(com validação vs model_construct, que nas versões atuais do Pydantic é o
+mais lento dos dois por rodar em Python) e codificação para JSON
+(model_dump + json.dumps, como o JSONResponse padrão; model_dump + orjson,
+como a FastJSONResponse; e model_dump_json, o caminho nativo do Pydantic).
+Inclui também o corpo pré-serializado de boas-vindas de /unified/init. Os
+números são microssegundos por resposta.
+
+Uso: python -m benchmarks.bench_serialization [--iterations N]
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections.abc import Callable
+
+from src.models.schemas import RedirectAction, UnifiedChatResponse
+
+
+def _fields() -> dict:
+    return {
+        "session_id": str(uuid.uuid4()),
+        "message": (
+            "Seu limite atual: R$ 15.000,00\n"
+            "Disponível: R$ 12.500,00\n"
+            "Score: 750\n\n"
+            "Deseja solicitar aumento de limite?"
+        ),
+        "state": "authenticated",
+        "authenticated": True,
+        "token": "eyJhbGciOiJIUzI1NiJ9." + "x" * 120,
+        "current_agent": "credit",
+        "available_actions": [
+            "consultar_limite",
+            "solicitar_aumento",
+            "cotacao_cambio",
+            "atualizar_perfil",
+        ],
+        "redirect_suggestion": RedirectAction(
+            should_redirect=True,
+            target_agent="credit_increase",
+            reason="Usuário pode querer aumentar limite após ver o atual",
+        ),
+    }
+
+
+def _per_call_us(function: Callable[[], object], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run(iterations: int) -> list[tuple[str, float]]:
+    from src.agents.orchestrator import _WELCOME_RESPONSE
+
+    fields = _fields()
+    model = UnifiedChatResponse(**fields)
+    session_id = fields["session_id"]
+
+    def std_json() -> bytes:
+        return json.dumps(
+            model.model_dump(mode="json"),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    cases: list[tuple[str, Callable[[], object]]] = [
+        ("construct: validated", lambda: UnifiedChatResponse(**fields)),
+        (
+            "construct: model_construct",
+            lambda: UnifiedChatResponse.model_construct(**fields),
+        ),
+        ("encode: model_dump + json.dumps", std_json),
+        ("encode: model_dump_json", model.model_dump_json),
+        ("init: prepared bytes", lambda: _WELCOME_RESPONSE.render(session_id)),
+    ]
+
+    try:
+        import orjson
+    except ImportError:
+        print("orjson not installed, skipping the orjson case")
+    else:
+        cases.insert(
+            3,
+            (
+                "encode: model_dump + orjson",
+                lambda: orjson.dumps(
+                    model.model_dump(mode="json"), option=orjson.OPT_NON_STR_KEYS
+                ),
+            ),
+        )
+
+    return [(name, _per_call_us(function, iterations)) for name, function in cases]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'case':<36}{'us/response':>12}")
+    for name, us in run(args.iterations):
+        print(f"{name:<36}{us:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Mede a memória por sessão viva do orquestrador e do chat otimizado.
+
+Cria --sessions sessões com --turns pares de mensagens (usuário e assistente)
+e mede com tracemalloc os bytes alocados por sessão. O modo "before" recria
+o layout anterior (classes com __dict__ e histórico como lista de dicts sem
+limite); "after" usa as classes atuais, com __slots__, ConversationMessage e
+histórico limitado por CONVERSATION_HISTORY_LIMIT. O texto das mensagens é
+o mesmo objeto em todas as sessões, então a medida isola o custo da estrutura.
+
+Uso: python -m benchmarks.bench_session_memory [--sessions N] [--turns N]
+"""
+
+import argparse
+import gc
+import tempfile
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+from benchmarks.stubs import use_data_dir, write_fixture_data
+
+USER_MESSAGE = "quero saber meu limite de crédito"
+ASSISTANT_MESSAGE = "Seu limite atual é de R$ 5.000,00. Posso ajudar com mais algo?"
+
+
+class LegacyOrchestratorSession:
+    def __init__(self):
+        from src.agents.orchestrator import AgentType, OrchestratorState
+
+        self.state = OrchestratorState.WELCOME
+        self.cpf = None
+        self.birthdate = None
+        self.token = None
+        self.current_agent = AgentType.TRIAGE
+        self.collected_data = {}
+        self.pending_redirect = None
+        self.conversation_history = []
+        self.client_snapshot = None
+
+
+class LegacySessionData:
+    def __init__(self):
+        from src.agents.optimized_chat import ConversationState
+
+        self.state = ConversationState.WELCOME
+        self.cpf = None
+        self.birthdate = None
+        self.token = None
+        self.conversation_history = []
+        self.collected_data = {}
+
+
+def _fill_legacy(session, index: int, turns: int) -> None:
+    session.cpf = f"{index:011d}"
+    session.birthdate = date(1990, 5, 15)
+    for _ in range(turns):
+        session.conversation_history.append({"role": "user", "content": USER_MESSAGE})
+        session.conversation_history.append(
+            {"role": "assistant", "content": ASSISTANT_MESSAGE}
+        )
+
+
+def _fill(session, index: int, turns: int) -> None:
+    from src.models.domain import ConversationMessage, MessageRole
+
+    session.cpf = f"{index:011d}"
+    session.birthdate = date(1990, 5, 15)
+    for _ in range(turns):
+        session.conversation_history.append(
+            ConversationMessage(MessageRole.USER, USER_MESSAGE)
+        )
+        session.conversation_history.append(
+            ConversationMessage(MessageRole.ASSISTANT, ASSISTANT_MESSAGE)
+        )
+
+
+def bytes_per_session(factory, fill, sessions: int, turns: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    live = {}
+    for index in range(sessions):
+        session = factory()
+        fill(session, index, turns)
+        live[f"session-{index}"] = session
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del live
+    return used / sessions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--turns", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-session-") as data_dir:
+        use_data_dir(write_fixture_data(Path(data_dir)))
+        from src.agents.optimized_chat import SessionData
+        from src.agents.orchestrator import OrchestratorSession
+        from src.config import get_settings
+
+        cases = {
+            "OrchestratorSession": (
+                (LegacyOrchestratorSession, _fill_legacy),
+                (OrchestratorSession, _fill),
+            ),
+            "SessionData": (
+                (LegacySessionData, _fill_legacy),
+                (SessionData, _fill),
+            ),
+        }
+
+        limit = get_settings().conversation_history_limit
+        print(
+            f"{args.sessions:,} sessions, {args.turns * 2} messages each "
+            f"(history limit {limit})"
+        )
+        print(f"{'session':<22}{'before B':>12}{'after B':>12}{'saved':>8}")
+        for name, (before, after) in cases.items():
+            before_bytes = bytes_per_session(*before, args.sessions, args.turns)
+            after_bytes = bytes_per_session(*after, args.sessions, args.turns)
+            saved = 1 - after_bytes / before_bytes
+            print(f"{name:<22}{before_bytes:>12,.0f}{after_bytes:>12,.0f}{saved:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Mede as operações do CSVService em bases sintéticas de tamanho crescente.
+
+Para cada tamanho gera clientes e log de solicitações com benchmarks.datasets
+e cronometra get_client_by_cpf (início, meio, fim e ausente),
+update_client_score, append_limit_request, query_limit_requests (por CPF)
+e read_clients. Com --segmented o log de solicitações usa os segmentos
+indexados em vez do arquivo único e com --client-table as buscas por CPF
+usam o snapshot binário mapeado em memória. Operações cuja
+chamada passa de --max-seconds não são repetidas nos tamanhos seguintes.
+
+Uso:
+    python -m benchmarks.bench_storage [--sizes 10000 100000 1000000]
+    python -m benchmarks.bench_storage --segmented --client-table
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.datasets import cpf_for_index, generate_dataset
+from benchmarks.stubs import use_data_dir
+
+MISSING_CPF = "00000000000"
+
+
+def _operations(size: int) -> dict[str, Callable[[object], Awaitable]]:
+    first, middle, last = (cpf_for_index(i) for i in (0, size // 2, size - 1))
+    request = {
+        "cpf_cliente": middle,
+        "data_hora_solicitacao": datetime.now(timezone.utc).isoformat(),
+        "limite_atual": 5000.0,
+        "novo_limite_solicitado": 10000.0,
+        "status_pedido": "pending",
+    }
+    return {
+        "get_client_by_cpf[first]": lambda s: s.get_client_by_cpf(first),
+        "get_client_by_cpf[middle]": lambda s: s.get_client_by_cpf(middle),
+        "get_client_by_cpf[last]": lambda s: s.get_client_by_cpf(last),
+        "get_client_by_cpf[missing]": lambda s: s.get_client_by_cpf(MISSING_CPF),
+        "update_client_score": lambda s: s.update_client_score(middle, 720),
+        "append_limit_request": lambda s: s.append_limit_request(request),
+        "query_limit_requests[cpf]": lambda s: s.query_limit_requests(cpf=middle),
+        "read_clients": lambda s: s.read_clients(),
+    }
+
+
+async def measure(
+    operation: Callable[[object], Awaitable], service: object, repeat: int
+) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await operation(service)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def run_size(
+    size: int, repeat: int, max_seconds: float, skipped: set[str]
+) -> dict[str, float | None]:
+    results: dict[str, float | None] = {}
+    with tempfile.TemporaryDirectory(prefix="bench-storage-") as data_dir:
+        start = time.perf_counter()
+        generate_dataset(Path(data_dir), clients=size, requests=size)
+        print(f"  generated {size:,} rows in {time.perf_counter() - start:.1f}s")
+
+        use_data_dir(Path(data_dir))
+        from src.services.csv_service import CSVService
+
+        service = CSVService()
+        # Migra o log para os segmentos e compila a tabela fora da medição
+        await service.query_limit_requests(cpf=MISSING_CPF)
+        await service.get_client_by_cpf(MISSING_CPF)
+        for name, operation in _operations(size).items():
+            if name in skipped:
+                results[name] = None
+                continue
+
+            first = await measure(operation, service, 1)
+            if first[0] > max_seconds:
+                skipped.add(name)
+                results[name] = first[0]
+                continue
+
+            timings = await measure(operation, service, repeat)
+            results[name] = statistics.median(timings)
+    return results
+
+
+def print_report(sizes: list[int], table: dict[int, dict], budget_ms: float) -> None:
+    names = list(next(iter(table.values())))
+    print(f"\nmedian ms per call (* = above {budget_ms:g}ms budget)")
+    print(f"{'operation':<30}" + "".join(f"{size:>14,}" for size in sizes))
+    for name in names:
+        cells = []
+        for size in sizes:
+            value = table[size].get(name)
+            if value is None:
+                cells.append(f"{'skipped':>14}")
+                continue
+            ms = value * 1000
+            marker = "*" if ms > budget_ms else " "
+            cells.append(f"{ms:>13.2f}{marker}")
+        print(f"{name:<30}" + "".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--segmented", action="store_true")
+    parser.add_argument("--client-table", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["LIMIT_REQUEST_LOG_SEGMENTED"] = str(args.segmented)
+    os.environ["CLIENT_TABLE_ENABLED"] = str(args.client_table)
+
+    table: dict[int, dict] = {}
+    skipped: set[str] = set()
+    for size in args.sizes:
+        print(f"size {size:,}")
+        table[size] = asyncio.run(
+            run_size(size, args.repeat, args.max_seconds, skipped)
+        )
+
+    print_report(args.sizes, table, args.budget_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compara o codec JWT interno com python-jose (encode/decode e tempo de import).
+
+Uso: python -m benchmarks.bench_token_codec [--iterations N]
+"""
+
+import argparse
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from src.services.token_codec import HMACTokenCodec
+
+SECRET = "benchmark-secret-key"
+
+IMPORT_STATEMENTS = {
+    "token_codec": "import src.services.token_codec",
+    "python-jose": "from jose import jwt",
+}
+
+
+def _claims() -> dict:
+    now = datetime.now(timezone.utc)
+    return {"sub": "12345678901", "exp": now + timedelta(minutes=15), "iat": now}
+
+
+def measure_import(statement: str, repeat: int = 5) -> float | None:
+    code = (
+        "import time;t=time.perf_counter();"
+        f"{statement};"
+        "print(time.perf_counter()-t)"
+    )
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        timings.append(float(result.stdout.strip()))
+    return min(timings)
+
+
+def measure_codec(encode, decode, iterations: int) -> tuple[float, float]:
+    claims = _claims()
+    token = encode(claims)
+    encode_seconds = timeit.timeit(lambda: encode(claims), number=iterations)
+    decode_seconds = timeit.timeit(lambda: decode(token), number=iterations)
+    return iterations / encode_seconds, iterations / decode_seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    codec = HMACTokenCodec(SECRET)
+    results = {
+        "token_codec": measure_codec(codec.encode, codec.decode, args.iterations)
+    }
+
+    try:
+        from jose import jwt
+    except ImportError:
+        print("python-jose not installed, skipping comparison")
+    else:
+        results["python-jose"] = measure_codec(
+            lambda claims: jwt.encode(claims, SECRET, algorithm="HS256"),
+            lambda token: jwt.decode(token, SECRET, algorithms=["HS256"]),
+            args.iterations,
+        )
+        claims = _claims()
+        assert codec.encode(claims) == jwt.encode(
+            claims, SECRET, algorithm="HS256"
+        ), "wire format mismatch"
+
+    print(f"{'codec':<14}{'encode/s':>12}{'decode/s':>12}{'import ms':>12}")
+    for name, (encode_rate, decode_rate) in results.items():
+        import_seconds = measure_import(IMPORT_STATEMENTS[name])
+        import_ms = f"{import_seconds * 1000:.1f}" if import_seconds else "n/a"
+        print(f"{name:<14}{encode_rate:>12,.0f}{decode_rate:>12,.0f}{import_ms:>12}")
+
+
+if __name__ == "__main__":
+    main()
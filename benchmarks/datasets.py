@@ -0,0 +1,204 @@
+"""Gerador de bases sintéticas grandes para testar os caminhos de armazenamento.
+
+Gera clientes com CPFs válidos (dígitos verificadores corretos e únicos),
+a tabela de score e um log de solicitações de aumento, no mesmo formato
+dos CSVs de src/data. As linhas são escritas em streaming, então 10^7
+registros não precisam caber em memória.
+
+Uso:
+    python -m benchmarks.datasets OUT_DIR --clients 100000 --requests 1000000
+"""
+
+import argparse
+import csv
+import random
+import time
+from bisect import bisect_right
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from benchmarks.stubs import SCORE_LIMITS
+
+# Bases de 9 dígitos com todos os dígitos iguais geram CPFs inválidos
+REPDIGIT_BASES = [int(str(d) * 9) for d in range(10)]
+_REPDIGIT_THRESHOLDS = [base - i for i, base in enumerate(REPDIGIT_BASES)]
+CPF_BASES = 10**9 - len(REPDIGIT_BASES)
+# Coprimo com CPF_BASES: i -> (i * STRIDE) % CPF_BASES é uma permutação
+STRIDE = 982_451_653
+CHUNK_ROWS = 10_000
+
+FIRST_NAMES = [
+    "Ana",
+    "Bruno",
+    "Carla",
+    "Daniel",
+    "Eduarda",
+    "Felipe",
+    "Gabriela",
+    "Henrique",
+    "Isabela",
+    "João",
+    "Larissa",
+    "Marcos",
+    "Natália",
+    "Otávio",
+    "Paula",
+    "Rafael",
+]
+LAST_NAMES = [
+    "Almeida",
+    "Barbosa",
+    "Cardoso",
+    "Costa",
+    "Ferreira",
+    "Gomes",
+    "Lima",
+    "Martins",
+    "Oliveira",
+    "Pereira",
+    "Ribeiro",
+    "Santos",
+    "Silva",
+    "Souza",
+]
+STATUSES = ["approved", "denied", "pending"]
+
+SCORE_TABLE = [
+    tuple(float(value) for value in line.split(","))
+    for line in SCORE_LIMITS.strip().splitlines()[1:]
+]
+LIMITS = [limit for _, _, limit in SCORE_TABLE]
+INCREASES = [1000.0, 5000.0, 10000.0, 50000.0]
+
+
+def cpf_check_digits(base: str) -> str:
+    digits = list(map(int, base))
+    first = sum(d * w for d, w in zip(digits, range(10, 1, -1))) * 10 % 11 % 10
+    second = sum(d * w for d, w in zip(digits, range(11, 2, -1))) + first * 2
+    return f"{first}{second * 10 % 11 % 10}"
+
+
+def is_valid_cpf(cpf: str) -> bool:
+    if len(cpf) != 11 or not cpf.isdigit() or len(set(cpf)) == 1:
+        return False
+    return cpf_check_digits(cpf[:9]) == cpf[9:]
+
+
+def cpf_for_index(index: int, seed: int = 0) -> str:
+    """CPF determinístico e único para cada índice (0 <= index < ~10^9)"""
+    value = (index * STRIDE + seed) % CPF_BASES
+    base = f"{value + bisect_right(_REPDIGIT_THRESHOLDS, value):09d}"
+    return base + cpf_check_digits(base)
+
+
+def limit_for_score(score: int) -> float:
+    for score_min, score_max, limit in SCORE_TABLE:
+        if score_min <= score <= score_max:
+            return limit
+    return 0.0
+
+
+def _client_rows(count: int, seed: int) -> Iterator[list]:
+    rng = random.Random(seed)
+    first_day = date(1950, 1, 1).toordinal()
+    span_days = date(2005, 12, 31).toordinal() - first_day
+    for index in range(count):
+        score = rng.randint(0, 1000)
+        yield [
+            cpf_for_index(index, seed),
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            date.fromordinal(first_day + rng.randrange(span_days)).isoformat(),
+            score,
+            f"{limit_for_score(score):.2f}",
+        ]
+
+
+def _request_rows(count: int, clients: int, seed: int) -> Iterator[list]:
+    rng = random.Random(seed + 1)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    step = timedelta(days=365) / max(count, 1)
+    for index in range(count):
+        current = rng.choice(LIMITS)
+        yield [
+            cpf_for_index(rng.randrange(clients), seed),
+            (start + step * index).isoformat(),
+            current,
+            current + rng.choice(INCREASES),
+            rng.choice(STATUSES),
+        ]
+
+
+def _write_rows(path: Path, header: list[str], rows: Iterator[list]) -> int:
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        chunk: list[list] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= CHUNK_ROWS:
+                writer.writerows(chunk)
+                written += len(chunk)
+                chunk.clear()
+        writer.writerows(chunk)
+        written += len(chunk)
+    return written
+
+
+def write_clients(path: Path, count: int, seed: int = 0) -> int:
+    return _write_rows(
+        path,
+        ["cpf", "nome", "data_nascimento", "score", "limite_atual"],
+        _client_rows(count, seed),
+    )
+
+
+def write_limit_requests(path: Path, count: int, clients: int, seed: int = 0) -> int:
+    return _write_rows(
+        path,
+        [
+            "cpf_cliente",
+            "data_hora_solicitacao",
+            "limite_atual",
+            "novo_limite_solicitado",
+            "status_pedido",
+        ],
+        _request_rows(count, clients, seed),
+    )
+
+
+def generate_dataset(
+    data_dir: Path, clients: int, requests: int = 0, seed: int = 0
+) -> Path:
+    """Escreve clientes.csv, score_limite.csv e o log de solicitações em data_dir"""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    write_clients(data_dir / "clientes.csv", clients, seed)
+    (data_dir / "score_limite.csv").write_text(SCORE_LIMITS, encoding="utf-8")
+    write_limit_requests(
+        data_dir / "solicitacoes_aumento_limite.csv", requests, clients, seed
+    )
+    return data_dir
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generate_dataset(args.out_dir, args.clients, args.requests, args.seed)
+    elapsed = time.perf_counter() - start
+
+    for path in sorted(args.out_dir.glob("*.csv")):
+        print(f"{path.name:<36}{path.stat().st_size / 1024 / 1024:>10.1f} MB")
+    print(f"generated in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Provedores simulados e dados isolados para os benchmarks.
+
+Os stubs mantêm o caminho de código real (regras, fallbacks, CSV) e apenas
+substituem a chamada de rede por uma latência fixa configurável.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.agents.cambio import ExchangeAgent
+from src.services.llm_service import IntentType, LLMService
+
+CLIENTS_HEADER = "cpf,nome,data_nascimento,score,limite_atual\n"
+REQUESTS_HEADER = (
+    "cpf_cliente,data_hora_solicitacao,limite_atual,"
+    "novo_limite_solicitado,status_pedido\n"
+)
+SCORE_LIMITS = (
+    "score_min,score_max,limite\n"
+    "0,299,500.00\n"
+    "300,399,1000.00\n"
+    "400,499,3000.00\n"
+    "500,599,5000.00\n"
+    "600,699,8000.00\n"
+    "700,799,15000.00\n"
+    "800,899,25000.00\n"
+    "900,1000,50000.00\n"
+)
+CLIENTS = (
+    "12345678901,Maria Silva,1990-05-15,750,15000.00\n"
+    "98765432100,João Santos,1985-03-22,600,8000.00\n"
+)
+
+
+def write_fixture_data(data_dir: Path) -> Path:
+    data_dir.mkdir(parents=True, exist_ok=True)
+    (data_dir / "clientes.csv").write_text(CLIENTS_HEADER + CLIENTS, encoding="utf-8")
+    (data_dir / "score_limite.csv").write_text(SCORE_LIMITS, encoding="utf-8")
+    (data_dir / "solicitacoes_aumento_limite.csv").write_text(
+        REQUESTS_HEADER, encoding="utf-8"
+    )
+    return data_dir
+
+
+def use_data_dir(data_dir: Path) -> None:
+    """Aponta as configurações para o diretório de dados do benchmark"""
+    from src.config import get_settings
+
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key")
+    os.environ["USE_LANGCHAIN"] = "false"
+    get_settings.cache_clear()
+
+
+class StubLLMService(LLMService):
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        super().__init__()
+        self._latency = latency_ms / 1000
+
+    async def _wait(self) -> None:
+        if self._latency:
+            await asyncio.sleep(self._latency)
+
+    async def classify_intent(self, message: str | None) -> IntentType | None:
+        if not message:
+            return None
+        await self._wait()
+        return self._classify_with_rules(message)
+
+    async def generate_response(self, prompt: str) -> str:
+        await self._wait()
+        return self._generate_fallback_response(prompt)
+
+    async def humanize_response(
+        self,
+        user_message: str,
+        technical_response: str,
+        conversation_context: list[dict] | None = None,
+        user_name: str | None = None,
+    ) -> str:
+        await self._wait()
+        return self._humanize_fallback(user_message, technical_response, user_name)
+
+
+class StubExchangeAgent(ExchangeAgent):
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        super().__init__()
+        self._latency = latency_ms / 1000
+
+    async def _fetch_rate(
+        self, from_currency: str, to_currency: str
+    ) -> tuple[float, datetime, str]:
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        rate = self._get_fallback_rate(from_currency, to_currency)
+        return rate, datetime.now(timezone.utc), "live"
@@ -1,10 +1,13 @@
 import logging
+import time
 from datetime import datetime, timezone
 
 import httpx
 
 from src.config import get_settings
 from src.models.schemas import ExchangeRateResponse
+from src.utils.metrics import exchange_upstream_duration, record_cache
+from src.utils.tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,7 @@ class ExchangeAgent:
         self._rate_cache: dict[str, tuple[float, datetime]] = {}
         self._cache_ttl_seconds = 300
 
+    @traced("exchange.get_rate")
     async def get_rate(
         self, from_currency: str, to_currency: str
     ) -> ExchangeRateResponse:
@@ -60,16 +64,22 @@ class ExchangeAgent:
             if (
                 datetime.now(timezone.utc) - cached_time
             ).total_seconds() < self._cache_ttl_seconds:
+                record_cache("rate", hit=True)
                 return rate, cached_time, "cached"
+        record_cache("rate", hit=False)
 
         for api_url in FALLBACK_APIS:
+            start = time.perf_counter()
+            outcome = "error"
             try:
                 async with httpx.AsyncClient(timeout=10.0) as client:
                     url = f"{api_url}/{from_currency}"
-                    response = await client.get(url)
+                    with span("exchange.upstream", api=api_url):
+                        response = await client.get(url)
                     response.raise_for_status()
                     data = response.json()
 
+                    outcome = "ok"
                     rates_key = "rates"
                     if rates_key in data and to_currency in data[rates_key]:
                         rate = data[rates_key][to_currency]
@@ -82,6 +92,10 @@ class ExchangeAgent:
             except Exception as e:
                 logger.warning(f"API {api_url} failed: {e}")
                 continue
+            finally:
+                exchange_upstream_duration.labels(api_url, outcome).observe(
+                    time.perf_counter() - start
+                )
 
         rate = self._get_fallback_rate(from_currency, to_currency)
         logger.warning(f"Using fallback rate for {from_currency}/{to_currency}")
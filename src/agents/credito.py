@@ -6,25 +6,41 @@ from src.models.schemas import (
     LimitIncreaseRequest,
     LimitIncreaseResponse,
 )
+from src.services.client_snapshot import ClientSnapshot
 from src.services.csv_service import CSVService
 from src.services.score_service import ScoreService
+from src.utils.metrics import record_cache
+from src.utils.response_templates import render
+from src.utils.tracing import traced
 from src.utils.exceptions import ClientNotFoundError
 
 logger = logging.getLogger(__name__)
 
 
 class CreditAgent:
-    def __init__(self) -> None:
-        self._csv_service = CSVService()
-        self._score_service = ScoreService()
-
-    async def get_limit(self, cpf: str) -> CreditLimitResponse:
-        client = await self._csv_service.get_client_by_cpf(cpf)
-        if not client:
-            raise ClientNotFoundError(cpf)
-
-        score = client.score
-        current_limit = await self._score_service.get_limit_for_score(score)
+    def __init__(
+        self,
+        csv_service: CSVService | None = None,
+        score_service: ScoreService | None = None,
+    ) -> None:
+        self._csv_service = csv_service or CSVService()
+        self._score_service = score_service or ScoreService(self._csv_service)
+
+    @traced("credit.get_limit")
+    async def get_limit(
+        self, cpf: str, snapshot: ClientSnapshot | None = None
+    ) -> CreditLimitResponse:
+        record_cache("client", hit=snapshot is not None)
+        if snapshot is not None:
+            score = snapshot.client.score
+            current_limit = await snapshot.get_limit()
+        else:
+            client = await self._csv_service.get_client_by_cpf(cpf)
+            if not client:
+                raise ClientNotFoundError(cpf)
+
+            score = client.score
+            current_limit = await self._score_service.get_limit_for_score(score)
         available_limit = current_limit * 0.8
 
         logger.info(f"Retrieved credit limit for CPF: {cpf[:3]}***")
@@ -36,19 +52,31 @@ class CreditAgent:
             score=score,
         )
 
+    @traced("credit.request_increase")
     async def request_increase(
-        self, cpf: str, request: LimitIncreaseRequest
+        self,
+        cpf: str,
+        request: LimitIncreaseRequest,
+        snapshot: ClientSnapshot | None = None,
     ) -> LimitIncreaseResponse:
-        client = await self._csv_service.get_client_by_cpf(cpf)
-        if not client:
-            raise ClientNotFoundError(cpf)
-
-        current_limit = await self._score_service.get_limit_for_score(client.score)
+        record_cache("client", hit=snapshot is not None)
+        if snapshot is not None:
+            client = snapshot.client
+            current_limit = await snapshot.get_limit()
+        else:
+            client = await self._csv_service.get_client_by_cpf(cpf)
+            if not client:
+                raise ClientNotFoundError(cpf)
+
+            current_limit = await self._score_service.get_limit_for_score(
+                client.score
+            )
 
         status = await self._score_service.evaluate_limit_request(
             score=client.score,
             current_limit=current_limit,
             requested_limit=request.new_limit,
+            max_limit_for_score=current_limit,
         )
 
         request_record = {
@@ -83,8 +111,9 @@ class CreditAgent:
         )
 
     def _get_status_message(self, status: str, requested_limit: float) -> str:
+        if status == "approved":
+            return render("credit.increase_approved", requested_limit=requested_limit)
         messages = {
-            "approved": f"Sua solicitação de limite de R$ {requested_limit:,.2f} foi aprovada!",
             "pending_analysis": "Sua solicitação está em análise. Entraremos em contato em breve.",
             "denied": "Infelizmente, sua solicitação não pôde ser aprovada no momento.",
         }
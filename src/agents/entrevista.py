@@ -1,22 +1,39 @@
 import logging
 
 from src.models.schemas import InterviewRequest, InterviewResponse
+from src.services.client_snapshot import ClientSnapshot
 from src.services.csv_service import CSVService
 from src.services.score_service import ScoreService
 from src.utils.exceptions import ClientNotFoundError
+from src.utils.metrics import record_cache
+from src.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
 
 class InterviewAgent:
-    def __init__(self) -> None:
-        self._csv_service = CSVService()
-        self._score_service = ScoreService()
-
-    async def submit(self, cpf: str, request: InterviewRequest) -> InterviewResponse:
-        client = await self._csv_service.get_client_by_cpf(cpf)
-        if not client:
-            raise ClientNotFoundError(cpf)
+    def __init__(
+        self,
+        csv_service: CSVService | None = None,
+        score_service: ScoreService | None = None,
+    ) -> None:
+        self._csv_service = csv_service or CSVService()
+        self._score_service = score_service or ScoreService(self._csv_service)
+
+    @traced("interview.submit")
+    async def submit(
+        self,
+        cpf: str,
+        request: InterviewRequest,
+        snapshot: ClientSnapshot | None = None,
+    ) -> InterviewResponse:
+        record_cache("client", hit=snapshot is not None)
+        if snapshot is not None:
+            client = snapshot.client
+        else:
+            client = await self._csv_service.get_client_by_cpf(cpf)
+            if not client:
+                raise ClientNotFoundError(cpf)
 
         new_score = self._score_service.calculate_interview_score(
             renda_mensal=request.renda_mensal,
@@ -1,16 +1,19 @@
 import logging
 import uuid
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import date
 from enum import Enum
 from typing import Optional
 import hashlib
 
 from src.config import get_settings
+from src.models.domain import ConversationMessage, MessageRole
 from src.models.schemas import ChatRequest, ChatResponse
 from src.services.auth_service import AuthService
 from src.services.csv_service import CSVService
 from src.services.llm_service import LLMService
+from src.utils.metrics import record_cache
+from src.utils.response_templates import MESSAGES, PreparedResponse
 from src.utils.token_monitor import token_monitor
 
 logger = logging.getLogger(__name__)
@@ -129,22 +132,38 @@ class ConversationState(str, Enum):
 
 
 class SessionData:
+    __slots__ = (
+        "state",
+        "cpf",
+        "birthdate",
+        "token",
+        "conversation_history",
+        "collected_data",
+    )
+
     def __init__(self):
         self.state = ConversationState.WELCOME
         self.cpf: Optional[str] = None
         self.birthdate: Optional[date] = None
         self.token: Optional[str] = None
-        self.conversation_history: list[dict] = []
+        self.conversation_history: deque[ConversationMessage] = deque(
+            maxlen=get_settings().conversation_history_limit
+        )
         self.collected_data: dict = {}
 
 
 class OptimizedChatAgent:
-    def __init__(self):
+    def __init__(
+        self,
+        csv_service: CSVService | None = None,
+        auth_service: AuthService | None = None,
+        llm_service: LLMService | None = None,
+    ):
         self._settings = get_settings()
         self._sessions: dict[str, SessionData] = defaultdict(SessionData)
-        self._csv_service = CSVService()
-        self._auth_service = AuthService()
-        self._llm_service = LLMService()
+        self._csv_service = csv_service or CSVService()
+        self._auth_service = auth_service or AuthService()
+        self._llm_service = llm_service or LLMService()
 
         self._response_cache: dict[str, str] = {}
         self._cache_max_size = 100
@@ -189,40 +208,29 @@ class OptimizedChatAgent:
     def _generate_restriction_response(self, session: SessionData) -> str:
         """Gera resposta quando pergunta está fora do escopo bancário"""
         if session.state == ConversationState.AUTHENTICATED:
-            return (
-                "Sou especializado apenas em serviços bancários. "
-                "Posso ajudar com limite de crédito, aumento de limite, "
-                "cotação de moedas ou atualização do seu perfil financeiro. "
-                "Como posso ajudar?"
-            )
+            return MESSAGES["chat.restricted.authenticated"].text
         else:
-            return (
-                "Sou o assistente bancário do Banco Ágil. "
-                "Para começar, preciso do seu CPF para validação."
-            )
+            return MESSAGES["chat.restricted.anonymous"].text
 
     def _get_session(self, session_id: str) -> SessionData:
         if session_id not in self._sessions:
             self._sessions[session_id] = SessionData()
         return self._sessions[session_id]
 
-    async def init_session(self) -> ChatResponse:
+    def _open_session(self) -> tuple[str, SessionData]:
         session_id = str(uuid.uuid4())
         session = self._get_session(session_id)
         session.state = ConversationState.COLLECTING_DATA
+        return session_id, session
 
-        welcome_message = (
-            "Olá! Bem-vindo ao Banco Ágil! 😊\n\n"
-            "Sou seu assistente virtual e posso ajudar com:\n"
-            "• Consultar limite de crédito\n"
-            "• Solicitar aumento de limite\n"
-            "• Cotação de moedas\n"
-            "• Atualizar seu perfil financeiro\n\n"
-            "Para começar, preciso validar sua identidade.\n"
-            "Qual é o seu CPF?"
-        )
+    async def init_session(self) -> ChatResponse:
+        session_id, session = self._open_session()
+        return self._response(session_id, session, MESSAGES["chat.welcome"].text)
 
-        return self._response(session_id, session, welcome_message)
+    def init_session_json(self) -> bytes:
+        """Abre a sessão e devolve o corpo JSON de boas-vindas já serializado"""
+        session_id, _ = self._open_session()
+        return _WELCOME_RESPONSE.render(session_id)
 
     async def process_message(self, request: ChatRequest) -> ChatResponse:
         session_id = request.session_id or str(uuid.uuid4())
@@ -230,26 +238,18 @@ class OptimizedChatAgent:
         session = self._get_session(session_id)
         message = request.message.strip()
 
-        session.conversation_history.append({"role": "user", "content": message})
+        session.conversation_history.append(
+            ConversationMessage(MessageRole.USER, message)
+        )
 
         if is_new_session and session.state == ConversationState.WELCOME:
             session.state = ConversationState.COLLECTING_DATA
-            welcome_message = (
-                "Olá! Bem-vindo ao Banco Ágil! 😊\n\n"
-                "Sou seu assistente virtual e posso ajudar com:\n"
-                "• Consultar limite de crédito\n"
-                "• Solicitar aumento de limite\n"
-                "• Cotação de moedas\n"
-                "• Atualizar seu perfil financeiro\n\n"
-                "Para começar, preciso validar sua identidade.\n"
-                "Qual é o seu CPF?"
-            )
-            return self._response(session_id, session, welcome_message)
+            return self._response(session_id, session, MESSAGES["chat.welcome"].text)
 
         if not is_new_session and not self._is_banking_related(message):
             restricted_response = self._generate_restriction_response(session)
             session.conversation_history.append(
-                {"role": "assistant", "content": restricted_response}
+                ConversationMessage(MessageRole.ASSISTANT, restricted_response)
             )
             return self._response(
                 session_id,
@@ -262,7 +262,7 @@ class OptimizedChatAgent:
         ai_response = await self._generate_ai_response(session, message)
 
         session.conversation_history.append(
-            {"role": "assistant", "content": ai_response}
+            ConversationMessage(MessageRole.ASSISTANT, ai_response)
         )
 
         return self._response(
@@ -279,12 +279,14 @@ class OptimizedChatAgent:
 
         cache_key = self._generate_cache_key(session, user_message)
         if cache_key in self._response_cache:
-            token_monitor.track_cache_hit()
+            record_cache("response", hit=True)
+            token_monitor.track_cache_hit(prompt_type="generate")
             return self._response_cache[cache_key]
+        record_cache("response", hit=False)
 
         system_context = self._build_system_context(session)
 
-        recent_history = session.conversation_history[-3:]
+        recent_history = list(session.conversation_history)[-3:]
 
         prompt = self._build_ai_prompt(
             system_context, recent_history, user_message, session
@@ -321,15 +323,15 @@ class OptimizedChatAgent:
     def _build_ai_prompt(
         self,
         system_context: str,
-        history: list[dict],
+        history: list[ConversationMessage],
         current_message: str,
         session: SessionData,
     ) -> str:
         prompt = f"{system_context}\n"
 
         for msg in history:
-            role = "U" if msg["role"] == "user" else "A"
-            prompt += f"{role}:{msg['content']}\n"
+            role = "U" if msg.role == MessageRole.USER else "A"
+            prompt += f"{role}:{msg.content}\n"
 
         prompt += f"U:{current_message}\n→Responda claro e amigável:"
 
@@ -411,3 +413,12 @@ class OptimizedChatAgent:
             authenticated=authenticated,
             token=token,
         )
+
+
+_WELCOME_RESPONSE = PreparedResponse(
+    lambda session_id: ChatResponse(
+        session_id=session_id,
+        message=MESSAGES["chat.welcome"].text,
+        state=ConversationState.COLLECTING_DATA.value,
+    )
+)
@@ -1,32 +1,45 @@
+import asyncio
 import logging
 import uuid
-from collections import defaultdict
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from datetime import date
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
+from weakref import WeakValueDictionary
 
 from src.agents.cambio import ExchangeAgent
 from src.agents.credito import CreditAgent
 from src.agents.entrevista import InterviewAgent
 from src.agents.triagem import TriageAgent
 from src.config import get_settings
+from src.models.domain import ConversationMessage, MessageRole
 from src.models.schemas import (
     AuthRequest,
     InterviewRequest,
     LimitIncreaseRequest,
     RedirectAction,
+    UnifiedChatBatchResult,
     UnifiedChatRequest,
     UnifiedChatResponse,
 )
 from src.services.auth_service import AuthService
+from src.services.client_snapshot import ClientSnapshot
 from src.services.csv_service import CSVService
 from src.services.llm_service import LLMService
+from src.services.score_service import ScoreService
+from src.utils.metrics import orchestrator_state_duration
+from src.utils.request_context import current_state
+from src.utils.response_templates import MESSAGES, PreparedResponse, render
+from src.utils.tracing import span
 from src.utils.text_normalizer import extract_cpf_from_text, parse_date_from_text
 from src.utils.value_extractor import (
     extract_monetary_value,
     extract_currency_code,
     extract_employment_type,
     extract_integer,
+    extract_interview_slots,
 )
 
 logger = logging.getLogger(__name__)
@@ -59,6 +72,18 @@ class OrchestratorState(str, Enum):
 
 
 class OrchestratorSession:
+    __slots__ = (
+        "state",
+        "cpf",
+        "birthdate",
+        "token",
+        "current_agent",
+        "collected_data",
+        "pending_redirect",
+        "conversation_history",
+        "client_snapshot",
+    )
+
     def __init__(self):
         self.state = OrchestratorState.WELCOME
         self.cpf: Optional[str] = None
@@ -67,54 +92,220 @@ class OrchestratorSession:
         self.current_agent: AgentType = AgentType.TRIAGE
         self.collected_data: dict = {}
         self.pending_redirect: Optional[RedirectAction] = None
-        self.conversation_history: list[dict] = []
+        self.conversation_history: deque[ConversationMessage] = deque(
+            maxlen=get_settings().conversation_history_limit
+        )
+        self.client_snapshot: Optional[ClientSnapshot] = None
+
+
+Handler = Callable[
+    ["Orchestrator", str, OrchestratorSession, str], Awaitable[UnifiedChatResponse]
+]
+
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    """Entrada da tabela de estados do orquestrador.
+
+    Estados de coleta declaram o extractor, o campo de collected_data onde o
+    valor é gravado e o próximo estado; `complete` é chamado quando o último
+    campo do fluxo é preenchido. Com `slots_extractor` a mensagem pode
+    preencher vários campos de uma vez e os estados já satisfeitos são
+    pulados. `prompt` é a pergunta feita ao entrar no estado (pode referenciar
+    campos já coletados) e `retry` a resposta quando o extractor não
+    reconhece a mensagem.
+    """
+
+    handler: Handler
+    extractor: Callable[[str], Any] | None = None
+    slot: str | None = None
+    next_state: OrchestratorState | None = None
+    complete: Handler | None = None
+    slots_extractor: Callable[[str], dict[str, Any]] | None = None
+    prompt: str = ""
+    retry: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class FlowEntry:
+    """Intenção que leva o usuário autenticado para o início de um fluxo"""
+
+    agent: AgentType
+    state: OrchestratorState
+    message: str
+    reset_data: bool = False
+
+
+def _extract_has_debts(message: str) -> bool | None:
+    msg_lower = message.lower()
+    if "sim" in msg_lower or "tenho" in msg_lower or "yes" in msg_lower:
+        return True
+    if (
+        "nao" in msg_lower
+        or "não" in msg_lower
+        or "no" in msg_lower
+        or "nenhuma" in msg_lower
+    ):
+        return False
+    return None
 
 
 class Orchestrator:
-    def __init__(self):
+    def __init__(
+        self,
+        csv_service: CSVService | None = None,
+        auth_service: AuthService | None = None,
+        llm_service: LLMService | None = None,
+        score_service: ScoreService | None = None,
+        triage_agent: TriageAgent | None = None,
+        credit_agent: CreditAgent | None = None,
+        interview_agent: InterviewAgent | None = None,
+        exchange_agent: ExchangeAgent | None = None,
+    ):
         self._settings = get_settings()
         self._sessions: dict[str, OrchestratorSession] = defaultdict(
             OrchestratorSession
         )
+        # Um lock por sessão enquanto houver turno em andamento; sem referências,
+        # a entrada some sozinha do dicionário
+        self._session_locks: WeakValueDictionary[str, asyncio.Lock] = (
+            WeakValueDictionary()
+        )
+
+        self._csv_service = csv_service or CSVService()
+        self._auth_service = auth_service or AuthService()
+        self._llm_service = llm_service or LLMService()
+        self._score_service = score_service or ScoreService(self._csv_service)
+
+        self._triage_agent = triage_agent or TriageAgent(
+            self._csv_service, self._auth_service, self._llm_service
+        )
+        self._credit_agent = credit_agent or CreditAgent(
+            self._csv_service, self._score_service
+        )
+        self._interview_agent = interview_agent or InterviewAgent(
+            self._csv_service, self._score_service
+        )
+        self._exchange_agent = exchange_agent or ExchangeAgent()
 
-        self._triage_agent = TriageAgent()
-        self._credit_agent = CreditAgent()
-        self._interview_agent = InterviewAgent()
-        self._exchange_agent = ExchangeAgent()
+        self._transitions: dict[OrchestratorState, Transition] = dict(TRANSITIONS)
+        self._intent_flows: dict[str, FlowEntry] = dict(INTENT_FLOWS)
 
-        self._csv_service = CSVService()
-        self._auth_service = AuthService()
-        self._llm_service = LLMService()
+    def register_transition(
+        self, state: OrchestratorState, transition: Transition
+    ) -> None:
+        """Registra (ou substitui) o tratamento de um estado sem alterar o roteador"""
+        self._transitions[state] = transition
+
+    def register_intent_flow(self, intent: str, entry: FlowEntry) -> None:
+        self._intent_flows[intent] = entry
 
     def _get_session(self, session_id: str) -> OrchestratorSession:
         if session_id not in self._sessions:
             self._sessions[session_id] = OrchestratorSession()
         return self._sessions[session_id]
 
-    async def init_session(self) -> UnifiedChatResponse:
+    def session_cpf(self, session_id: str) -> str | None:
+        """CPF da sessão já autenticada, sem criar a sessão se ela não existir"""
+        session = self._sessions.get(session_id)
+        if session is None or session.token is None:
+            return None
+        return session.cpf
+
+    async def _current_snapshot(
+        self, session: OrchestratorSession
+    ) -> ClientSnapshot | None:
+        """Snapshot da sessão, recarregado se o score mudou desde a captura"""
+        snapshot = session.client_snapshot
+        if snapshot is None:
+            return None
+        version = self._csv_service.score_version(session.cpf)
+        if snapshot.version == version:
+            return snapshot
+
+        client = await self._csv_service.get_client_by_cpf(session.cpf)
+        session.client_snapshot = (
+            ClientSnapshot(client, self._score_service, version) if client else None
+        )
+        return session.client_snapshot
+
+    def _open_session(self) -> tuple[str, OrchestratorSession]:
         session_id = str(uuid.uuid4())
         session = self._get_session(session_id)
         session.state = OrchestratorState.COLLECTING_CPF
+        return session_id, session
 
-        welcome_message = (
-            "Olá! Bem-vindo ao Banco Ágil!\n\n"
-            "Sou seu assistente virtual e posso ajudar com:\n"
-            "- Consultar limite de crédito\n"
-            "- Solicitar aumento de limite\n"
-            "- Cotação de moedas\n"
-            "- Atualizar seu perfil financeiro\n\n"
-            "Para começar, preciso validar sua identidade.\n"
-            "Qual é o seu CPF?"
+    async def init_session(self) -> UnifiedChatResponse:
+        session_id, session = self._open_session()
+        return self._build_response(
+            session_id, session, MESSAGES["unified.welcome"].text
         )
 
-        return self._build_response(session_id, session, welcome_message)
+    def init_session_json(self) -> bytes:
+        """Abre a sessão e devolve o corpo JSON de boas-vindas já serializado"""
+        session_id, _ = self._open_session()
+        return _WELCOME_RESPONSE.render(session_id)
 
     async def process_message(self, request: UnifiedChatRequest) -> UnifiedChatResponse:
         session_id = request.session_id or str(uuid.uuid4())
-        session = self._get_session(session_id)
         message = request.message.strip()
 
-        session.conversation_history.append({"role": "user", "content": message})
+        async with self._session_lock(session_id):
+            session = self._get_session(session_id)
+            state_token = current_state.set(session.state.value)
+            try:
+                return await self._process_turn(session_id, session, message)
+            finally:
+                current_state.reset(state_token)
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        """Serializa os turnos da sessão; sessões distintas seguem em paralelo"""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+
+    async def process_batch(
+        self, requests: list[UnifiedChatRequest]
+    ) -> list[UnifiedChatBatchResult]:
+        """Processa várias mensagens: sessões distintas em paralelo, cada
+        sessão na ordem recebida, resultados na ordem de entrada."""
+        requests = [
+            request
+            if request.session_id
+            else request.model_copy(update={"session_id": str(uuid.uuid4())})
+            for request in requests
+        ]
+        by_session: dict[str, list[int]] = {}
+        for index, request in enumerate(requests):
+            by_session.setdefault(request.session_id, []).append(index)
+
+        results: list[UnifiedChatBatchResult | None] = [None] * len(requests)
+
+        async def run_session(indexes: list[int]) -> None:
+            for index in indexes:
+                try:
+                    response = await self.process_message(requests[index])
+                except Exception as e:
+                    logger.error(f"Batch item {index} failed: {e}")
+                    results[index] = UnifiedChatBatchResult(
+                        index=index, error="Erro ao processar a mensagem."
+                    )
+                else:
+                    results[index] = UnifiedChatBatchResult(
+                        index=index, response=response
+                    )
+
+        await asyncio.gather(*(run_session(i) for i in by_session.values()))
+        return results
+
+    async def _process_turn(
+        self, session_id: str, session: OrchestratorSession, message: str
+    ) -> UnifiedChatResponse:
+        session.conversation_history.append(
+            ConversationMessage(MessageRole.USER, message)
+        )
 
         if session.state == OrchestratorState.WELCOME:
             session.state = OrchestratorState.COLLECTING_CPF
@@ -149,7 +340,7 @@ class Orchestrator:
         response = await self._route_message(session_id, session, message)
 
         session.conversation_history.append(
-            {"role": "assistant", "content": response.message}
+            ConversationMessage(MessageRole.ASSISTANT, response.message)
         )
 
         return response
@@ -157,44 +348,20 @@ class Orchestrator:
     async def _route_message(
         self, session_id: str, session: OrchestratorSession, message: str
     ) -> UnifiedChatResponse:
+        state = session.state.value
+        with span("orchestrator.route_message", state=state):
+            with orchestrator_state_duration.labels(state).time():
+                return await self._dispatch_state(session_id, session, message)
 
-        if session.state == OrchestratorState.COLLECTING_CPF:
-            return await self._handle_cpf_collection(session_id, session, message)
-
-        if session.state == OrchestratorState.COLLECTING_BIRTHDATE:
-            return await self._handle_birthdate_collection(session_id, session, message)
-
-        if session.state == OrchestratorState.AUTHENTICATED:
-            return await self._handle_authenticated_message(
-                session_id, session, message
+    async def _dispatch_state(
+        self, session_id: str, session: OrchestratorSession, message: str
+    ) -> UnifiedChatResponse:
+        transition = self._transitions.get(session.state)
+        if transition is None:
+            return self._build_response(
+                session_id, session, "Desculpe, não entendi. Como posso ajudar?"
             )
-
-        if session.state in [
-            OrchestratorState.CREDIT_FLOW,
-            OrchestratorState.CREDIT_INCREASE_FLOW,
-        ]:
-            return await self._handle_credit_flow(session_id, session, message)
-
-        if session.state in [
-            OrchestratorState.INTERVIEW_FLOW,
-            OrchestratorState.INTERVIEW_INCOME,
-            OrchestratorState.INTERVIEW_EMPLOYMENT,
-            OrchestratorState.INTERVIEW_EXPENSES,
-            OrchestratorState.INTERVIEW_DEPENDENTS,
-            OrchestratorState.INTERVIEW_DEBTS,
-        ]:
-            return await self._handle_interview_flow(session_id, session, message)
-
-        if session.state in [
-            OrchestratorState.EXCHANGE_FLOW,
-            OrchestratorState.EXCHANGE_FROM,
-            OrchestratorState.EXCHANGE_TO,
-        ]:
-            return await self._handle_exchange_flow(session_id, session, message)
-
-        return self._build_response(
-            session_id, session, "Desculpe, não entendi. Como posso ajudar?"
-        )
+        return await transition.handler(self, session_id, session, message)
 
     async def _handle_cpf_collection(
         self, session_id: str, session: OrchestratorSession, message: str
@@ -209,6 +376,7 @@ class Orchestrator:
                 user_message=message,
             )
 
+        version = self._csv_service.score_version(cpf)
         client = await self._csv_service.get_client_by_cpf(cpf)
         if not client:
             return await self._build_humanized_response(
@@ -219,6 +387,7 @@ class Orchestrator:
             )
 
         session.cpf = cpf
+        session.client_snapshot = ClientSnapshot(client, self._score_service, version)
         session.state = OrchestratorState.COLLECTING_BIRTHDATE
 
         return await self._build_humanized_response(
@@ -252,7 +421,7 @@ class Orchestrator:
                 user_message=message,
             )
 
-        client = await self._csv_service.get_client_by_cpf(session.cpf)
+        client = session.client_snapshot.client
         client_birthdate = date.fromisoformat(client.data_nascimento)
 
         if client_birthdate != birthdate:
@@ -271,14 +440,7 @@ class Orchestrator:
         return await self._build_humanized_response(
             session_id,
             session,
-            technical_message=(
-                f"Autenticado com sucesso! Olá, {client.nome}!\n\n"
-                "Como posso ajudar?\n"
-                "- Ver meu limite\n"
-                "- Solicitar aumento\n"
-                "- Cotação de moedas\n"
-                "- Atualizar perfil"
-            ),
+            technical_message=render("unified.authenticated", nome=client.nome),
             user_message=message,
             authenticated=True,
             user_name=client.nome,
@@ -291,13 +453,15 @@ class Orchestrator:
 
         if intent == "credit_limit":
             session.current_agent = AgentType.CREDIT
-            result = await self._credit_agent.get_limit(session.cpf)
+            result = await self._credit_agent.get_limit(
+                session.cpf, snapshot=await self._current_snapshot(session)
+            )
 
-            response_message = (
-                f"Seu limite atual: R$ {result.current_limit:,.2f}\n"
-                f"Disponível: R$ {result.available_limit:,.2f}\n"
-                f"Score: {result.score}\n\n"
-                "Deseja solicitar aumento de limite?"
+            response_message = render(
+                "credit.limit",
+                current_limit=result.current_limit,
+                available_limit=result.available_limit,
+                score=result.score,
             )
 
             session.pending_redirect = RedirectAction(
@@ -310,265 +474,169 @@ class Orchestrator:
                 session_id, session, response_message, authenticated=True
             )
 
-        if intent == "request_increase":
-            session.current_agent = AgentType.CREDIT
-            session.state = OrchestratorState.CREDIT_INCREASE_FLOW
-            return self._build_response(
-                session_id,
-                session,
-                "Vou te ajudar a solicitar um aumento no seu limite de crédito. Qual valor você gostaria de ter como novo limite?",
-                authenticated=True,
-            )
-
-        if intent == "interview":
-            session.current_agent = AgentType.INTERVIEW
-            session.state = OrchestratorState.INTERVIEW_INCOME
-            session.collected_data = {}
-            return self._build_response(
-                session_id,
-                session,
-                "Ótimo! Vou te ajudar a atualizar seu perfil financeiro. Com essas informações, podemos avaliar melhores opções de crédito para você.\n\nPara começar, qual é a sua renda mensal?",
-                authenticated=True,
-            )
-
-        if intent == "exchange_rate":
-            session.current_agent = AgentType.EXCHANGE
-            session.state = OrchestratorState.EXCHANGE_FROM
+        entry = self._intent_flows.get(intent)
+        if entry is not None:
+            session.current_agent = entry.agent
+            session.state = entry.state
+            if entry.reset_data:
+                session.collected_data = {}
             return self._build_response(
-                session_id,
-                session,
-                "Qual moeda você quer converter? (USD, EUR, GBP, etc.)",
-                authenticated=True,
+                session_id, session, entry.message, authenticated=True
             )
 
         return self._build_response(
             session_id,
             session,
-            "Posso te ajudar com: consultar seu limite de crédito, solicitar aumento de limite, verificar cotação de moedas ou atualizar seu perfil financeiro. O que você prefere?",
+            MESSAGES["unified.menu"].text,
             authenticated=True,
         )
 
-    async def _handle_credit_flow(
+    async def _reply_prompt(
         self, session_id: str, session: OrchestratorSession, message: str
     ) -> UnifiedChatResponse:
-        if session.state == OrchestratorState.CREDIT_INCREASE_FLOW:
-            value = extract_monetary_value(message)
+        prompt = self._transitions[session.state].prompt
+        return self._build_response(session_id, session, prompt, authenticated=True)
 
-            if value is None:
+    async def _collect_slot(
+        self, session_id: str, session: OrchestratorSession, message: str
+    ) -> UnifiedChatResponse:
+        """Estado de coleta genérico: extrai, grava os campos e avança"""
+        transition = self._transitions[session.state]
+        filled = {}
+        if transition.slots_extractor is not None:
+            filled = transition.slots_extractor(message)
+        if transition.slot not in filled:
+            # O campo do estado atual ainda pode vir sem palavra-chave ("5k")
+            value = transition.extractor(message)
+            if value is not None:
+                filled[transition.slot] = value
+            elif not filled:
                 return self._build_response(
-                    session_id,
-                    session,
-                    "Não consegui identificar o valor. Pode me informar quanto você gostaria de limite? Por exemplo: 10000, 10k ou dez mil.",
-                    authenticated=True,
-                )
-
-            request = LimitIncreaseRequest(new_limit=value)
-            result = await self._credit_agent.request_increase(session.cpf, request)
-
-            response_message = result.message
-
-            if result.offer_interview:
-                session.pending_redirect = RedirectAction(
-                    should_redirect=True,
-                    target_agent="interview",
-                    reason="credit_denied",
-                    suggested_action="complete_interview",
+                    session_id, session, transition.retry, authenticated=True
                 )
-                response_message += f"\n\n{result.interview_message}"
-
-            session.state = OrchestratorState.AUTHENTICATED
-            return self._build_response(
-                session_id,
-                session,
-                response_message,
-                authenticated=True,
-                redirect=session.pending_redirect,
-            )
-
+        session.collected_data.update(filled)
+
+        state: OrchestratorState | None = session.state
+        while state is not None:
+            if self._transitions[state].slot not in session.collected_data:
+                break
+            transition = self._transitions[state]
+            state = transition.next_state
+        if state is None:
+            return await transition.complete(self, session_id, session, message)
+
+        session.state = state
+        prompt = self._transitions[state].prompt
         return self._build_response(
-            session_id, session, "Como posso ajudar?", authenticated=True
+            session_id,
+            session,
+            prompt.format(**session.collected_data),
+            authenticated=True,
         )
 
-    async def _handle_interview_flow(
+    async def _handle_credit_increase(
         self, session_id: str, session: OrchestratorSession, message: str
     ) -> UnifiedChatResponse:
+        value = extract_monetary_value(message)
 
-        if session.state == OrchestratorState.INTERVIEW_INCOME:
-            value = extract_monetary_value(message)
-            if value is None:
-                return self._build_response(
-                    session_id,
-                    session,
-                    "Qual sua renda mensal? Ex: 5000, 5k.",
-                    authenticated=True,
-                )
-            session.collected_data["renda_mensal"] = value
-            session.state = OrchestratorState.INTERVIEW_EMPLOYMENT
+        if value is None:
             return self._build_response(
                 session_id,
                 session,
-                "Qual seu tipo de trabalho? CLT, autônomo, MEI, servidor público ou desempregado?",
+                "Não consegui identificar o valor. Pode me informar quanto você gostaria de limite? Por exemplo: 10000, 10k ou dez mil.",
                 authenticated=True,
             )
 
-        if session.state == OrchestratorState.INTERVIEW_EMPLOYMENT:
-            emp_type = extract_employment_type(message)
-            if emp_type is None:
-                return self._build_response(
-                    session_id,
-                    session,
-                    "Opções: CLT, Servidor Público (PUBLICO), Autônomo (AUTONOMO), MEI ou Desempregado.",
-                    authenticated=True,
-                )
-            session.collected_data["tipo_emprego"] = emp_type
-            session.state = OrchestratorState.INTERVIEW_EXPENSES
-            return self._build_response(
-                session_id,
-                session,
-                "Qual o total das suas despesas mensais?",
-                authenticated=True,
-            )
-
-        if session.state == OrchestratorState.INTERVIEW_EXPENSES:
-            value = extract_monetary_value(message)
-            if value is None:
-                return self._build_response(
-                    session_id,
-                    session,
-                    "Qual o total aproximado? Ex: 2000, 2k.",
-                    authenticated=True,
-                )
-            session.collected_data["despesas"] = value
-            session.state = OrchestratorState.INTERVIEW_DEPENDENTS
-            return self._build_response(
-                session_id, session, "Quantos dependentes você tem?", authenticated=True
-            )
-
-        if session.state == OrchestratorState.INTERVIEW_DEPENDENTS:
-            value = extract_integer(message)
-            if value is None:
-                return self._build_response(
-                    session_id,
-                    session,
-                    "Quantas pessoas dependem de você? Se nenhuma, diga 'zero'.",
-                    authenticated=True,
-                )
-            session.collected_data["num_dependentes"] = value
-            session.state = OrchestratorState.INTERVIEW_DEBTS
-            return self._build_response(
-                session_id,
-                session,
-                "Você tem alguma dívida em aberto? (sim/não)",
-                authenticated=True,
-            )
-
-        if session.state == OrchestratorState.INTERVIEW_DEBTS:
-            msg_lower = message.lower()
-            if "sim" in msg_lower or "tenho" in msg_lower or "yes" in msg_lower:
-                has_debts = True
-            elif (
-                "nao" in msg_lower
-                or "não" in msg_lower
-                or "no" in msg_lower
-                or "nenhuma" in msg_lower
-            ):
-                has_debts = False
-            else:
-                return self._build_response(
-                    session_id, session, "Responda sim ou não.", authenticated=True
-                )
-
-            session.collected_data["tem_dividas"] = has_debts
-
-            interview_request = InterviewRequest(
-                renda_mensal=session.collected_data["renda_mensal"],
-                tipo_emprego=session.collected_data["tipo_emprego"],
-                despesas=session.collected_data["despesas"],
-                num_dependentes=session.collected_data["num_dependentes"],
-                tem_dividas=session.collected_data["tem_dividas"],
-            )
+        request = LimitIncreaseRequest(new_limit=value)
+        result = await self._credit_agent.request_increase(
+            session.cpf, request, snapshot=await self._current_snapshot(session)
+        )
 
-            result = await self._interview_agent.submit(session.cpf, interview_request)
+        response_message = result.message
 
-            session.state = OrchestratorState.AUTHENTICATED
-            session.collected_data = {}
-
-            redirect = RedirectAction(
+        if result.offer_interview:
+            session.pending_redirect = RedirectAction(
                 should_redirect=True,
-                target_agent="credit",
-                reason="interview_completed",
-                suggested_action="check_new_limit",
-            )
-            session.pending_redirect = redirect
-
-            return self._build_response(
-                session_id,
-                session,
-                f"Entrevista concluída!\n\n"
-                f"Score anterior: {result.previous_score}\n"
-                f"Novo score: {result.new_score}\n\n"
-                f"{result.recommendation}\n\n"
-                "Deseja consultar seu novo limite de crédito?",
-                authenticated=True,
-                redirect=redirect,
+                target_agent="interview",
+                reason="credit_denied",
+                suggested_action="complete_interview",
             )
+            response_message += f"\n\n{result.interview_message}"
 
+        session.state = OrchestratorState.AUTHENTICATED
         return self._build_response(
             session_id,
             session,
-            "Vamos continuar. Qual sua renda mensal?",
+            response_message,
             authenticated=True,
+            redirect=session.pending_redirect,
         )
 
-    async def _handle_exchange_flow(
+    async def _complete_interview(
         self, session_id: str, session: OrchestratorSession, message: str
     ) -> UnifiedChatResponse:
+        interview_request = InterviewRequest(
+            renda_mensal=session.collected_data["renda_mensal"],
+            tipo_emprego=session.collected_data["tipo_emprego"],
+            despesas=session.collected_data["despesas"],
+            num_dependentes=session.collected_data["num_dependentes"],
+            tem_dividas=session.collected_data["tem_dividas"],
+        )
 
-        if session.state == OrchestratorState.EXCHANGE_FROM:
-            currency = extract_currency_code(message)
-            if currency is None:
-                return self._build_response(
-                    session_id,
-                    session,
-                    "Moeda não reconhecida. Use: USD, EUR, GBP, JPY ou ARS.",
-                    authenticated=True,
-                )
-            session.collected_data["from_currency"] = currency
-            session.state = OrchestratorState.EXCHANGE_TO
-            return self._build_response(
-                session_id,
-                session,
-                f"Converter {currency} para qual moeda? (BRL para Real)",
-                authenticated=True,
+        snapshot = await self._current_snapshot(session)
+        result = await self._interview_agent.submit(
+            session.cpf, interview_request, snapshot=snapshot
+        )
+        if snapshot is not None:
+            session.client_snapshot = snapshot.with_score(
+                result.new_score, self._csv_service.score_version(session.cpf)
             )
 
-        if session.state == OrchestratorState.EXCHANGE_TO:
-            currency = extract_currency_code(message)
-            if currency is None:
-                return self._build_response(
-                    session_id,
-                    session,
-                    "Moeda não reconhecida. Use: BRL, USD, EUR, GBP, JPY ou ARS.",
-                    authenticated=True,
-                )
+        session.state = OrchestratorState.AUTHENTICATED
+        session.collected_data = {}
 
-            from_curr = session.collected_data.get("from_currency", "USD")
-            result = await self._exchange_agent.get_rate(from_curr, currency)
+        redirect = RedirectAction(
+            should_redirect=True,
+            target_agent="credit",
+            reason="interview_completed",
+            suggested_action="check_new_limit",
+        )
+        session.pending_redirect = redirect
 
-            session.state = OrchestratorState.AUTHENTICATED
-            session.collected_data = {}
+        return self._build_response(
+            session_id,
+            session,
+            render(
+                "interview.completed",
+                previous_score=result.previous_score,
+                new_score=result.new_score,
+                recommendation=result.recommendation,
+            ),
+            authenticated=True,
+            redirect=redirect,
+        )
 
-            return self._build_response(
-                session_id,
-                session,
-                f"Cotação: 1 {from_curr} = {result.rate:.4f} {currency}\n"
-                f"Atualizado em: {result.timestamp.strftime('%d/%m/%Y %H:%M')}\n\n"
-                "Posso ajudar com mais alguma coisa?",
-                authenticated=True,
-            )
+    async def _complete_exchange(
+        self, session_id: str, session: OrchestratorSession, message: str
+    ) -> UnifiedChatResponse:
+        from_curr = session.collected_data.get("from_currency", "USD")
+        currency = session.collected_data["to_currency"]
+        result = await self._exchange_agent.get_rate(from_curr, currency)
+
+        session.state = OrchestratorState.AUTHENTICATED
+        session.collected_data = {}
 
         return self._build_response(
-            session_id, session, "Qual moeda você quer converter?", authenticated=True
+            session_id,
+            session,
+            render(
+                "exchange.rate",
+                from_currency=from_curr,
+                to_currency=currency,
+                rate=result.rate,
+                updated_at=result.timestamp.strftime("%d/%m/%Y %H:%M"),
+            ),
+            authenticated=True,
         )
 
     async def _handle_redirect_acceptance(
@@ -591,15 +659,17 @@ class Orchestrator:
 
         if redirect.target_agent == "credit":
             session.current_agent = AgentType.CREDIT
-            result = await self._credit_agent.get_limit(session.cpf)
+            result = await self._credit_agent.get_limit(
+                session.cpf, snapshot=await self._current_snapshot(session)
+            )
             return await self._build_humanized_response(
                 session_id,
                 session,
-                technical_message=(
-                    f"Seu novo limite: R$ {result.current_limit:,.2f}\n"
-                    f"Disponível: R$ {result.available_limit:,.2f}\n"
-                    f"Score: {result.score}\n\n"
-                    "Posso ajudar com mais alguma coisa?"
+                technical_message=render(
+                    "credit.new_limit",
+                    current_limit=result.current_limit,
+                    available_limit=result.available_limit,
+                    score=result.score,
                 ),
                 user_message=message,
                 authenticated=True,
@@ -694,3 +764,116 @@ class Orchestrator:
             available_actions=self._get_available_actions(session),
             redirect_suggestion=redirect,
         )
+
+
+TRANSITIONS: dict[OrchestratorState, Transition] = {
+    OrchestratorState.COLLECTING_CPF: Transition(Orchestrator._handle_cpf_collection),
+    OrchestratorState.COLLECTING_BIRTHDATE: Transition(
+        Orchestrator._handle_birthdate_collection
+    ),
+    OrchestratorState.AUTHENTICATED: Transition(
+        Orchestrator._handle_authenticated_message
+    ),
+    OrchestratorState.CREDIT_FLOW: Transition(
+        Orchestrator._reply_prompt, prompt="Como posso ajudar?"
+    ),
+    OrchestratorState.CREDIT_INCREASE_FLOW: Transition(
+        Orchestrator._handle_credit_increase
+    ),
+    OrchestratorState.INTERVIEW_FLOW: Transition(
+        Orchestrator._reply_prompt, prompt="Vamos continuar. Qual sua renda mensal?"
+    ),
+    OrchestratorState.INTERVIEW_INCOME: Transition(
+        Orchestrator._collect_slot,
+        extractor=extract_monetary_value,
+        slot="renda_mensal",
+        slots_extractor=extract_interview_slots,
+        next_state=OrchestratorState.INTERVIEW_EMPLOYMENT,
+        prompt="Qual é a sua renda mensal?",
+        retry="Qual sua renda mensal? Ex: 5000, 5k.",
+    ),
+    OrchestratorState.INTERVIEW_EMPLOYMENT: Transition(
+        Orchestrator._collect_slot,
+        extractor=extract_employment_type,
+        slot="tipo_emprego",
+        slots_extractor=extract_interview_slots,
+        next_state=OrchestratorState.INTERVIEW_EXPENSES,
+        prompt="Qual seu tipo de trabalho? CLT, autônomo, MEI, servidor público ou desempregado?",
+        retry="Opções: CLT, Servidor Público (PUBLICO), Autônomo (AUTONOMO), MEI ou Desempregado.",
+    ),
+    OrchestratorState.INTERVIEW_EXPENSES: Transition(
+        Orchestrator._collect_slot,
+        extractor=extract_monetary_value,
+        slot="despesas",
+        slots_extractor=extract_interview_slots,
+        next_state=OrchestratorState.INTERVIEW_DEPENDENTS,
+        prompt="Qual o total das suas despesas mensais?",
+        retry="Qual o total aproximado? Ex: 2000, 2k.",
+    ),
+    OrchestratorState.INTERVIEW_DEPENDENTS: Transition(
+        Orchestrator._collect_slot,
+        extractor=extract_integer,
+        slot="num_dependentes",
+        slots_extractor=extract_interview_slots,
+        next_state=OrchestratorState.INTERVIEW_DEBTS,
+        prompt="Quantos dependentes você tem?",
+        retry="Quantas pessoas dependem de você? Se nenhuma, diga 'zero'.",
+    ),
+    OrchestratorState.INTERVIEW_DEBTS: Transition(
+        Orchestrator._collect_slot,
+        extractor=_extract_has_debts,
+        slot="tem_dividas",
+        slots_extractor=extract_interview_slots,
+        complete=Orchestrator._complete_interview,
+        prompt="Você tem alguma dívida em aberto? (sim/não)",
+        retry="Responda sim ou não.",
+    ),
+    OrchestratorState.EXCHANGE_FLOW: Transition(
+        Orchestrator._reply_prompt, prompt="Qual moeda você quer converter?"
+    ),
+    OrchestratorState.EXCHANGE_FROM: Transition(
+        Orchestrator._collect_slot,
+        extractor=extract_currency_code,
+        slot="from_currency",
+        next_state=OrchestratorState.EXCHANGE_TO,
+        prompt="Qual moeda você quer converter? (USD, EUR, GBP, etc.)",
+        retry="Moeda não reconhecida. Use: USD, EUR, GBP, JPY ou ARS.",
+    ),
+    OrchestratorState.EXCHANGE_TO: Transition(
+        Orchestrator._collect_slot,
+        extractor=extract_currency_code,
+        slot="to_currency",
+        complete=Orchestrator._complete_exchange,
+        prompt="Converter {from_currency} para qual moeda? (BRL para Real)",
+        retry="Moeda não reconhecida. Use: BRL, USD, EUR, GBP, JPY ou ARS.",
+    ),
+}
+
+_WELCOME_RESPONSE = PreparedResponse(
+    lambda session_id: UnifiedChatResponse(
+        session_id=session_id,
+        message=MESSAGES["unified.welcome"].text,
+        state=OrchestratorState.COLLECTING_CPF.value,
+        current_agent=AgentType.TRIAGE.value,
+        available_actions=["autenticar"],
+    )
+)
+
+INTENT_FLOWS: dict[str, FlowEntry] = {
+    "request_increase": FlowEntry(
+        AgentType.CREDIT,
+        OrchestratorState.CREDIT_INCREASE_FLOW,
+        "Vou te ajudar a solicitar um aumento no seu limite de crédito. Qual valor você gostaria de ter como novo limite?",
+    ),
+    "interview": FlowEntry(
+        AgentType.INTERVIEW,
+        OrchestratorState.INTERVIEW_INCOME,
+        "Ótimo! Vou te ajudar a atualizar seu perfil financeiro. Com essas informações, podemos avaliar melhores opções de crédito para você.\n\nPara começar, qual é a sua renda mensal?",
+        reset_data=True,
+    ),
+    "exchange_rate": FlowEntry(
+        AgentType.EXCHANGE,
+        OrchestratorState.EXCHANGE_FROM,
+        "Qual moeda você quer converter? (USD, EUR, GBP, etc.)",
+    ),
+}
@@ -1,5 +1,6 @@
 import logging
-from collections import defaultdict
+import time
+from collections import OrderedDict
 from datetime import date
 
 from src.config import get_settings
@@ -13,16 +14,23 @@ logger = logging.getLogger(__name__)
 
 
 class TriageAgent:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        csv_service: CSVService | None = None,
+        auth_service: AuthService | None = None,
+        llm_service: LLMService | None = None,
+    ) -> None:
         self._settings = get_settings()
-        self._csv_service = CSVService()
-        self._auth_service = AuthService()
-        self._llm_service = LLMService()
-        self._failed_attempts: dict[str, int] = defaultdict(int)
+        self._csv_service = csv_service or CSVService()
+        self._auth_service = auth_service or AuthService()
+        self._llm_service = llm_service or LLMService()
+        # CPF -> (falhas, instante da primeira falha da janela atual), na
+        # ordem em que as janelas começaram
+        self._failed_attempts: OrderedDict[str, tuple[int, float]] = OrderedDict()
 
     async def authenticate(self, request: AuthRequest) -> AuthResponse:
         cpf = request.cpf.replace(".", "").replace("-", "")
-        remaining = self._settings.max_auth_attempts - self._failed_attempts[cpf]
+        remaining = self._settings.max_auth_attempts - self._failures(cpf)
 
         if remaining <= 0:
             logger.warning(f"Max attempts exceeded for CPF: {cpf[:3]}***")
@@ -31,8 +39,7 @@ class TriageAgent:
         client = await self._csv_service.get_client_by_cpf(cpf)
 
         if not client:
-            self._failed_attempts[cpf] += 1
-            remaining = self._settings.max_auth_attempts - self._failed_attempts[cpf]
+            remaining = self._record_failure(cpf)
             logger.info(
                 f"Client not found: {cpf[:3]}***, attempts remaining: {remaining}"
             )
@@ -40,14 +47,13 @@ class TriageAgent:
 
         client_birthdate = date.fromisoformat(client.data_nascimento)
         if client_birthdate != request.birthdate:
-            self._failed_attempts[cpf] += 1
-            remaining = self._settings.max_auth_attempts - self._failed_attempts[cpf]
+            remaining = self._record_failure(cpf)
             logger.info(
                 f"Invalid birthdate for CPF: {cpf[:3]}***, attempts remaining: {remaining}"
             )
             raise AuthenticationError(remaining_attempts=remaining)
 
-        self._failed_attempts[cpf] = 0
+        self._failed_attempts.pop(cpf, None)
 
         token = self._auth_service.create_token(cpf)
 
@@ -66,4 +72,33 @@ class TriageAgent:
 
     def reset_attempts(self, cpf: str) -> None:
         normalized_cpf = cpf.replace(".", "").replace("-", "")
-        self._failed_attempts[normalized_cpf] = 0
+        self._failed_attempts.pop(normalized_cpf, None)
+
+    def _failures(self, cpf: str) -> int:
+        """Falhas dentro da janela; a contagem zera quando a janela expira"""
+        entry = self._failed_attempts.get(cpf)
+        if entry is None:
+            return 0
+        count, window_start = entry
+        elapsed = time.monotonic() - window_start
+        if elapsed >= self._settings.auth_attempt_window_seconds:
+            del self._failed_attempts[cpf]
+            return 0
+        return count
+
+    def _record_failure(self, cpf: str) -> int:
+        count = self._failures(cpf) + 1
+        window_start = self._failed_attempts.get(cpf, (0, time.monotonic()))[1]
+        self._failed_attempts[cpf] = (count, window_start)
+        self._evict_attempts()
+        return self._settings.max_auth_attempts - count
+
+    def _evict_attempts(self) -> None:
+        """Remove janelas expiradas e, acima do limite, as mais antigas"""
+        cutoff = time.monotonic() - self._settings.auth_attempt_window_seconds
+        attempts = self._failed_attempts
+        while attempts and (
+            next(iter(attempts.values()))[1] <= cutoff
+            or len(attempts) > self._settings.auth_attempt_max_keys
+        ):
+            attempts.popitem(last=False)
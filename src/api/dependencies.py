@@ -0,0 +1,223 @@
+import hmac
+import json
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from fastapi import Header, Request, Response
+
+from src.agents.cambio import ExchangeAgent
+from src.agents.credito import CreditAgent
+from src.agents.entrevista import InterviewAgent
+from src.agents.optimized_chat import OptimizedChatAgent
+from src.agents.orchestrator import Orchestrator
+from src.agents.triagem import TriageAgent
+from src.config import get_settings
+from src.services.analytics_service import AnalyticsService
+from src.services.auth_service import get_auth_service
+from src.services.csv_service import CSVService
+from src.services.idempotency import IdempotencyStore, request_fingerprint
+from src.services.rate_limiter import RateLimiter
+from src.services.llm_service import LLMService
+from src.services.score_service import ScoreService
+from src.utils.exceptions import APIKeyNotConfiguredError, InvalidAPIKeyError
+from src.utils.singleton import singleton
+
+T = TypeVar("T")
+
+
+@singleton
+def get_csv_service() -> CSVService:
+    return CSVService()
+
+
+@singleton
+def get_llm_service() -> LLMService:
+    return LLMService()
+
+
+@singleton
+def get_score_service() -> ScoreService:
+    return ScoreService(get_csv_service())
+
+
+@singleton
+def get_analytics_service() -> AnalyticsService:
+    return AnalyticsService()
+
+
+async def require_analytics_key(x_api_key: str | None = Header(None)) -> None:
+    """Sem ANALYTICS_API_KEY configurada o endpoint fica fechado (503)"""
+    expected = get_settings().analytics_api_key
+    if not expected:
+        raise APIKeyNotConfiguredError()
+    if not hmac.compare_digest(x_api_key or "", expected):
+        raise InvalidAPIKeyError()
+
+
+@singleton
+def get_idempotency_store() -> IdempotencyStore:
+    settings = get_settings()
+    return IdempotencyStore(
+        max_entries=settings.idempotency_max_entries,
+        ttl_seconds=settings.idempotency_ttl_seconds,
+    )
+
+
+class Idempotency:
+    """Executa o handler da rota respeitando o Idempotency-Key, quando enviado"""
+
+    def __init__(
+        self,
+        store: IdempotencyStore | None = None,
+        key: str | None = None,
+        fingerprint: str = "",
+        response: Response | None = None,
+    ) -> None:
+        self._store = store
+        self._key = key
+        self._fingerprint = fingerprint
+        self._response = response
+
+    async def run(self, handler: Callable[[], Awaitable[T]]) -> T:
+        if self._store is None:
+            return await handler()
+
+        result, replayed = await self._store.run(self._key, self._fingerprint, handler)
+        if replayed:
+            self._response.headers["Idempotent-Replayed"] = "true"
+        return result
+
+
+def _idempotency_scope(request: Request, body: bytes) -> str:
+    """Credencial da requisição; nas rotas anônimas, a sessão ou o IP do cliente"""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return f"auth:{authorization}"
+
+    try:
+        session_id = json.loads(body).get("session_id")
+    except (ValueError, AttributeError):
+        session_id = None
+    if isinstance(session_id, str) and session_id:
+        return f"session:{session_id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+async def get_idempotency(
+    request: Request,
+    response: Response,
+    idempotency_key: str | None = Header(None, max_length=255),
+) -> Idempotency:
+    if not idempotency_key:
+        return Idempotency()
+
+    # A chave vale por rota e por credencial; o fingerprint cobre o conteúdo
+    body = await request.body()
+    key = request_fingerprint(
+        request.url.path, _idempotency_scope(request, body), idempotency_key
+    )
+    fingerprint = request_fingerprint(request.method, request.url.query, body)
+    return Idempotency(get_idempotency_store(), key, fingerprint, response)
+
+
+@singleton
+def get_rate_limiter() -> RateLimiter:
+    return RateLimiter.from_settings()
+
+
+def _session_charges(body: bytes) -> tuple[int, Counter[str]]:
+    """Itens do corpo (1 ou o tamanho do lote) e quantos são de cada CPF autenticado"""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        return 1, Counter()
+
+    items = payload.get("items")
+    entries = items if isinstance(items, list) else [payload]
+    orchestrator = get_orchestrator()
+    cpfs: Counter[str] = Counter()
+    for entry in entries:
+        session_id = entry.get("session_id") if isinstance(entry, dict) else None
+        if isinstance(session_id, str) and session_id:
+            cpf = orchestrator.session_cpf(session_id)
+            if cpf:
+                cpfs[cpf] += 1
+    return max(len(entries), 1), cpfs
+
+
+def rate_limit(
+    route: str, per_session: bool = False
+) -> Callable[..., Awaitable[None]]:
+    """Dependência que responde 429 antes de qualquer trabalho da rota.
+
+    Com `per_session` o CPF vem das sessões do chat unificado citadas no
+    corpo, e lotes cobram um token por item.
+    """
+
+    async def check(
+        request: Request, authorization: str | None = Header(None)
+    ) -> None:
+        limiter = get_rate_limiter()
+        if not limiter.enabled:
+            return
+
+        ip = request.client.host if request.client else "unknown"
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded and get_settings().rate_limit_trust_forwarded_for:
+            ip = forwarded.split(",")[0].strip()
+
+        cpf = None
+        if authorization and authorization[:7].lower() == "bearer ":
+            # Só tokens já validados; a verificação completa fica com a autenticação
+            cpf = get_auth_service().cached_cpf(authorization[7:])
+
+        if not per_session:
+            await limiter.check(route, ip, cpf)
+            return
+
+        cost, cpf_costs = _session_charges(await request.body())
+        await limiter.check(route, ip, cpf, cost=cost, cpf_costs=cpf_costs)
+
+    return check
+
+
+@singleton
+def get_triage_agent() -> TriageAgent:
+    return TriageAgent(get_csv_service(), get_auth_service(), get_llm_service())
+
+
+@singleton
+def get_credit_agent() -> CreditAgent:
+    return CreditAgent(get_csv_service(), get_score_service())
+
+
+@singleton
+def get_interview_agent() -> InterviewAgent:
+    return InterviewAgent(get_csv_service(), get_score_service())
+
+
+@singleton
+def get_exchange_agent() -> ExchangeAgent:
+    return ExchangeAgent()
+
+
+@singleton
+def get_chat_agent() -> OptimizedChatAgent:
+    return OptimizedChatAgent(get_csv_service(), get_auth_service(), get_llm_service())
+
+
+@singleton
+def get_orchestrator() -> Orchestrator:
+    return Orchestrator(
+        csv_service=get_csv_service(),
+        auth_service=get_auth_service(),
+        llm_service=get_llm_service(),
+        score_service=get_score_service(),
+        triage_agent=get_triage_agent(),
+        credit_agent=get_credit_agent(),
+        interview_agent=get_interview_agent(),
+        exchange_agent=get_exchange_agent(),
+    )
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.metrics import http_request_duration
+from src.utils.request_context import current_endpoint
+from src.utils.tracing import end_trace, export_trace, start_trace
+
+DEBUG_TRACE_HEADER = b"x-debug-trace"
+
+
+class RequestContextMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = current_endpoint.set(scope["path"])
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_endpoint.reset(token)
+            route = scope["path"] if "route" in scope else "unmatched"
+            http_request_duration.labels(
+                scope["method"], route, str(status_code)
+            ).observe(time.perf_counter() - start)
+
+
+class TracingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        export_path: Path | None = None,
+        always_on: bool = False,
+    ) -> None:
+        self.app = app
+        self.export_path = export_path
+        self.always_on = always_on or export_path is not None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug = any(name == DEBUG_TRACE_HEADER for name, _ in scope["headers"])
+        if not debug and not self.always_on:
+            await self.app(scope, receive, send)
+            return
+
+        trace, token = start_trace(f"{scope['method']} {scope['path']}")
+
+        async def send_wrapper(message: Message) -> None:
+            if debug and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", trace.server_timing())
+                headers.append("X-Trace-Id", trace.trace_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_trace(token)
+            if self.export_path is not None:
+                await asyncio.to_thread(export_trace, trace, self.export_path)
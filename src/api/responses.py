@@ -0,0 +1,37 @@
+import inspect
+from typing import Any
+
+from fastapi import routing
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse
+
+from src.config import Settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Versões recentes do FastAPI serializam o response_model direto para bytes
+# pelo núcleo do Pydantic, mas só quando a classe de resposta é a padrão
+NATIVE_JSON_SERIALIZATION = (
+    "dump_json" in inspect.signature(routing.serialize_response).parameters
+)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serializada com orjson (requer o pacote orjson)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def default_response_class(settings: Settings) -> Any:
+    """FastJSONResponse quando habilitada e vantajosa, senão a padrão do FastAPI"""
+    if (
+        settings.fast_json_enabled
+        and orjson is not None
+        and not NATIVE_JSON_SERIALIZATION
+    ):
+        return FastJSONResponse
+    return Default(JSONResponse)
@@ -1,4 +1,7 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
 
 from src.agents.cambio import ExchangeAgent
 from src.agents.optimized_chat import OptimizedChatAgent
@@ -6,6 +9,19 @@ from src.agents.credito import CreditAgent
 from src.agents.entrevista import InterviewAgent
 from src.agents.orchestrator import Orchestrator
 from src.agents.triagem import TriageAgent
+from src.api.dependencies import (
+    Idempotency,
+    get_analytics_service,
+    get_chat_agent,
+    get_credit_agent,
+    get_exchange_agent,
+    get_interview_agent,
+    get_idempotency,
+    get_orchestrator,
+    get_triage_agent,
+    rate_limit,
+    require_analytics_key,
+)
 from src.models.schemas import (
     AuthRequest,
     AuthResponse,
@@ -15,74 +31,168 @@ from src.models.schemas import (
     ExchangeRateResponse,
     InterviewRequest,
     InterviewResponse,
+    LimitRequestAnalyticsResponse,
     LimitIncreaseRequest,
     LimitIncreaseResponse,
+    UnifiedChatBatchRequest,
+    UnifiedChatBatchResponse,
     UnifiedChatRequest,
     UnifiedChatResponse,
 )
+from src.services.analytics_service import AnalyticsService, GroupBy
 from src.services.auth_service import get_current_cpf
 
 router = APIRouter()
 
-triage_agent = TriageAgent()
-credit_agent = CreditAgent()
-interview_agent = InterviewAgent()
-exchange_agent = ExchangeAgent()
-chat_agent = OptimizedChatAgent()
-orchestrator = Orchestrator()
-
 
-@router.post("/chat/init", response_model=ChatResponse)
-async def init_chat() -> ChatResponse:
+@router.post(
+    "/chat/init",
+    response_model=ChatResponse,
+    dependencies=[Depends(rate_limit("session_init"))],
+)
+async def init_chat(
+    chat_agent: OptimizedChatAgent = Depends(get_chat_agent),
+) -> Response:
     """Inicializa uma nova sessão de chat com mensagem de boas-vindas"""
-    return await chat_agent.init_session()
-
-
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
-    return await chat_agent.process_message(request)
+    return Response(chat_agent.init_session_json(), media_type="application/json")
 
 
-@router.post("/triage/authenticate", response_model=AuthResponse)
-async def authenticate(request: AuthRequest) -> AuthResponse:
+@router.post(
+    "/chat",
+    response_model=ChatResponse,
+    dependencies=[Depends(rate_limit("chat"))],
+)
+async def chat(
+    request: ChatRequest,
+    chat_agent: OptimizedChatAgent = Depends(get_chat_agent),
+    idempotency: Idempotency = Depends(get_idempotency),
+) -> ChatResponse:
+    return await idempotency.run(lambda: chat_agent.process_message(request))
+
+
+@router.post(
+    "/triage/authenticate",
+    response_model=AuthResponse,
+    dependencies=[Depends(rate_limit("authenticate"))],
+)
+async def authenticate(
+    request: AuthRequest,
+    triage_agent: TriageAgent = Depends(get_triage_agent),
+) -> AuthResponse:
     return await triage_agent.authenticate(request)
 
 
-@router.get("/credit/limit", response_model=CreditLimitResponse)
-async def get_credit_limit(cpf: str = Depends(get_current_cpf)) -> CreditLimitResponse:
+@router.get(
+    "/credit/limit",
+    response_model=CreditLimitResponse,
+    dependencies=[Depends(rate_limit("credit"))],
+)
+async def get_credit_limit(
+    cpf: str = Depends(get_current_cpf),
+    credit_agent: CreditAgent = Depends(get_credit_agent),
+) -> CreditLimitResponse:
     return await credit_agent.get_limit(cpf)
 
 
-@router.post("/credit/request_increase", response_model=LimitIncreaseResponse)
+@router.post(
+    "/credit/request_increase",
+    response_model=LimitIncreaseResponse,
+    dependencies=[Depends(rate_limit("credit"))],
+)
 async def request_limit_increase(
     request: LimitIncreaseRequest,
     cpf: str = Depends(get_current_cpf),
+    credit_agent: CreditAgent = Depends(get_credit_agent),
+    idempotency: Idempotency = Depends(get_idempotency),
 ) -> LimitIncreaseResponse:
-    return await credit_agent.request_increase(cpf, request)
+    return await idempotency.run(lambda: credit_agent.request_increase(cpf, request))
 
 
-@router.post("/interview/submit", response_model=InterviewResponse)
+@router.post(
+    "/interview/submit",
+    response_model=InterviewResponse,
+    dependencies=[Depends(rate_limit("interview"))],
+)
 async def submit_interview(
     request: InterviewRequest,
     cpf: str = Depends(get_current_cpf),
+    interview_agent: InterviewAgent = Depends(get_interview_agent),
+    idempotency: Idempotency = Depends(get_idempotency),
 ) -> InterviewResponse:
-    return await interview_agent.submit(cpf, request)
+    return await idempotency.run(lambda: interview_agent.submit(cpf, request))
 
 
-@router.get("/exchange", response_model=ExchangeRateResponse)
+@router.get(
+    "/exchange",
+    response_model=ExchangeRateResponse,
+    dependencies=[Depends(rate_limit("exchange"))],
+)
 async def get_exchange_rate(
     from_currency: str = Query(..., alias="from", min_length=3, max_length=3),
     to_currency: str = Query(..., alias="to", min_length=3, max_length=3),
     _cpf: str = Depends(get_current_cpf),
+    exchange_agent: ExchangeAgent = Depends(get_exchange_agent),
 ) -> ExchangeRateResponse:
     return await exchange_agent.get_rate(from_currency.upper(), to_currency.upper())
 
 
-@router.post("/unified/init", response_model=UnifiedChatResponse)
-async def init_unified_chat() -> UnifiedChatResponse:
-    return await orchestrator.init_session()
+@router.post(
+    "/unified/init",
+    response_model=UnifiedChatResponse,
+    dependencies=[Depends(rate_limit("session_init"))],
+)
+async def init_unified_chat(
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+) -> Response:
+    return Response(orchestrator.init_session_json(), media_type="application/json")
+
+
+@router.post(
+    "/unified/chat",
+    response_model=UnifiedChatResponse,
+    dependencies=[Depends(rate_limit("unified_chat", per_session=True))],
+)
+async def unified_chat(
+    request: UnifiedChatRequest,
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+    idempotency: Idempotency = Depends(get_idempotency),
+) -> UnifiedChatResponse:
+    return await idempotency.run(lambda: orchestrator.process_message(request))
+
+
+@router.post(
+    "/unified/chat:batch",
+    response_model=UnifiedChatBatchResponse,
+    dependencies=[
+        Depends(rate_limit("chat_batch")),
+        Depends(rate_limit("unified_chat", per_session=True)),
+    ],
+)
+async def unified_chat_batch(
+    request: UnifiedChatBatchRequest,
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+    idempotency: Idempotency = Depends(get_idempotency),
+) -> UnifiedChatBatchResponse:
+    """Processa mensagens acumuladas (ex.: gateways de WhatsApp) em uma chamada"""
+
+    async def run() -> UnifiedChatBatchResponse:
+        results = await orchestrator.process_batch(request.items)
+        return UnifiedChatBatchResponse(results=results)
 
+    return await idempotency.run(run)
 
-@router.post("/unified/chat", response_model=UnifiedChatResponse)
-async def unified_chat(request: UnifiedChatRequest) -> UnifiedChatResponse:
-    return await orchestrator.process_message(request)
+
+@router.get(
+    "/analytics/limit-requests",
+    response_model=LimitRequestAnalyticsResponse,
+    dependencies=[Depends(require_analytics_key)],
+)
+async def limit_request_analytics(
+    group_by: GroupBy = Query("none"),
+    start: datetime | None = Query(None),
+    end: datetime | None = Query(None),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+) -> LimitRequestAnalyticsResponse:
+    """Agrega as solicitações de aumento a partir do snapshot colunar"""
+    summary = await analytics_service.summarize(group_by, start, end)
+    return LimitRequestAnalyticsResponse(**summary)
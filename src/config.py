@@ -15,12 +15,18 @@ class Settings(BaseSettings):
     jwt_secret_key: str = "dev-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
     jwt_expiration_minutes: int = 15
+    jwt_cache_size: int = 1024
 
     use_langchain: bool = False
     llm_provider: Literal["openai", "anthropic"] = "openai"
     llm_temperature: float = 0.3
     llm_max_tokens: int = 100
     llm_model: str = "gpt-4o-mini"
+    intent_rule_confidence: int = 2
+    intent_llm_timeout_seconds: float = 3.0
+    llm_max_concurrency: int = 8
+    llm_max_queue: int = 16
+    llm_queue_timeout_seconds: float = 0.5
 
     openai_api_key: str | None = None
     anthropic_api_key: str | None = None
@@ -29,15 +35,64 @@ class Settings(BaseSettings):
     exchange_api_key: str | None = None
 
     log_level: str = "INFO"
+    fast_json_enabled: bool = True
+
+    trace_export_path: Path | None = None
+    tracing_always_on: bool = False
+    tracing_otel_enabled: bool = False
+
+    token_usage_flush_interval_seconds: float = 5.0
+    token_usage_flush_every: int = 50
 
     data_dir: Path = Path("src/data")
 
+    limit_request_group_commit: bool = True
+    limit_request_flush_window_ms: float = 0.0
+    limit_request_max_batch: int = 256
+    limit_request_log_segmented: bool = False
+    limit_request_segment_granularity: Literal["day", "month"] = "month"
+    limit_request_retention_days: int | None = None
+    limit_request_maintenance_interval_seconds: float = 3600.0
+    client_table_enabled: bool = False
+
+    analytics_api_key: str | None = None
+
+    idempotency_max_entries: int = 10_000
+    idempotency_ttl_seconds: float = 86400.0
+
     max_auth_attempts: int = 3
+    auth_attempt_window_seconds: float = 900.0
+    auth_attempt_max_keys: int = 100_000
+    conversation_history_limit: int = 20
+
+    rate_limit_enabled: bool = False
+    rate_limit_backend: Literal["memory", "redis"] = "memory"
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    rate_limit_max_keys: int = 100_000
+    rate_limit_trust_forwarded_for: bool = False
+    rate_limits: dict[str, str] = {
+        "session_init": "20/minute",
+        "chat": "30/minute",
+        "unified_chat": "30/minute",
+        "chat_batch": "10/minute",
+        "authenticate": "10/minute",
+        "credit": "30/minute",
+        "interview": "10/minute",
+        "exchange": "60/minute",
+    }
 
     @property
     def clients_csv_path(self) -> Path:
         return self.data_dir / "clientes.csv"
 
+    @property
+    def client_table_path(self) -> Path:
+        return self.data_dir / "clientes.bin"
+
+    @property
+    def token_usage_path(self) -> Path:
+        return self.data_dir / "token_usage.json"
+
     @property
     def score_limits_csv_path(self) -> Path:
         return self.data_dir / "score_limite.csv"
@@ -46,6 +101,14 @@ class Settings(BaseSettings):
     def limit_requests_csv_path(self) -> Path:
         return self.data_dir / "solicitacoes_aumento_limite.csv"
 
+    @property
+    def limit_requests_log_dir(self) -> Path:
+        return self.data_dir / "solicitacoes"
+
+    @property
+    def analytics_snapshot_path(self) -> Path:
+        return self.data_dir / "analytics" / "limit_requests.npz"
+
     def has_llm_api_key(self) -> bool:
         if self.llm_provider == "openai":
             return bool(self.openai_api_key)
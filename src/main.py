@@ -1,30 +1,82 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
+from src.api.dependencies import get_chat_agent, get_csv_service, get_orchestrator
+from src.api.middleware import RequestContextMiddleware, TracingMiddleware
+from src.api.responses import default_response_class
 from src.api.routes import router
 from src.config import get_settings
 from src.utils.logging_config import setup_logging
+from src.utils.metrics import active_sessions, registry
+from src.utils.token_monitor import token_monitor
+from src.utils.tracing import enable_opentelemetry
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     settings = get_settings()
     setup_logging(settings.log_level)
+    token_monitor.start()
+
+    # Retenção e compactação dos segmentos do log de solicitações
+    maintenance = None
+    if settings.limit_request_log_segmented:
+        maintenance = asyncio.create_task(
+            get_csv_service().run_maintenance(
+                settings.limit_request_maintenance_interval_seconds
+            )
+        )
+
     yield
 
+    if maintenance is not None:
+        maintenance.cancel()
+        with suppress(asyncio.CancelledError):
+            await maintenance
+    await token_monitor.stop()
+
+
+settings = get_settings()
 
 app = FastAPI(
     title="Agente Bancário Inteligente",
     description="Intelligent Banking Agent API",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=default_response_class(settings),
 )
 
+if settings.tracing_otel_enabled:
+    enable_opentelemetry()
+
+app.add_middleware(RequestContextMiddleware)
+app.add_middleware(
+    TracingMiddleware,
+    export_path=settings.trace_export_path,
+    always_on=settings.tracing_always_on or settings.tracing_otel_enabled,
+)
 app.include_router(router, prefix="/api")
 
 
+active_sessions.set_function(
+    lambda: {
+        ("orchestrator",): len(get_orchestrator()._sessions),
+        ("chat",): len(get_chat_agent()._sessions),
+    }
+)
+
+
 @app.get("/health")
 async def health_check() -> dict[str, str]:
     return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
+from enum import Enum
 
 
-@dataclass
+@dataclass(slots=True)
 class Client:
     cpf: str
     nome: str
@@ -24,3 +25,14 @@ class LimitRequest:
     limite_atual: float
     novo_limite_solicitado: float
     status_pedido: str
+
+
+class MessageRole(str, Enum):
+    USER = "user"
+    ASSISTANT = "assistant"
+
+
+@dataclass(slots=True)
+class ConversationMessage:
+    role: MessageRole
+    content: str
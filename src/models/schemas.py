@@ -117,3 +117,37 @@ class UnifiedChatResponse(BaseModel):
     current_agent: str
     available_actions: list[str] = []
     redirect_suggestion: RedirectAction | None = None
+
+
+class UnifiedChatBatchRequest(BaseModel):
+    items: list[UnifiedChatRequest] = Field(..., min_length=1, max_length=100)
+
+
+class UnifiedChatBatchResult(BaseModel):
+    index: int
+    response: UnifiedChatResponse | None = None
+    error: str | None = None
+
+
+class UnifiedChatBatchResponse(BaseModel):
+    results: list[UnifiedChatBatchResult]
+
+
+class LimitRequestStats(BaseModel):
+    group: str
+    count: int
+    approved: int
+    denied: int
+    approval_rate: float
+    denial_rate: float
+    avg_current_limit: float
+    avg_requested_limit: float
+    avg_increase_ratio: float
+    avg_score: float | None = None
+
+
+class LimitRequestAnalyticsResponse(BaseModel):
+    group_by: Literal["none", "status", "score_band", "month"]
+    rows: int
+    total: LimitRequestStats
+    groups: list[LimitRequestStats]
@@ -0,0 +1,424 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+from src.config import Settings, get_settings
+from src.services.limit_request_log import LIMIT_REQUEST_FIELDS, SEGMENT_PREFIX
+
+logger = logging.getLogger(__name__)
+
+GroupBy = Literal["none", "status", "score_band", "month"]
+
+SNAPSHOT_VERSION = 1
+UNKNOWN_SCORE = -1
+
+
+def _to_us(value: datetime | None) -> int | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1_000_000)
+
+
+def _file_id(path: Path) -> tuple[int, int, int] | None:
+    """(inode, tamanho, mtime): reescritas no lugar mantêm inode e tamanho"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class _Snapshot:
+    """Colunas das solicitações de aumento já com o score do cliente"""
+
+    __slots__ = (
+        "cpf",
+        "timestamp_us",
+        "current_limit",
+        "requested_limit",
+        "status",
+        "score",
+        "statuses",
+        "sources",
+        "clients_id",
+    )
+
+    def __init__(self) -> None:
+        self.cpf = np.empty(0, dtype=np.int64)
+        self.timestamp_us = np.empty(0, dtype=np.int64)
+        self.current_limit = np.empty(0, dtype=np.float64)
+        self.requested_limit = np.empty(0, dtype=np.float64)
+        self.status = np.empty(0, dtype=np.int8)
+        self.score = np.empty(0, dtype=np.int16)
+        self.statuses: list[str] = []
+        # arquivo de origem -> [inode, bytes já consumidos]
+        self.sources: dict[str, list[int]] = {}
+        self.clients_id: list[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.cpf)
+
+
+class AnalyticsService:
+    """Snapshot colunar (npz) das solicitações de aumento, atualizado de forma
+    incremental a partir do log e agregado com numpy"""
+
+    def __init__(self, settings: Settings | None = None) -> None:
+        self._settings = settings or get_settings()
+        self._snapshot_path = self._settings.analytics_snapshot_path
+        self._lock = threading.Lock()
+        self._snapshot: _Snapshot | None = None
+        self._clients_cache: tuple[tuple[int, int], Any] | None = None
+
+    async def summarize(
+        self,
+        group_by: GroupBy = "none",
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[str, Any]:
+        """Taxas de aprovação/negação e médias de limite no período [start, end)"""
+        return await asyncio.to_thread(
+            self._summarize, group_by, _to_us(start), _to_us(end)
+        )
+
+    def _summarize(
+        self, group_by: GroupBy, start_us: int | None, end_us: int | None
+    ) -> dict[str, Any]:
+        with self._lock:
+            snapshot = self.refresh()
+
+        mask = np.ones(len(snapshot), dtype=bool)
+        if start_us is not None:
+            mask &= snapshot.timestamp_us >= start_us
+        if end_us is not None:
+            mask &= snapshot.timestamp_us < end_us
+
+        return {
+            "group_by": group_by,
+            "rows": len(snapshot),
+            "total": self._aggregate(snapshot, mask, None, ["total"])[0],
+            "groups": self._grouped(snapshot, mask, group_by),
+        }
+
+    def refresh(self) -> _Snapshot:
+        """Aplica ao snapshot só o que mudou nos arquivos de origem"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._load() or _Snapshot()
+
+        sources = self._source_files()
+        source_names = {str(path) for path, _ in sources}
+        changed = False
+
+        for name, (inode, consumed) in snapshot.sources.items():
+            current = _file_id(Path(name))
+            if (
+                name not in source_names
+                or current is None
+                or current[0] != inode
+                or current[1] < consumed
+            ):
+                # Arquivo removido, compactado ou truncado: recomeça do zero
+                snapshot = _Snapshot()
+                changed = True
+                break
+
+        for path, has_header in sources:
+            file_id = _file_id(path)
+            if file_id is None:
+                continue
+            inode, size, _ = file_id
+            consumed = snapshot.sources.get(str(path), [inode, 0])[1]
+            if size > consumed:
+                consumed = self._append_from(snapshot, path, consumed, has_header)
+                snapshot.sources[str(path)] = [inode, consumed]
+                changed = True
+
+        clients_id = _file_id(self._settings.clients_csv_path)
+        clients_key = list(clients_id) if clients_id else None
+        joined = len(snapshot.score) if clients_key == snapshot.clients_id else 0
+        if joined < len(snapshot) or clients_key != snapshot.clients_id:
+            self._join_scores(snapshot, joined)
+            snapshot.clients_id = clients_key
+            changed = True
+
+        if changed:
+            self._save(snapshot)
+        self._snapshot = snapshot
+        return snapshot
+
+    def _source_files(self) -> list[tuple[Path, bool]]:
+        if self._settings.limit_request_log_segmented:
+            log_dir = self._settings.limit_requests_log_dir
+            return [
+                (path, False)
+                for path in sorted(log_dir.glob(f"{SEGMENT_PREFIX}*.csv"))
+            ]
+        return [(self._settings.limit_requests_csv_path, True)]
+
+    def _append_from(
+        self, snapshot: _Snapshot, path: Path, offset: int, has_header: bool
+    ) -> int:
+        import pandas as pd
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+
+        start = 0
+        if offset == 0 and has_header:
+            start = data.find(b"\n") + 1
+        end = data.rfind(b"\n") + 1
+        if end <= start:
+            return offset + start
+
+        frame = pd.read_csv(
+            io.BytesIO(data[start:end]),
+            header=None,
+            names=LIMIT_REQUEST_FIELDS,
+            dtype={"cpf_cliente": str, "status_pedido": str},
+            on_bad_lines="skip",
+        )
+        timestamps = pd.to_datetime(
+            frame["data_hora_solicitacao"], utc=True, format="ISO8601", errors="coerce"
+        )
+        current = pd.to_numeric(frame["limite_atual"], errors="coerce")
+        requested = pd.to_numeric(frame["novo_limite_solicitado"], errors="coerce")
+        valid = (timestamps.notna() & current.notna() & requested.notna()).to_numpy()
+
+        status_codes = self._status_codes(snapshot, frame["status_pedido"].to_numpy())
+        snapshot.cpf = np.concatenate(
+            [
+                snapshot.cpf,
+                pd.to_numeric(frame["cpf_cliente"], errors="coerce")
+                .fillna(-1)
+                .to_numpy(dtype=np.int64)[valid],
+            ]
+        )
+        snapshot.timestamp_us = np.concatenate(
+            [
+                snapshot.timestamp_us,
+                timestamps[valid]
+                .dt.tz_localize(None)
+                .to_numpy("datetime64[us]")
+                .astype(np.int64),
+            ]
+        )
+        snapshot.current_limit = np.concatenate(
+            [snapshot.current_limit, current.to_numpy(np.float64)[valid]]
+        )
+        snapshot.requested_limit = np.concatenate(
+            [snapshot.requested_limit, requested.to_numpy(np.float64)[valid]]
+        )
+        snapshot.status = np.concatenate([snapshot.status, status_codes[valid]])
+        return offset + end
+
+    def _status_codes(self, snapshot: _Snapshot, values: np.ndarray) -> np.ndarray:
+        labels, inverse = np.unique(values.astype(str), return_inverse=True)
+        mapping = np.empty(len(labels), dtype=np.int8)
+        for i, label in enumerate(labels):
+            if label not in snapshot.statuses:
+                snapshot.statuses.append(label)
+            mapping[i] = snapshot.statuses.index(label)
+        return mapping[inverse]
+
+    def _join_scores(self, snapshot: _Snapshot, start: int) -> None:
+        """Preenche o score das linhas a partir de ``start``"""
+        scores = np.full(len(snapshot) - start, UNKNOWN_SCORE, dtype=np.int16)
+        lookup = self._client_scores()
+        if lookup is not None and len(scores):
+            index, client_scores = lookup
+            positions = index.get_indexer(snapshot.cpf[start:])
+            found = positions >= 0
+            scores[found] = client_scores[positions[found]]
+        snapshot.score = np.concatenate([snapshot.score[:start], scores])
+
+    def _client_scores(self) -> tuple[Any, np.ndarray] | None:
+        import pandas as pd
+
+        clients_path = self._settings.clients_csv_path
+        file_id = _file_id(clients_path)
+        if file_id is None:
+            return None
+        if self._clients_cache is not None and self._clients_cache[0] == file_id:
+            return self._clients_cache[1]
+
+        clients = pd.read_csv(clients_path, usecols=["cpf", "score"], dtype={"cpf": str})
+        cpfs = pd.to_numeric(clients["cpf"], errors="coerce").fillna(-1)
+        index = pd.Index(cpfs.to_numpy(np.int64))
+        scores = clients["score"].to_numpy(np.int16)
+        if not index.is_unique:
+            keep = ~index.duplicated(keep="last")
+            index, scores = index[keep], scores[keep]
+
+        self._clients_cache = (file_id, (index, scores))
+        return index, scores
+
+    def _grouped(
+        self, snapshot: _Snapshot, mask: np.ndarray, group_by: GroupBy
+    ) -> list[dict[str, Any]]:
+        if group_by == "none":
+            return []
+
+        if group_by == "status":
+            keys = snapshot.status.astype(np.int64)
+            labels = list(snapshot.statuses)
+        elif group_by == "month":
+            months = snapshot.timestamp_us.astype("datetime64[us]").astype(
+                "datetime64[M]"
+            )
+            unique_months, keys = np.unique(months, return_inverse=True)
+            labels = [str(month) for month in unique_months]
+        else:
+            bands = self._score_bands()
+            edges = np.array([low for low, _ in bands[1:]])
+            keys = np.where(
+                snapshot.score == UNKNOWN_SCORE,
+                len(bands),
+                np.searchsorted(edges, snapshot.score, side="right"),
+            )
+            labels = [f"{low}-{high}" for low, high in bands] + ["unknown"]
+
+        return self._aggregate(snapshot, mask, keys, labels)
+
+    def _score_bands(self) -> list[tuple[int, int]]:
+        """Faixas de score_limite.csv, as mesmas usadas para calcular limites"""
+        path = self._settings.score_limits_csv_path
+        if not path.exists():
+            return [(0, 1000)]
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            bands = [
+                (int(row["score_min"]), int(row["score_max"]))
+                for row in csv.DictReader(f)
+            ]
+        return sorted(bands) or [(0, 1000)]
+
+    def _aggregate(
+        self,
+        snapshot: _Snapshot,
+        mask: np.ndarray,
+        keys: np.ndarray | None,
+        labels: list[str],
+    ) -> list[dict[str, Any]]:
+        size = len(labels)
+        keys = np.zeros(len(snapshot), dtype=np.int64) if keys is None else keys
+        keys = keys[mask]
+
+        def total(weights: np.ndarray | None = None) -> np.ndarray:
+            return np.bincount(keys, weights=weights, minlength=size)
+
+        status = snapshot.status[mask]
+        current = snapshot.current_limit[mask]
+        requested = snapshot.requested_limit[mask]
+        score = snapshot.score[mask]
+        known_score = score != UNKNOWN_SCORE
+
+        counts = total()
+        approved = total(self._is_status(snapshot, status, "approved"))
+        denied = total(self._is_status(snapshot, status, "denied"))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(current > 0, requested / current, 0.0)
+        sums = {
+            "current": total(current),
+            "requested": total(requested),
+            "ratio": total(ratio),
+            "score": total(np.where(known_score, score, 0).astype(np.float64)),
+        }
+        scored = total(known_score.astype(np.float64))
+
+        groups = []
+        for i, label in enumerate(labels):
+            count = int(counts[i])
+            if not count and label != "total":
+                continue
+            groups.append(
+                {
+                    "group": label,
+                    "count": count,
+                    "approved": int(approved[i]),
+                    "denied": int(denied[i]),
+                    "approval_rate": approved[i] / count if count else 0.0,
+                    "denial_rate": denied[i] / count if count else 0.0,
+                    "avg_current_limit": sums["current"][i] / count if count else 0.0,
+                    "avg_requested_limit": (
+                        sums["requested"][i] / count if count else 0.0
+                    ),
+                    "avg_increase_ratio": sums["ratio"][i] / count if count else 0.0,
+                    "avg_score": sums["score"][i] / scored[i] if scored[i] else None,
+                }
+            )
+        return groups
+
+    def _is_status(
+        self, snapshot: _Snapshot, status: np.ndarray, label: str
+    ) -> np.ndarray:
+        if label not in snapshot.statuses:
+            return np.zeros(len(status), dtype=np.float64)
+        return (status == snapshot.statuses.index(label)).astype(np.float64)
+
+    def _load(self) -> _Snapshot | None:
+        if not self._snapshot_path.exists():
+            return None
+        try:
+            with np.load(self._snapshot_path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta.get("version") != SNAPSHOT_VERSION:
+                    return None
+                snapshot = _Snapshot()
+                for column in (
+                    "cpf",
+                    "timestamp_us",
+                    "current_limit",
+                    "requested_limit",
+                    "status",
+                    "score",
+                ):
+                    setattr(snapshot, column, data[column])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable analytics snapshot: {e}")
+            return None
+
+        snapshot.statuses = meta["statuses"]
+        snapshot.sources = meta["sources"]
+        snapshot.clients_id = meta["clients_id"]
+        return snapshot
+
+    def _save(self, snapshot: _Snapshot) -> None:
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "statuses": snapshot.statuses,
+            "sources": snapshot.sources,
+            "clients_id": snapshot.clients_id,
+        }
+        self._snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self._snapshot_path.parent, prefix=".snapshot.", suffix=".npz"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    meta=np.array(json.dumps(meta)),
+                    cpf=snapshot.cpf,
+                    timestamp_us=snapshot.timestamp_us,
+                    current_limit=snapshot.current_limit,
+                    requested_limit=snapshot.requested_limit,
+                    status=snapshot.status,
+                    score=snapshot.score,
+                )
+            os.replace(tmp_path, self._snapshot_path)
+        except OSError as e:
+            Path(tmp_path).unlink(missing_ok=True)
+            logger.error(f"Failed to save analytics snapshot: {e}")
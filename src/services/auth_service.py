@@ -1,11 +1,15 @@
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
 
 from src.config import Settings, get_settings
+from src.services.token_codec import HMACTokenCodec, TokenCodec, TokenError
+from src.utils.singleton import singleton
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +17,14 @@ security = HTTPBearer()
 
 
 class AuthService:
-    def __init__(self, settings: Settings | None = None) -> None:
+    def __init__(
+        self, settings: Settings | None = None, codec: TokenCodec | None = None
+    ) -> None:
         self._settings = settings or get_settings()
+        self._codec = codec or HMACTokenCodec(
+            self._settings.jwt_secret_key, self._settings.jwt_algorithm
+        )
+        self._verified: OrderedDict[bytes, tuple[str, int]] = OrderedDict()
 
     def create_token(self, cpf: str) -> str:
         expires = datetime.now(timezone.utc) + timedelta(
@@ -25,33 +35,59 @@ class AuthService:
             "exp": expires,
             "iat": datetime.now(timezone.utc),
         }
-        return jwt.encode(
-            payload,
-            self._settings.jwt_secret_key,
-            algorithm=self._settings.jwt_algorithm,
-        )
+        return self._codec.encode(payload)
 
     def verify_token(self, token: str) -> str | None:
+        digest = hashlib.sha256(token.encode()).digest()
+        cpf = self._lookup_verified(digest)
+        if cpf is not None:
+            return cpf
+
         try:
-            payload = jwt.decode(
-                token,
-                self._settings.jwt_secret_key,
-                algorithms=[self._settings.jwt_algorithm],
-            )
+            payload = self._codec.decode(token)
             cpf: str | None = payload.get("sub")
             if cpf is None:
                 return None
-            return cpf
-        except JWTError as e:
+        except TokenError as e:
             logger.warning(f"Token verification failed: {e}")
             return None
 
+        exp = payload.get("exp")
+        if isinstance(exp, int):
+            self._cache_verified(digest, cpf, exp)
+
+        return cpf
+
+    def cached_cpf(self, token: str) -> str | None:
+        """CPF de um token já validado e não expirado, sem decodificar nada"""
+        return self._lookup_verified(hashlib.sha256(token.encode()).digest())
+
+    def _lookup_verified(self, digest: bytes) -> str | None:
+        cached = self._verified.get(digest)
+        if cached is None:
+            return None
+        cpf, exp = cached
+        if exp > time.time():
+            self._verified.move_to_end(digest)
+            return cpf
+        del self._verified[digest]
+        return None
+
+    def _cache_verified(self, digest: bytes, cpf: str, exp: int) -> None:
+        if len(self._verified) >= self._settings.jwt_cache_size:
+            self._verified.popitem(last=False)
+        self._verified[digest] = (cpf, exp)
+
+
+@singleton
+def get_auth_service() -> AuthService:
+    return AuthService()
+
 
-def get_current_cpf(
+async def get_current_cpf(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    settings: Settings = Depends(get_settings),
+    auth_service: AuthService = Depends(get_auth_service),
 ) -> str:
-    auth_service = AuthService(settings)
     cpf = auth_service.verify_token(credentials.credentials)
 
     if cpf is None:
@@ -0,0 +1,50 @@
+import asyncio
+import dataclasses
+import logging
+
+from src.models.domain import Client
+from src.services.score_service import ScoreService
+
+logger = logging.getLogger(__name__)
+
+
+def _consume_limit_error(task: asyncio.Task) -> None:
+    """Registra falhas do pré-carregamento mesmo que get_limit nunca seja chamado"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background limit lookup failed: {task.exception()}")
+
+
+class ClientSnapshot:
+    """Cópia do cliente por sessão, com o limite pré-carregado em background.
+
+    `version` é o CSVService.score_version do CPF na captura; quando difere
+    do atual o snapshot está desatualizado.
+    """
+
+    def __init__(
+        self, client: Client, score_service: ScoreService, version: int = 0
+    ) -> None:
+        self.client = client
+        self.version = version
+        self._score_service = score_service
+        self._limit_task = asyncio.create_task(
+            score_service.get_limit_for_score(client.score)
+        )
+        self._limit_task.add_done_callback(_consume_limit_error)
+
+    @property
+    def cpf(self) -> str:
+        return self.client.cpf.replace(".", "").replace("-", "")
+
+    async def get_limit(self) -> float:
+        return await asyncio.shield(self._limit_task)
+
+    def with_score(self, score: int, version: int) -> "ClientSnapshot":
+        if not self._limit_task.done():
+            self._limit_task.cancel()
+        logger.info(f"Client snapshot refreshed for CPF: {self.cpf[:3]}***")
+        return ClientSnapshot(
+            dataclasses.replace(self.client, score=score),
+            self._score_service,
+            version,
+        )
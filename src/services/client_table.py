@@ -0,0 +1,178 @@
+import bisect
+import csv
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+from src.models.domain import Client
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CLTB"
+VERSION = 1
+
+# magic, versão, larguras de cpf/nome/data, quantidade e assinatura do CSV
+_HEADER = struct.Struct("<4sHHHHIqqq")
+_HEADER_SIZE = 64
+_KEY_SIZE = 8
+
+
+def _normalize(cpf: str) -> str:
+    return cpf.replace(".", "").replace("-", "")
+
+
+def _source_signature(csv_path: Path) -> tuple[int, int, int]:
+    stat = csv_path.stat()
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _record_struct(cpf_width: int, name_width: int, date_width: int) -> struct.Struct:
+    return struct.Struct(f"<{cpf_width}s{name_width}s{date_width}sid")
+
+
+class _MappedTable:
+    """Arquivo binário mapeado em memória: cabeçalho, chaves ordenadas, registros"""
+
+    __slots__ = ("signature", "count", "keys", "records", "record")
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, cpf_w, name_w, date_w, count, *signature = (
+            _HEADER.unpack_from(mapped)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unsupported client table format in {path}")
+
+        keys_end = _HEADER_SIZE + count * _KEY_SIZE
+        self.signature = tuple(signature)
+        self.count = count
+        self.keys = memoryview(mapped)[_HEADER_SIZE:keys_end].cast("Q")
+        self.records = memoryview(mapped)[keys_end:]
+        self.record = _record_struct(cpf_w, name_w, date_w)
+
+    def find(self, key: int) -> int:
+        return bisect.bisect_left(self.keys, key)
+
+    def client_at(self, position: int) -> Client:
+        cpf, nome, data_nascimento, score, limite = self.record.unpack_from(
+            self.records, position * self.record.size
+        )
+        return Client(
+            cpf=cpf.rstrip(b"\0").decode("utf-8"),
+            nome=nome.rstrip(b"\0").decode("utf-8"),
+            data_nascimento=data_nascimento.rstrip(b"\0").decode("utf-8"),
+            score=score,
+            limite_atual=limite,
+        )
+
+
+class ClientTable:
+    """Snapshot binário de clientes.csv com busca binária por CPF.
+
+    Os registros têm largura fixa e o arquivo é lido via mmap, então os
+    workers compartilham as páginas pelo cache do sistema operacional em
+    vez de cada um manter uma cópia processada. O snapshot guarda a
+    assinatura (mtime, tamanho, inode) do CSV de origem e é reconstruído,
+    com troca atômica do arquivo, quando o CSV muda.
+    """
+
+    def __init__(self, csv_path: Path, table_path: Path) -> None:
+        self.csv_path = csv_path
+        self.table_path = table_path
+        self._table: _MappedTable | None = None
+
+    def is_current(self) -> bool:
+        return (
+            self._table is not None
+            and self._table.signature == _source_signature(self.csv_path)
+        )
+
+    def refresh(self) -> None:
+        """Reabre o snapshot em disco ou o reconstrói se estiver desatualizado.
+
+        Deve ser chamado com o lock do CSV obtido.
+        """
+        signature = _source_signature(self.csv_path)
+        if self._table is not None and self._table.signature == signature:
+            return
+
+        if self.table_path.exists():
+            try:
+                table = _MappedTable(self.table_path)
+            except (ValueError, struct.error) as e:
+                logger.warning(f"Discarding client table: {e}")
+            else:
+                if table.signature == signature:
+                    self._table = table
+                    return
+
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Compila o CSV para o formato binário (com o lock do CSV obtido)"""
+        signature = _source_signature(self.csv_path)
+        rows: list[tuple[int, bytes, bytes, bytes, int, float]] = []
+        with open(self.csv_path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                normalized = _normalize(row.get("cpf", ""))
+                if not normalized.isdigit():
+                    logger.warning("Skipping client with invalid CPF in client table")
+                    continue
+                rows.append(
+                    (
+                        int(normalized),
+                        row["cpf"].encode("utf-8"),
+                        row["nome"].encode("utf-8"),
+                        row["data_nascimento"].encode("utf-8"),
+                        int(row.get("score", 0)),
+                        float(row.get("limite_atual", 0)),
+                    )
+                )
+
+        # sort estável: com CPFs repetidos vence a primeira linha, como na leitura do CSV
+        rows.sort(key=lambda r: r[0])
+        widths = [max((len(r[i]) for r in rows), default=1) for i in (1, 2, 3)]
+        record = _record_struct(*widths)
+
+        header = _HEADER.pack(MAGIC, VERSION, *widths, len(rows), *signature)
+        keys = struct.pack(f"<{len(rows)}Q", *(r[0] for r in rows))
+        records = b"".join(record.pack(*r[1:]) for r in rows)
+
+        self.table_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.table_path.parent, prefix=f".{self.table_path.name}."
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header.ljust(_HEADER_SIZE, b"\0"))
+                f.write(keys)
+                f.write(records)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, self.table_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self._table = _MappedTable(self.table_path)
+        logger.info(f"Built client table with {len(rows)} clients")
+
+    def get(self, cpf: str) -> Client | None:
+        normalized = _normalize(cpf)
+        if not normalized.isdigit():
+            return None
+
+        table = self._table
+        key = int(normalized)
+        position = table.find(key)
+        while position < table.count and table.keys[position] == key:
+            client = table.client_at(position)
+            if _normalize(client.cpf) == normalized:
+                return client
+            position += 1
+        return None
@@ -1,29 +1,94 @@
+import asyncio
 import csv
 import logging
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
 from pathlib import Path
 from typing import Any
 
 from filelock import FileLock
 
 from src.config import get_settings
-from src.models.domain import Client
+from src.models.domain import Client, LimitRequest
+from src.services.client_table import ClientTable
+from src.services.group_commit import GroupCommitWriter
+from src.services.limit_request_log import (
+    LIMIT_REQUEST_FIELDS,
+    LimitRequestLog,
+    filter_requests,
+    parse_request,
+)
+from src.utils.metrics import csv_lock_wait, csv_operation_duration
+from src.utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
 
+def _timed(operation: str) -> Callable:
+    child = csv_operation_duration.labels(operation)
+    span_name = f"csv.{operation}"
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name), child.time():
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 class CSVService:
     def __init__(self) -> None:
         self._settings = get_settings()
+        self._limit_request_writer: GroupCommitWriter[dict[str, Any]] = (
+            GroupCommitWriter(
+                self._write_limit_requests,
+                window_seconds=self._settings.limit_request_flush_window_ms / 1000,
+                max_batch=self._settings.limit_request_max_batch,
+            )
+        )
+        self._limit_request_log: LimitRequestLog | None = None
+        if self._settings.limit_request_log_segmented:
+            self._limit_request_log = LimitRequestLog(
+                self._settings.limit_requests_log_dir,
+                granularity=self._settings.limit_request_segment_granularity,
+                retention_days=self._settings.limit_request_retention_days,
+            )
+        # CPF -> quantas vezes o score mudou; invalida os snapshots das sessões
+        self._score_versions: dict[str, int] = {}
+        self._client_table: ClientTable | None = None
+        if self._settings.client_table_enabled:
+            self._client_table = ClientTable(
+                self._settings.clients_csv_path, self._settings.client_table_path
+            )
 
     def _get_lock(self, file_path: Path) -> FileLock:
         lock_path = file_path.with_suffix(".lock")
         return FileLock(str(lock_path), timeout=10)
 
+    @contextmanager
+    def _locked(self, file_path: Path) -> Iterator[None]:
+        lock = self._get_lock(file_path)
+        start = time.perf_counter()
+        with lock:
+            csv_lock_wait.labels(file_path.name).observe(time.perf_counter() - start)
+            yield
+
+    @_timed("get_client_by_cpf")
     async def get_client_by_cpf(self, cpf: str) -> Client | None:
+        if self._client_table is not None:
+            return self._get_client_from_table(cpf)
+
         file_path = self._settings.clients_csv_path
         normalized_cpf = cpf.replace(".", "").replace("-", "")
 
-        with self._get_lock(file_path):
+        with self._locked(file_path):
             if not file_path.exists():
                 return None
 
@@ -41,11 +106,24 @@ class CSVService:
                         )
         return None
 
+    def _get_client_from_table(self, cpf: str) -> Client | None:
+        file_path = self._settings.clients_csv_path
+        table = self._client_table
+        if not file_path.exists():
+            return None
+        if not table.is_current():
+            with self._locked(file_path):
+                if not file_path.exists():
+                    return None
+                table.refresh()
+        return table.get(cpf)
+
+    @_timed("read_clients")
     async def read_clients(self) -> list[Client]:
         file_path = self._settings.clients_csv_path
         clients: list[Client] = []
 
-        with self._get_lock(file_path):
+        with self._locked(file_path):
             if not file_path.exists():
                 return clients
 
@@ -63,12 +141,13 @@ class CSVService:
                     )
         return clients
 
+    @_timed("update_client_score")
     async def update_client_score(self, cpf: str, new_score: int) -> bool:
         file_path = self._settings.clients_csv_path
         normalized_cpf = cpf.replace(".", "").replace("-", "")
         updated = False
 
-        with self._get_lock(file_path):
+        with self._locked(file_path):
             if not file_path.exists():
                 return False
 
@@ -90,38 +169,131 @@ class CSVService:
                     writer = csv.DictWriter(f, fieldnames=fieldnames)
                     writer.writeheader()
                     writer.writerows(rows)
+                if self._client_table is not None:
+                    self._client_table.rebuild()
+                self._score_versions[normalized_cpf] = (
+                    self.score_version(normalized_cpf) + 1
+                )
                 logger.info(f"Updated score for CPF: {cpf[:3]}*** to {new_score}")
 
         return updated
 
+    def score_version(self, cpf: str) -> int:
+        """Muda a cada update_client_score do CPF neste processo"""
+        return self._score_versions.get(cpf.replace(".", "").replace("-", ""), 0)
+
+    @_timed("append_limit_request")
     async def append_limit_request(self, request_data: dict[str, Any]) -> None:
+        if self._settings.limit_request_group_commit:
+            await self._limit_request_writer.submit(request_data)
+        else:
+            self._write_limit_requests([request_data], fsync=False)
+
+        logger.info(
+            f"Appended limit request for CPF: {request_data['cpf_cliente'][:3]}***"
+        )
+
+    def _write_limit_requests(
+        self, rows: list[dict[str, Any]], fsync: bool = True
+    ) -> None:
+        """Grava as linhas com um único lock, abertura de arquivo e fsync"""
+        if self._limit_request_log is not None:
+            with self._locked(self._limit_request_log.directory):
+                self._segmented_log().append(rows, fsync=fsync)
+            return
+
         file_path = self._settings.limit_requests_csv_path
-        fieldnames = [
-            "cpf_cliente",
-            "data_hora_solicitacao",
-            "limite_atual",
-            "novo_limite_solicitado",
-            "status_pedido",
-        ]
-
-        with self._get_lock(file_path):
+
+        with self._locked(file_path):
             file_exists = file_path.exists()
 
             with open(file_path, "a", encoding="utf-8", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer = csv.DictWriter(f, fieldnames=LIMIT_REQUEST_FIELDS)
                 if not file_exists:
                     writer.writeheader()
-                writer.writerow(request_data)
+                writer.writerows(rows)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
 
-        logger.info(
-            f"Appended limit request for CPF: {request_data['cpf_cliente'][:3]}***"
+    @_timed("query_limit_requests")
+    async def query_limit_requests(
+        self,
+        cpf: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        status: str | None = None,
+    ) -> list[LimitRequest]:
+        """Histórico de solicitações filtrado por CPF, período [start, end) e status"""
+        return await asyncio.to_thread(
+            self._query_limit_requests, cpf, start, end, status
         )
 
+    def _query_limit_requests(
+        self,
+        cpf: str | None,
+        start: datetime | None,
+        end: datetime | None,
+        status: str | None,
+    ) -> list[LimitRequest]:
+        if self._limit_request_log is not None:
+            with self._locked(self._limit_request_log.directory):
+                return self._segmented_log().query(cpf, start, end, status)
+
+        file_path = self._settings.limit_requests_csv_path
+        with self._locked(file_path):
+            if not file_path.exists():
+                return []
+            with open(file_path, "r", encoding="utf-8", newline="") as f:
+                requests = [
+                    parse_request([row[field] for field in LIMIT_REQUEST_FIELDS])
+                    for row in csv.DictReader(f)
+                ]
+        return filter_requests(requests, cpf, start, end, status)
+
+    def _segmented_log(self) -> LimitRequestLog:
+        """No primeiro uso, migra o CSV antigo para os segmentos (com o lock já obtido)"""
+        log = self._limit_request_log
+        legacy_path = self._settings.limit_requests_csv_path
+        if not log.directory.exists() and legacy_path.exists():
+            imported = log.import_csv(legacy_path)
+            logger.info(f"Imported {imported} limit requests into segmented log")
+        return log
+
+    @_timed("maintain_limit_requests")
+    async def maintain_limit_requests(self) -> dict[str, list[str]]:
+        """Aplica a retenção e compacta os segmentos fechados do log"""
+        if self._limit_request_log is None:
+            return {"removed": [], "compacted": []}
+
+        def run() -> dict[str, list[str]]:
+            with self._locked(self._limit_request_log.directory):
+                log = self._segmented_log()
+                return {"removed": log.apply_retention(), "compacted": log.compact()}
+
+        return await asyncio.to_thread(run)
+
+    async def run_maintenance(self, interval_seconds: float) -> None:
+        """Executa maintain_limit_requests periodicamente (tarefa do lifespan)"""
+        while True:
+            try:
+                result = await self.maintain_limit_requests()
+            except Exception as e:
+                logger.error(f"Limit request maintenance failed: {e}")
+            else:
+                if result["removed"] or result["compacted"]:
+                    logger.info(
+                        f"Limit request maintenance: removed {len(result['removed'])}, "
+                        f"compacted {len(result['compacted'])} segments"
+                    )
+            await asyncio.sleep(interval_seconds)
+
+    @_timed("read_score_limits")
     async def read_score_limits(self) -> list[dict[str, Any]]:
         file_path = self._settings.score_limits_csv_path
         limits: list[dict[str, Any]] = []
 
-        with self._get_lock(file_path):
+        with self._locked(file_path):
             if not file_path.exists():
                 return limits
 
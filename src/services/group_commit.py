@@ -0,0 +1,69 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class GroupCommitWriter(Generic[T]):
+    """Agrupa itens de chamadas concorrentes em uma única escrita (group commit).
+
+    Enquanto um lote está sendo gravado, os novos itens se acumulam e seguem
+    juntos no próximo lote. Cada chamador só retorna depois que o lote com o
+    seu item foi gravado (ou recebe a exceção da escrita).
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[list[T]], None],
+        window_seconds: float = 0.0,
+        max_batch: int = 256,
+    ) -> None:
+        self._write_batch = write_batch
+        self._window_seconds = window_seconds
+        self._max_batch = max_batch
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._flusher: asyncio.Task | None = None
+        self.batches_written = 0
+        self.items_written = 0
+
+    async def submit(self, item: T) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if (
+            self._flusher is None
+            or self._flusher.done()
+            or self._flusher.get_loop() is not loop
+        ):
+            self._flusher = loop.create_task(self._flush_pending())
+
+        await asyncio.shield(future)
+
+    async def _flush_pending(self) -> None:
+        if self._window_seconds:
+            await asyncio.sleep(self._window_seconds)
+
+        while self._pending:
+            batch = self._pending[: self._max_batch]
+            del self._pending[: self._max_batch]
+            items = [item for item, _ in batch]
+
+            try:
+                await asyncio.to_thread(self._write_batch, items)
+            except Exception as e:
+                logger.error(f"Group commit of {len(items)} items failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches_written += 1
+            self.items_written += len(items)
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
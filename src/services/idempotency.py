@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from src.utils.exceptions import IdempotencyKeyReusedError
+from src.utils.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def request_fingerprint(*parts: str | bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "created_at", "future", "done", "result")
+
+    def __init__(self, fingerprint: str, future: asyncio.Future) -> None:
+        self.fingerprint = fingerprint
+        self.created_at = time.monotonic()
+        self.future = future
+        self.done = False
+        self.result: Any = None
+
+
+class IdempotencyStore:
+    """Cache limitado de respostas por Idempotency-Key.
+
+    A primeira requisição com uma chave executa o handler; as repetições
+    recebem a mesma resposta sem executá-lo de novo, inclusive as que chegam
+    enquanto a primeira ainda está em andamento. Reusar a chave com outro
+    conteúdo (fingerprint diferente) é rejeitado. Falhas não são guardadas,
+    para que o cliente possa tentar novamente.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 86400) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.replays = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def run(
+        self, key: str, fingerprint: str, handler: Callable[[], Awaitable[T]]
+    ) -> tuple[T, bool]:
+        """Retorna (resposta, replay)"""
+        entry = self._lookup(key)
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyReusedError()
+            record_cache("idempotency", hit=True)
+            self.replays += 1
+            if entry.done:
+                return entry.result, True
+            return await asyncio.shield(entry.future), True
+
+        record_cache("idempotency", hit=False)
+        entry = _Entry(fingerprint, asyncio.get_running_loop().create_future())
+        self._entries[key] = entry
+        self._evict()
+
+        try:
+            result = await handler()
+        except BaseException as e:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            if not entry.future.done():
+                entry.future.set_exception(e)
+                # Evita o aviso de exceção não consumida quando não há esperas
+                entry.future.exception()
+            raise
+
+        entry.result = result
+        entry.done = True
+        entry.future.set_result(result)
+        return result, False
+
+    def _lookup(self, key: str) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.done and time.monotonic() - entry.created_at > self._ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
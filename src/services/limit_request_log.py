@@ -0,0 +1,362 @@
+import csv
+import io
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Literal
+
+from src.models.domain import LimitRequest
+
+logger = logging.getLogger(__name__)
+
+LIMIT_REQUEST_FIELDS = [
+    "cpf_cliente",
+    "data_hora_solicitacao",
+    "limite_atual",
+    "novo_limite_solicitado",
+    "status_pedido",
+]
+
+Granularity = Literal["day", "month"]
+
+SEGMENT_PREFIX = "solicitacoes_"
+
+
+def _parse_timestamp(value: str) -> datetime:
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def _encode_row(row: dict[str, Any]) -> bytes:
+    buffer = io.StringIO()
+    csv.DictWriter(buffer, fieldnames=LIMIT_REQUEST_FIELDS).writerow(row)
+    return buffer.getvalue().encode("utf-8")
+
+
+def parse_request(values: list[str]) -> LimitRequest:
+    return LimitRequest(
+        cpf_cliente=values[0],
+        data_hora_solicitacao=values[1],
+        limite_atual=float(values[2]),
+        novo_limite_solicitado=float(values[3]),
+        status_pedido=values[4],
+    )
+
+
+def filter_requests(
+    requests: list[LimitRequest],
+    cpf: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    status: str | None = None,
+) -> list[LimitRequest]:
+    selected = []
+    for request in requests:
+        if cpf is not None and request.cpf_cliente != cpf:
+            continue
+        if status is not None and request.status_pedido != status:
+            continue
+        timestamp = _parse_timestamp(request.data_hora_solicitacao)
+        if start is not None and timestamp < start:
+            continue
+        if end is not None and timestamp >= end:
+            continue
+        selected.append((timestamp, request))
+
+    selected.sort(key=lambda item: item[0])
+    return [request for _, request in selected]
+
+
+class _SegmentIndex:
+    """Índice CPF -> [(offset, tamanho)] de um segmento, carregado incrementalmente"""
+
+    __slots__ = ("entries", "index_size", "indexed_end", "inode")
+
+    def __init__(self, inode: int | None = None) -> None:
+        self.entries: dict[str, list[tuple[int, int]]] = {}
+        self.index_size = 0
+        self.indexed_end = 0
+        self.inode = inode
+
+    def add(self, cpf: str, offset: int, length: int) -> None:
+        self.entries.setdefault(cpf, []).append((offset, length))
+        self.indexed_end = max(self.indexed_end, offset + length)
+
+
+class LimitRequestLog:
+    """Log de solicitações de aumento dividido em segmentos por período.
+
+    Cada segmento ``solicitacoes_<período>.csv`` tem um índice
+    ``solicitacoes_<período>.idx`` com linhas ``cpf,offset,tamanho``. A classe
+    não faz lock: quem chama serializa escritas e leituras.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        granularity: Granularity = "month",
+        retention_days: int | None = None,
+    ) -> None:
+        self.directory = directory
+        self.granularity = granularity
+        self.retention_days = retention_days
+        self._indexes: dict[str, _SegmentIndex] = {}
+
+    def segment_key(self, timestamp: datetime) -> str:
+        if self.granularity == "day":
+            return timestamp.strftime("%Y-%m-%d")
+        return timestamp.strftime("%Y-%m")
+
+    def segment_bounds(self, key: str) -> tuple[datetime, datetime]:
+        if self.granularity == "day":
+            start = datetime.strptime(key, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            return start, start + timedelta(days=1)
+        start = datetime.strptime(key, "%Y-%m").replace(tzinfo=timezone.utc)
+        end = (start + timedelta(days=32)).replace(day=1)
+        return start, end
+
+    def _segment_path(self, key: str) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{key}.csv"
+
+    def _index_path(self, key: str) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{key}.idx"
+
+    def _compacted_path(self, key: str) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{key}.compacted"
+
+    def segments(self) -> list[str]:
+        if not self.directory.exists():
+            return []
+        return sorted(
+            path.stem[len(SEGMENT_PREFIX) :]
+            for path in self.directory.glob(f"{SEGMENT_PREFIX}*.csv")
+        )
+
+    def append(self, rows: list[dict[str, Any]], fsync: bool = True) -> None:
+        by_segment: dict[str, list[dict[str, Any]]] = {}
+        for row in rows:
+            key = self.segment_key(_parse_timestamp(row["data_hora_solicitacao"]))
+            by_segment.setdefault(key, []).append(row)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for key, segment_rows in by_segment.items():
+            self._append_segment(key, segment_rows, fsync)
+
+    def _append_segment(
+        self, key: str, rows: list[dict[str, Any]], fsync: bool
+    ) -> None:
+        index = self._load_index(key)
+        entries: list[tuple[str, int, int]] = []
+
+        segment_path = self._segment_path(key)
+        if segment_path.exists() and segment_path.stat().st_size > index.indexed_end:
+            os.truncate(segment_path, index.indexed_end)
+
+        with open(segment_path, "ab") as f:
+            offset = f.tell()
+            chunks = []
+            for row in rows:
+                encoded = _encode_row(row)
+                entries.append((str(row["cpf_cliente"]), offset, len(encoded)))
+                chunks.append(encoded)
+                offset += len(encoded)
+            f.write(b"".join(chunks))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        index_lines = "".join(f"{cpf},{off},{length}\n" for cpf, off, length in entries)
+        with open(self._index_path(key), "a", encoding="utf-8") as f:
+            f.write(index_lines)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        for cpf, off, length in entries:
+            index.add(cpf, off, length)
+        index.index_size += len(index_lines.encode("utf-8"))
+
+    def _load_index(self, key: str) -> _SegmentIndex:
+        """Lê só o que foi acrescentado ao índice desde a última carga e
+        indexa linhas do segmento que ficaram sem entrada (ex.: queda entre
+        a escrita do segmento e a do índice)"""
+        index_path = self._index_path(key)
+        stat = index_path.stat() if index_path.exists() else None
+        inode = stat.st_ino if stat else None
+
+        index = self._indexes.get(key)
+        if index is None or (index.inode is not None and index.inode != inode):
+            # Arquivo de índice novo ou substituído por uma compactação
+            index = self._indexes[key] = _SegmentIndex(inode)
+        index.inode = inode
+
+        if stat is not None and stat.st_size > index.index_size:
+            with open(index_path, "rb") as f:
+                f.seek(index.index_size)
+                data = f.read()
+            complete = data[: data.rfind(b"\n") + 1]
+            if len(complete) < len(data):
+                os.truncate(index_path, index.index_size + len(complete))
+            for line in complete.decode("utf-8").splitlines():
+                cpf, offset, length = line.split(",")
+                index.add(cpf, int(offset), int(length))
+            index.index_size += len(complete)
+
+        segment_path = self._segment_path(key)
+        if segment_path.exists() and segment_path.stat().st_size > index.indexed_end:
+            self._index_tail(key, index)
+
+        return index
+
+    def _index_tail(self, key: str, index: _SegmentIndex) -> None:
+        with open(self._segment_path(key), "rb") as f:
+            f.seek(index.indexed_end)
+            offset = index.indexed_end
+            lines = []
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                cpf = line.split(b",", 1)[0].decode("utf-8")
+                lines.append(f"{cpf},{offset},{len(line)}\n")
+                index.add(cpf, offset, len(line))
+                offset += len(line)
+
+        if lines:
+            logger.warning(f"Reindexed {len(lines)} rows in segment {key}")
+            with open(self._index_path(key), "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+            stat = self._index_path(key).stat()
+            index.index_size, index.inode = stat.st_size, stat.st_ino
+
+    def query(
+        self,
+        cpf: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        status: str | None = None,
+    ) -> list[LimitRequest]:
+        candidates: list[LimitRequest] = []
+        for key in self.segments():
+            segment_start, segment_end = self.segment_bounds(key)
+            if start is not None and segment_end <= start:
+                continue
+            if end is not None and segment_start >= end:
+                continue
+            candidates.extend(self._read_segment(key, cpf))
+
+        return filter_requests(candidates, cpf, start, end, status)
+
+    def _read_segment(self, key: str, cpf: str | None) -> list[LimitRequest]:
+        path = self._segment_path(key)
+        if cpf is None:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                return [
+                    parse_request(values)
+                    for values in csv.reader(f)
+                    if len(values) == len(LIMIT_REQUEST_FIELDS)
+                ]
+
+        locations = self._load_index(key).entries.get(cpf, [])
+        requests = []
+        with open(path, "rb") as f:
+            for offset, length in locations:
+                f.seek(offset)
+                line = f.read(length).decode("utf-8")
+                requests.append(parse_request(next(csv.reader([line]))))
+        return requests
+
+    def apply_retention(self, now: datetime | None = None) -> list[str]:
+        """Remove segmentos inteiramente anteriores à janela de retenção"""
+        if self.retention_days is None:
+            return []
+
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(
+            days=self.retention_days
+        )
+        removed = []
+        for key in self.segments():
+            if self.segment_bounds(key)[1] <= cutoff:
+                self._segment_path(key).unlink(missing_ok=True)
+                self._index_path(key).unlink(missing_ok=True)
+                self._compacted_path(key).unlink(missing_ok=True)
+                self._indexes.pop(key, None)
+                removed.append(key)
+
+        if removed:
+            logger.info(f"Retention removed {len(removed)} limit request segments")
+        return removed
+
+    def compact(self, now: datetime | None = None) -> list[str]:
+        """Reescreve segmentos fechados agrupados por CPF e refaz o índice,
+        descartando linhas incompletas. Segmentos sem escrita desde a última
+        compactação são ignorados."""
+        now = now or datetime.now(timezone.utc)
+        compacted = []
+        for key in self.segments():
+            if self.segment_bounds(key)[1] > now:
+                continue
+            marker = self._compacted_path(key)
+            size = self._segment_path(key).stat().st_size
+            if marker.exists() and marker.read_text() == str(size):
+                continue
+            self._compact_segment(key)
+            marker.write_text(str(self._segment_path(key).stat().st_size))
+            compacted.append(key)
+        return compacted
+
+    def _compact_segment(self, key: str) -> None:
+        path = self._segment_path(key)
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = [
+                values
+                for values in csv.reader(f)
+                if len(values) == len(LIMIT_REQUEST_FIELDS)
+            ]
+        rows.sort(key=lambda values: (values[0], values[1]))
+
+        index = _SegmentIndex()
+        segment_data = bytearray()
+        index_lines = []
+        for values in rows:
+            encoded = _encode_row(dict(zip(LIMIT_REQUEST_FIELDS, values)))
+            index.add(values[0], len(segment_data), len(encoded))
+            index_lines.append(f"{values[0]},{len(segment_data)},{len(encoded)}\n")
+            segment_data += encoded
+        index_data = "".join(index_lines).encode("utf-8")
+
+        self._replace(path, bytes(segment_data))
+        self._replace(self._index_path(key), index_data)
+        index.index_size = len(index_data)
+        index.inode = self._index_path(key).stat().st_ino
+        self._indexes[key] = index
+
+    def _replace(self, path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def import_csv(self, path: Path, batch_size: int = 10_000) -> int:
+        """Migra um CSV no formato antigo (arquivo único) para os segmentos"""
+        imported = 0
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            batch = []
+            for row in csv.DictReader(f):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self.append(batch, fsync=False)
+                    imported += len(batch)
+                    batch = []
+            self.append(batch)
+            imported += len(batch)
+        return imported
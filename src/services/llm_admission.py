@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from src.utils.metrics import llm_admission_rejections, llm_in_flight, llm_queue_depth
+
+logger = logging.getLogger(__name__)
+
+
+class LLMSaturatedError(Exception):
+    """Chamada recusada pelo controle de admissão; o chamador usa as regras"""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"LLM admission rejected: {reason}")
+        self.reason = reason
+
+
+class AdmissionController:
+    """Limita as chamadas simultâneas ao provedor de LLM.
+
+    Até `max_concurrent` chamadas rodam ao mesmo tempo e até `max_queue`
+    esperam por uma vaga, cada uma por no máximo `queue_timeout_seconds`.
+    Com a fila cheia a chamada é recusada na hora, para que o turno siga
+    pelo caminho baseado em regras em vez de esperar o provedor.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_queue: int = 16,
+        queue_timeout_seconds: float = 0.5,
+    ) -> None:
+        self._max_concurrent = max_concurrent
+        self._max_queue = max_queue
+        self._queue_timeout_seconds = queue_timeout_seconds
+        self._waiters: deque[asyncio.Future] = deque()
+        self.in_flight = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def saturated(self) -> bool:
+        return (
+            self.in_flight >= self._max_concurrent
+            and len(self._waiters) >= self._max_queue
+        )
+
+    @asynccontextmanager
+    async def slot(self, prompt_type: str) -> AsyncIterator[None]:
+        await self.acquire(prompt_type)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, prompt_type: str) -> None:
+        if self.in_flight < self._max_concurrent and not self._waiters:
+            self.in_flight += 1
+            self._publish()
+            return
+
+        if len(self._waiters) >= self._max_queue:
+            self._reject(prompt_type, "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        try:
+            await asyncio.wait((waiter,), timeout=self._queue_timeout_seconds)
+        except BaseException:
+            # Cancelado enquanto esperava: devolve a vaga se ela já foi repassada
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+        if not waiter.done():
+            self._discard(waiter)
+            self._reject(prompt_type, "queue_timeout")
+        # release() repassou a vaga sem decrementar in_flight
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._publish()
+                return
+        self.in_flight -= 1
+        self._publish()
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._publish()
+
+    def _reject(self, prompt_type: str, reason: str) -> None:
+        llm_admission_rejections.labels(prompt_type, reason).inc()
+        logger.info(f"LLM call shed ({reason}) for {prompt_type}")
+        raise LLMSaturatedError(reason)
+
+    def _publish(self) -> None:
+        llm_in_flight.set(self.in_flight)
+        llm_queue_depth.set(len(self._waiters))
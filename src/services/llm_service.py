@@ -1,8 +1,13 @@
+import asyncio
 import logging
 import re
-from typing import Literal, Optional
+import time
+from collections.abc import Sequence
+from typing import Any, Literal, Optional
 
 from src.config import get_settings
+from src.models.domain import ConversationMessage, MessageRole
+from src.services.llm_admission import AdmissionController
 from src.utils.text_normalizer import normalize_text, parse_boolean_response
 from src.utils.value_extractor import (
     extract_monetary_value,
@@ -10,6 +15,9 @@ from src.utils.value_extractor import (
     extract_employment_type,
     extract_currency_code,
 )
+from src.utils.metrics import llm_request_duration, record_cache
+from src.utils.token_monitor import token_monitor
+from src.utils.tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -213,15 +221,38 @@ class NaturalLanguageParser:
         )
 
 
+def extract_token_usage(result: Any) -> tuple[int, int]:
+    usage = getattr(result, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    metadata = getattr(result, "response_metadata", None) or {}
+    usage = metadata.get("token_usage") or metadata.get("usage") or {}
+    return (
+        usage.get("prompt_tokens", usage.get("input_tokens", 0)),
+        usage.get("completion_tokens", usage.get("output_tokens", 0)),
+    )
+
+
 class LLMService:
     def __init__(self) -> None:
         self._settings = get_settings()
         self._llm = None
         self._intent_chain = None
         self.parser = NaturalLanguageParser()
+        self._admission = AdmissionController(
+            max_concurrent=self._settings.llm_max_concurrency,
+            max_queue=self._settings.llm_max_queue,
+            queue_timeout_seconds=self._settings.llm_queue_timeout_seconds,
+        )
 
     def _should_use_langchain(self) -> bool:
-        return self._settings.use_langchain and self._settings.has_llm_api_key()
+        """Com a fila de admissão cheia o turno segue direto pelas regras"""
+        return (
+            self._settings.use_langchain
+            and self._settings.has_llm_api_key()
+            and not self._admission.saturated()
+        )
 
     def _get_llm(self, max_tokens: int = 80, temperature: float | None = None):
 
@@ -243,12 +274,36 @@ class LLMService:
             from langchain_anthropic import ChatAnthropic
 
             return ChatAnthropic(
-                model="claude-3-haiku-20240307",
+                model=self._model_name(),
                 api_key=self._settings.anthropic_api_key,
                 temperature=temp,
                 max_tokens=max_tokens,
             )
 
+    def _model_name(self) -> str:
+        if self._settings.llm_provider == "openai":
+            return self._settings.llm_model
+        return "claude-3-haiku-20240307"
+
+    async def _invoke(self, chain: Any, inputs: dict, prompt_type: str) -> Any:
+        async with self._admission.slot(prompt_type):
+            start = time.perf_counter()
+            with span("llm.invoke", prompt_type=prompt_type):
+                result = await chain.ainvoke(inputs)
+        elapsed = time.perf_counter() - start
+        latency_ms = elapsed * 1000
+        llm_request_duration.labels(prompt_type).observe(elapsed)
+
+        input_tokens, output_tokens = extract_token_usage(result)
+        token_monitor.track_llm_call(
+            model=self._model_name(),
+            prompt_type=prompt_type,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_ms=latency_ms,
+        )
+        return result
+
     def _init_intent_chain(self) -> None:
         if self._intent_chain is not None:
             return
@@ -265,14 +320,33 @@ class LLMService:
             logger.error(f"Failed to initialize intent chain: {e}")
             self._intent_chain = None
 
+    @traced("llm.classify_intent")
     async def classify_intent(self, message: str | None) -> IntentType | None:
         if not message:
             return None
 
-        if self._should_use_langchain():
-            intent = await self._classify_with_langchain(message)
-            if intent and intent != "other":
-                return intent
+        if not self._should_use_langchain():
+            return self._classify_with_rules(message)
+
+        llm_task = asyncio.create_task(self._classify_with_langchain(message))
+
+        scores = self._score_intents(message)
+        confident = self._confident_intent(scores)
+        if confident is not None:
+            llm_task.cancel()
+            logger.info(f"Rule-based intent: {confident} (high confidence)")
+            return confident
+
+        try:
+            intent = await asyncio.wait_for(
+                llm_task, timeout=self._settings.intent_llm_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Intent classification timed out, using rules")
+            intent = None
+
+        if intent and intent != "other":
+            return intent
 
         return self._classify_with_rules(message)
 
@@ -280,14 +354,19 @@ class LLMService:
 
         cache_key = f"intent:{message[:50]}"
         if cache_key in _response_cache:
+            record_cache("intent", hit=True)
+            token_monitor.track_cache_hit(prompt_type="intent")
             return _response_cache[cache_key]
+        record_cache("intent", hit=False)
 
         try:
             self._init_intent_chain()
             if self._intent_chain is None:
                 return None
 
-            result = await self._intent_chain.ainvoke({"message": message})
+            result = await self._invoke(
+                self._intent_chain, {"message": message}, "intent"
+            )
             output = (
                 (result.content if hasattr(result, "content") else str(result))
                 .strip()
@@ -315,7 +394,7 @@ class LLMService:
             logger.warning(f"Intent classification failed: {e}")
             return None
 
-    def _classify_with_rules(self, message: str) -> IntentType | None:
+    def _score_intents(self, message: str) -> dict[IntentType, int]:
         normalized = re.sub(r"[^\w\s]", " ", message.lower())
 
         scores: dict[IntentType, int] = {
@@ -326,9 +405,30 @@ class LLMService:
         }
 
         for intent, keywords in INTENT_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in normalized:
-                    scores[intent] += 1
+            matched = [keyword for keyword in keywords if keyword in normalized]
+            # "limit" dentro de "limite" (ou "limite" em "meu limite") conta uma vez
+            scores[intent] = sum(
+                1
+                for keyword in matched
+                if not any(keyword != other and keyword in other for other in matched)
+            )
+
+        return scores
+
+    def _confident_intent(self, scores: dict[IntentType, int]) -> IntentType | None:
+        matched = [intent for intent, score in scores.items() if score > 0]
+        if len(matched) != 1:
+            return None
+
+        intent = matched[0]
+        if scores[intent] >= self._settings.intent_rule_confidence:
+            return intent
+
+        return None
+
+    def _classify_with_rules(self, message: str) -> IntentType | None:
+        normalized = re.sub(r"[^\w\s]", " ", message.lower())
+        scores = self._score_intents(message)
 
         if all(s == 0 for s in scores.values()):
             return None
@@ -346,6 +446,7 @@ class LLMService:
 
         return None
 
+    @traced("llm.generate_response")
     async def generate_response(self, prompt: str) -> str:
 
         if self._should_use_langchain():
@@ -367,7 +468,7 @@ class LLMService:
             )
             chain = prompt_template | self._get_llm(max_tokens=80)
 
-            result = await chain.ainvoke({"prompt": prompt})
+            result = await self._invoke(chain, {"prompt": prompt}, "generate")
             response = result.content if hasattr(result, "content") else str(result)
 
             logger.info("Response generated")
@@ -394,11 +495,12 @@ class LLMService:
         else:
             return "Como posso ajudar? Limite, aumento, câmbio ou perfil?"
 
+    @traced("llm.humanize_response")
     async def humanize_response(
         self,
         user_message: str,
         technical_response: str,
-        conversation_context: list[dict] | None = None,
+        conversation_context: Sequence[ConversationMessage] | None = None,
         user_name: str | None = None,
     ) -> str:
 
@@ -415,7 +517,7 @@ class LLMService:
         self,
         user_message: str,
         technical_response: str,
-        conversation_context: list[dict] | None,
+        conversation_context: Sequence[ConversationMessage] | None,
         user_name: str | None,
     ) -> str | None:
 
@@ -427,8 +529,8 @@ class LLMService:
             ctx = ""
             if conversation_context and len(conversation_context) >= 2:
                 last = conversation_context[-2]
-                if last.get("role") == "assistant":
-                    ctx = f"[Ant:{last.get('content', '')[:50]}]"
+                if last.role == MessageRole.ASSISTANT:
+                    ctx = f"[Ant:{last.content[:50]}]"
 
             system_prompt = f"""Banco Ágil.Humanize de forma clara e amigável.{name_part}{ctx}
 U:"{user_message}"
@@ -438,7 +540,7 @@ T:"{technical_response}"
             template = PromptTemplate(input_variables=[], template=system_prompt)
             chain = template | self._get_llm(max_tokens=100, temperature=0.5)
 
-            result = await chain.ainvoke({})
+            result = await self._invoke(chain, {}, "humanize")
             response = result.content if hasattr(result, "content") else str(result)
 
             logger.info("Response humanized")
@@ -0,0 +1,182 @@
+import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Protocol
+
+from src.config import Settings, get_settings
+from src.utils.exceptions import RateLimitExceededError
+from src.utils.metrics import rate_limit_rejections
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0}
+_SPEC = re.compile(r"\s*(\d+(?:\.\d+)?)\s*/\s*(second|minute|hour)\s*")
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Token bucket: `capacity` de rajada, reposto a `refill_per_second`"""
+
+    capacity: float
+    refill_per_second: float
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """Lê limites no formato "30/minute", "5/second" ou "1000/hour" """
+        match = _SPEC.fullmatch(spec)
+        if match is None:
+            raise ValueError(f"Invalid rate limit: {spec!r}")
+        amount = float(match.group(1))
+        period = _PERIODS[match.group(2)]
+        return cls(capacity=amount, refill_per_second=amount / period)
+
+
+class BucketStore(Protocol):
+    async def take(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        """Consome `cost` tokens; retorna 0 se permitido ou os segundos até haver"""
+        ...
+
+
+class InMemoryBucketStore:
+    """Buckets no processo, com descarte LRU acima de `max_keys`"""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [limit.capacity, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            refill = (now - bucket[1]) * limit.refill_per_second
+            bucket[0] = min(limit.capacity, bucket[0] + refill)
+            bucket[1] = now
+
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        return (cost - bucket[0]) / limit.refill_per_second
+
+
+_REDIS_TAKE = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """Buckets compartilhados entre workers/instâncias (requer o pacote redis).
+
+    O refill e o consumo rodam num script Lua com o relógio do Redis, então
+    são atômicos e independentes do relógio de cada worker. Se o Redis
+    estiver indisponível a requisição é liberada (fail open).
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:") -> None:
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis requires the 'redis' package"
+            ) from e
+
+        self._redis = Redis.from_url(url)
+        self._script = self._redis.register_script(_REDIS_TAKE)
+        self._prefix = prefix
+
+    async def take(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        try:
+            wait = await self._script(
+                keys=[self._prefix + key],
+                args=[limit.capacity, limit.refill_per_second, cost],
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit backend unavailable, allowing request: {e}")
+            return 0.0
+        return float(wait)
+
+
+class RateLimiter:
+    """Aplica os limites por rota, por IP e por CPF autenticado"""
+
+    def __init__(
+        self,
+        store: BucketStore,
+        limits: dict[str, RateLimit],
+        enabled: bool = True,
+    ) -> None:
+        self._store = store
+        self._limits = limits
+        self.enabled = enabled
+
+    @classmethod
+    def from_settings(cls, settings: Settings | None = None) -> "RateLimiter":
+        settings = settings or get_settings()
+        if settings.rate_limit_backend == "redis":
+            store: BucketStore = RedisBucketStore(settings.rate_limit_redis_url)
+        else:
+            store = InMemoryBucketStore(settings.rate_limit_max_keys)
+        limits = {
+            route: RateLimit.parse(spec) for route, spec in settings.rate_limits.items()
+        }
+        return cls(store, limits, enabled=settings.rate_limit_enabled)
+
+    async def check(
+        self,
+        route: str,
+        ip: str,
+        cpf: str | None = None,
+        cost: int = 1,
+        cpf_costs: Mapping[str, int] | None = None,
+    ) -> None:
+        """Cobra `cost` tokens do IP e do CPF; `cpf_costs` cobra outros CPFs.
+
+        Um lote maior que a rajada da rota é sempre recusado.
+        """
+        limit = self._limits.get(route)
+        if not self.enabled or limit is None:
+            return
+
+        scopes = [("ip", ip, cost)]
+        if cpf:
+            scopes.append(("cpf", cpf, cost))
+        for identity, amount in (cpf_costs or {}).items():
+            if identity != cpf:
+                scopes.append(("cpf", identity, amount))
+
+        for scope, identity, amount in scopes:
+            wait = await self._store.take(
+                f"{route}:{scope}:{identity}", limit, amount
+            )
+            if wait > 0:
+                rate_limit_rejections.labels(route, scope).inc()
+                logger.info(f"Rate limit exceeded on {route} by {scope}")
+                raise RateLimitExceededError(retry_after=wait)
@@ -1,6 +1,7 @@
 import logging
 
 from src.services.csv_service import CSVService
+from src.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +31,10 @@ PESO_DIVIDAS: dict[bool, int] = {
 
 
 class ScoreService:
-    def __init__(self) -> None:
-        self._csv_service = CSVService()
+    def __init__(self, csv_service: CSVService | None = None) -> None:
+        self._csv_service = csv_service or CSVService()
 
+    @traced("score.get_limit_for_score")
     async def get_limit_for_score(self, score: int) -> float:
         limits = await self._csv_service.read_score_limits()
 
@@ -48,12 +50,17 @@ class ScoreService:
         return 1000.0
 
     async def evaluate_limit_request(
-        self, score: int, current_limit: float, requested_limit: float
+        self,
+        score: int,
+        current_limit: float,
+        requested_limit: float,
+        max_limit_for_score: float | None = None,
     ) -> str:
         if requested_limit <= current_limit:
             return "approved"
 
-        max_limit_for_score = await self.get_limit_for_score(score)
+        if max_limit_for_score is None:
+            max_limit_for_score = await self.get_limit_for_score(score)
 
         if requested_limit <= max_limit_for_score:
             return "approved"
@@ -0,0 +1,116 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from calendar import timegm
+from datetime import datetime
+from typing import Any, Protocol
+
+HMAC_ALGORITHMS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+class TokenError(Exception):
+    pass
+
+
+class TokenCodec(Protocol):
+    def encode(self, claims: dict[str, Any]) -> str: ...
+
+    def decode(self, token: str) -> dict[str, Any]: ...
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: str) -> bytes:
+    try:
+        return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+    except (binascii.Error, ValueError) as e:
+        raise TokenError(f"Invalid base64 segment: {e}") from e
+
+
+class HMACTokenCodec:
+    """Codec JWT (HS256/HS384/HS512) compatível byte a byte com python-jose"""
+
+    def __init__(self, secret: str, algorithm: str = "HS256") -> None:
+        if algorithm not in HMAC_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+
+        self._algorithm = algorithm
+        self._digest = HMAC_ALGORITHMS[algorithm]
+        self._key = secret.encode("utf-8")
+        self._header = _b64encode(
+            json.dumps(
+                {"alg": algorithm, "typ": "JWT"}, separators=(",", ":"), sort_keys=True
+            ).encode("utf-8")
+        )
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self._key, signing_input, self._digest).digest()
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        payload = dict(claims)
+        for claim in TIME_CLAIMS:
+            value = payload.get(claim)
+            if isinstance(value, datetime):
+                payload[claim] = timegm(value.utctimetuple())
+
+        encoded_payload = _b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        )
+        signing_input = self._header + b"." + encoded_payload
+        signature = _b64encode(self._sign(signing_input))
+        return (signing_input + b"." + signature).decode("utf-8")
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            signing_input, encoded_signature = token.rsplit(".", 1)
+            encoded_header, encoded_payload = signing_input.split(".")
+        except ValueError as e:
+            raise TokenError("Not enough segments") from e
+
+        try:
+            header = json.loads(_b64decode(encoded_header))
+        except ValueError as e:
+            raise TokenError(f"Invalid header: {e}") from e
+        if not isinstance(header, dict) or header.get("alg") != self._algorithm:
+            raise TokenError("The specified alg value is not allowed")
+
+        expected = self._sign(signing_input.encode("utf-8"))
+        if not hmac.compare_digest(expected, _b64decode(encoded_signature)):
+            raise TokenError("Signature verification failed")
+
+        try:
+            claims = json.loads(_b64decode(encoded_payload))
+        except ValueError as e:
+            raise TokenError(f"Invalid payload string: {e}") from e
+        if not isinstance(claims, dict):
+            raise TokenError("Invalid payload string: must be a json object")
+
+        self._validate_claims(claims)
+        return claims
+
+    def _validate_claims(self, claims: dict[str, Any]) -> None:
+        now = int(time.time())
+
+        for claim in TIME_CLAIMS:
+            if claim in claims and not isinstance(claims[claim], (int, float)):
+                raise TokenError(f"Claim ({claim}) must be an integer")
+
+        if "exp" in claims and int(claims["exp"]) < now:
+            raise TokenError("Signature has expired")
+
+        if "nbf" in claims and int(claims["nbf"]) > now:
+            raise TokenError("The token is not yet valid (nbf)")
+
+        if "sub" in claims and not isinstance(claims["sub"], str):
+            raise TokenError("Subject must be a string")
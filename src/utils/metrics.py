@@ -0,0 +1,304 @@
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterator[tuple[str, tuple[str, ...], tuple[str, ...], float]]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, names, values, sample in self.samples():
+            labels = _format_labels(names, values)
+            lines.append(f"{self.name}{suffix}{labels} {sample:g}")
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """Contador exposto como `<nome>_total`, inclusive nas linhas HELP/TYPE"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        if not name.endswith("_total"):
+            name += "_total"
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def value(self, *values: str) -> float:
+        child = self._children.get(values)
+        return child.value if child is not None else 0.0
+
+    def samples(self):
+        for values, child in self._children.items():
+            yield "", self.labelnames, values, child.value
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames):
+        super().__init__(name, documentation, labelnames)
+        self._callback: Callable[[], dict[tuple[str, ...], float]] | None = None
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, callback: Callable[[], dict[tuple[str, ...], float]]) -> None:
+        self._callback = callback
+
+    def samples(self):
+        if self._callback is not None:
+            for values, value in self._callback().items():
+                yield "", self.labelnames, values, value
+            return
+        for values, child in self._children.items():
+            yield "", self.labelnames, values, child.value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self):
+        names = self.labelnames + ("le",)
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                yield "_bucket", names, values + (f"{bound:g}",), cumulative
+            yield "_bucket", names, values + ("+Inf",), child.count
+            yield "_sum", self.labelnames, values, child.sum
+            yield "_count", self.labelnames, values, child.count
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, tuple(labelnames)))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, tuple(labelnames)))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(
+            Histogram(name, documentation, tuple(labelnames), buckets)
+        )
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status"),
+)
+orchestrator_state_duration = registry.histogram(
+    "orchestrator_state_duration_seconds",
+    "Orchestrator handler latency by session state",
+    ("state",),
+)
+csv_operation_duration = registry.histogram(
+    "csv_operation_duration_seconds",
+    "CSVService operation latency",
+    ("operation",),
+)
+csv_lock_wait = registry.histogram(
+    "csv_lock_wait_seconds",
+    "Time spent waiting for CSV file locks",
+    ("file",),
+)
+llm_request_duration = registry.histogram(
+    "llm_request_duration_seconds",
+    "LLM provider latency by prompt type",
+    ("prompt_type",),
+)
+exchange_upstream_duration = registry.histogram(
+    "exchange_upstream_duration_seconds",
+    "Exchange rate API latency",
+    ("api", "outcome"),
+)
+cache_requests = registry.counter(
+    "cache_requests",
+    "Cache lookups by cache and result",
+    ("cache", "result"),
+)
+cache_hit_ratio = registry.gauge(
+    "cache_hit_ratio",
+    "Hit ratio per cache since process start",
+    ("cache",),
+)
+rate_limit_rejections = registry.counter(
+    "rate_limit_rejections",
+    "Requests rejected by the rate limiter by route and scope",
+    ("route", "scope"),
+)
+llm_in_flight = registry.gauge(
+    "llm_in_flight",
+    "LLM calls currently running against the provider",
+)
+llm_queue_depth = registry.gauge(
+    "llm_queue_depth",
+    "LLM calls waiting for an admission slot",
+)
+llm_admission_rejections = registry.counter(
+    "llm_admission_rejections",
+    "LLM calls shed to the rule-based path by prompt type and reason",
+    ("prompt_type", "reason"),
+)
+active_sessions = registry.gauge(
+    "active_sessions",
+    "Live chat sessions held in memory",
+    ("agent",),
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    cache_requests.labels(cache, "hit" if hit else "miss").inc()
+
+
+def _cache_hit_ratios() -> dict[tuple[str, ...], float]:
+    totals: dict[str, list[float]] = {}
+    for (cache, result), child in cache_requests._children.items():
+        hits_and_total = totals.setdefault(cache, [0.0, 0.0])
+        if result == "hit":
+            hits_and_total[0] += child.value
+        hits_and_total[1] += child.value
+    return {(cache,): hits / total for cache, (hits, total) in totals.items() if total}
+
+
+cache_hit_ratio.set_function(_cache_hit_ratios)
@@ -0,0 +1,4 @@
+from contextvars import ContextVar
+
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="internal")
+current_state: ContextVar[str] = ContextVar("current_state", default="none")
@@ -0,0 +1,152 @@
+import string
+from collections.abc import Callable
+
+from pydantic import BaseModel
+
+_FORMATTER = string.Formatter()
+
+
+def format_brl(value: float) -> str:
+    """Formata valores em reais no padrão pt-BR: R$ 15.000,00"""
+    integer, cents = f"{value:,.2f}".split(".")
+    return f"R$ {integer.replace(',', '.')},{cents}"
+
+
+def _field_formatter(spec: str) -> Callable[[object], str]:
+    if spec == "brl":
+        return format_brl
+    if spec:
+        return lambda value: format(value, spec)
+    return str
+
+
+class Template:
+    """Texto com campos `{nome}` analisado uma única vez, no carregamento.
+
+    Além das especificações do `str.format`, aceita `{campo:brl}` para
+    valores monetários. Textos sem campos são devolvidos sem cópia.
+    """
+
+    __slots__ = ("text", "fields", "_parts")
+
+    def __init__(self, text: str) -> None:
+        parts: list[tuple[str, str | None, Callable[[object], str] | None]] = []
+        for literal, field, spec, conversion in _FORMATTER.parse(text):
+            if field is not None and (conversion or not field.isidentifier()):
+                raise ValueError(f"Unsupported template field {field!r} in {text!r}")
+            parts.append(
+                (literal, field, _field_formatter(spec) if field is not None else None)
+            )
+        self.text = text
+        self.fields = frozenset(field for _, field, _ in parts if field is not None)
+        self._parts = tuple(parts)
+
+    def render(self, **values: object) -> str:
+        if not self.fields:
+            return self.text
+        return "".join(
+            [
+                literal + formatter(values[field]) if field is not None else literal
+                for literal, field, formatter in self._parts
+            ]
+        )
+
+
+class PreparedResponse:
+    """Corpo JSON serializado uma vez, com o session_id inserido por requisição"""
+
+    __slots__ = ("_prefix", "_suffix")
+
+    _PLACEHOLDER = "00000000-0000-0000-0000-000000000000"
+
+    def __init__(self, build: Callable[[str], BaseModel]) -> None:
+        body = build(self._PLACEHOLDER).model_dump_json().encode("utf-8")
+        self._prefix, found, self._suffix = body.partition(
+            self._PLACEHOLDER.encode("ascii")
+        )
+        if not found:
+            raise ValueError("Prepared response must contain the session id")
+
+    def render(self, session_id: str) -> bytes:
+        return self._prefix + session_id.encode("ascii") + self._suffix
+
+
+MESSAGES: dict[str, Template] = {
+    name: Template(text)
+    for name, text in {
+        "chat.welcome": (
+            "Olá! Bem-vindo ao Banco Ágil! 😊\n\n"
+            "Sou seu assistente virtual e posso ajudar com:\n"
+            "• Consultar limite de crédito\n"
+            "• Solicitar aumento de limite\n"
+            "• Cotação de moedas\n"
+            "• Atualizar seu perfil financeiro\n\n"
+            "Para começar, preciso validar sua identidade.\n"
+            "Qual é o seu CPF?"
+        ),
+        "chat.restricted.authenticated": (
+            "Sou especializado apenas em serviços bancários. "
+            "Posso ajudar com limite de crédito, aumento de limite, "
+            "cotação de moedas ou atualização do seu perfil financeiro. "
+            "Como posso ajudar?"
+        ),
+        "chat.restricted.anonymous": (
+            "Sou o assistente bancário do Banco Ágil. "
+            "Para começar, preciso do seu CPF para validação."
+        ),
+        "unified.welcome": (
+            "Olá! Bem-vindo ao Banco Ágil!\n\n"
+            "Sou seu assistente virtual e posso ajudar com:\n"
+            "- Consultar limite de crédito\n"
+            "- Solicitar aumento de limite\n"
+            "- Cotação de moedas\n"
+            "- Atualizar seu perfil financeiro\n\n"
+            "Para começar, preciso validar sua identidade.\n"
+            "Qual é o seu CPF?"
+        ),
+        "unified.authenticated": (
+            "Autenticado com sucesso! Olá, {nome}!\n\n"
+            "Como posso ajudar?\n"
+            "- Ver meu limite\n"
+            "- Solicitar aumento\n"
+            "- Cotação de moedas\n"
+            "- Atualizar perfil"
+        ),
+        "unified.menu": (
+            "Posso te ajudar com: consultar seu limite de crédito, solicitar "
+            "aumento de limite, verificar cotação de moedas ou atualizar seu "
+            "perfil financeiro. O que você prefere?"
+        ),
+        "credit.limit": (
+            "Seu limite atual: {current_limit:brl}\n"
+            "Disponível: {available_limit:brl}\n"
+            "Score: {score}\n\n"
+            "Deseja solicitar aumento de limite?"
+        ),
+        "credit.new_limit": (
+            "Seu novo limite: {current_limit:brl}\n"
+            "Disponível: {available_limit:brl}\n"
+            "Score: {score}\n\n"
+            "Posso ajudar com mais alguma coisa?"
+        ),
+        "credit.increase_approved": (
+            "Sua solicitação de limite de {requested_limit:brl} foi aprovada!"
+        ),
+        "interview.completed": (
+            "Entrevista concluída!\n\n"
+            "Score anterior: {previous_score}\n"
+            "Novo score: {new_score}\n\n"
+            "{recommendation}\n\n"
+            "Deseja consultar seu novo limite de crédito?"
+        ),
+        "exchange.rate": (
+            "Cotação: 1 {from_currency} = {rate:.4f} {to_currency}\n"
+            "Atualizado em: {updated_at}\n\n"
+            "Posso ajudar com mais alguma coisa?"
+        ),
+    }.items()
+}
+
+
+def render(name: str, **values: object) -> str:
+    return MESSAGES[name].render(**values)
@@ -0,0 +1,30 @@
+import threading
+from collections.abc import Callable
+from functools import wraps
+from typing import TypeVar
+
+T = TypeVar("T")
+
+_lock = threading.RLock()
+
+
+def singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """Constrói a instância na primeira chamada e a reutiliza no processo"""
+    instance: list[T] = []
+
+    @wraps(factory)
+    def get() -> T:
+        if not instance:
+            with _lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    def override(value: T) -> None:
+        """Fixa a instância usada pelas dependências (benchmarks e stubs)"""
+        with _lock:
+            instance[:] = [value]
+
+    get.cache_clear = instance.clear
+    get.override = override
+    return get
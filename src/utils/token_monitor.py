@@ -1,15 +1,65 @@
+import asyncio
+import atexit
 import json
 import logging
+import os
+import tempfile
 from datetime import date
+from pathlib import Path
 from typing import Dict, Any
 
+from filelock import FileLock
+
+from src.config import get_settings
+from src.utils.request_context import current_endpoint, current_state
+
 logger = logging.getLogger(__name__)
 
 
+def _empty_usage() -> Dict[str, Any]:
+    return {
+        "total_spent": 0.0,
+        "daily": {},
+        "sessions": 0,
+        "ai_calls": 0,
+        "cache_hits": 0,
+    }
+
+
+def _merge_usage(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _merge_usage(target.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)):
+            target[key] = target.get(key, 0) + value
+    return target
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
 class TokenMonitor:
-    def __init__(self):
-        self.usage_file = "token_usage.json"
-        self.daily_usage = self._load_usage()
+    def __init__(self, usage_file: str | None = None):
+        settings = get_settings()
+        self.usage_file = Path(usage_file or settings.token_usage_path)
+        self.shard_file = self.usage_file.with_name(
+            f"{self.usage_file.stem}.{os.getpid()}{self.usage_file.suffix}"
+        )
+        self._lock = FileLock(str(self.usage_file) + ".lock")
+        self.daily_usage = _merge_usage(_empty_usage(), self._read(self.shard_file))
+
+        self._flush_interval = settings.token_usage_flush_interval_seconds
+        self._flush_every = settings.token_usage_flush_every
+        self._pending = 0
+        self._flush_event: asyncio.Event | None = None
+        self._flusher: asyncio.Task | None = None
 
         self.costs = {
             "gpt-3.5-turbo": {
@@ -20,27 +70,128 @@ class TokenMonitor:
                 "input": 0.03,
                 "output": 0.06,
             },
+            "gpt-4o-mini": {
+                "input": 0.00015,
+                "output": 0.0006,
+            },
+            "gpt-4o": {
+                "input": 0.0025,
+                "output": 0.01,
+            },
+            "claude-3-haiku-20240307": {
+                "input": 0.00025,
+                "output": 0.00125,
+            },
         }
 
-    def _load_usage(self) -> Dict[str, Any]:
+        self.compact_shards()
+        atexit.register(self.flush)
+
+    def _read(self, path: Path) -> Dict[str, Any]:
         try:
-            with open(self.usage_file, "r") as f:
+            with open(path, "r") as f:
                 return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
-            return {
-                "total_spent": 0.0,
-                "daily": {},
-                "sessions": 0,
-                "ai_calls": 0,
-                "cache_hits": 0,
-            }
+            return {}
 
-    def _save_usage(self):
+    def _shards(self) -> list[tuple[Path, int]]:
+        """Shards de outros processos, com o PID de cada um"""
+        shards = []
+        pattern = f"{self.usage_file.stem}.*{self.usage_file.suffix}"
+        for shard in self.usage_file.parent.glob(pattern):
+            pid = shard.name[len(self.usage_file.stem) + 1 : -len(shard.suffix)]
+            if shard != self.shard_file and pid.isdigit():
+                shards.append((shard, int(pid)))
+        return shards
+
+    def compact_shards(self) -> None:
+        """Incorpora ao arquivo base os shards de processos que já terminaram"""
+        if not any(not _process_alive(pid) for _, pid in self._shards()):
+            return
         try:
-            with open(self.usage_file, "w") as f:
-                json.dump(self.daily_usage, f, indent=2)
+            with self._lock:
+                dead = [s for s, pid in self._shards() if not _process_alive(pid)]
+                if not dead:
+                    return
+                usage = _merge_usage(_empty_usage(), self._read(self.usage_file))
+                for shard in dead:
+                    _merge_usage(usage, self._read(shard))
+                payload = json.dumps(usage, separators=(",", ":"))
+                if not self._write(payload, self.usage_file):
+                    return
+                for shard in dead:
+                    shard.unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"Erro ao compactar uso: {e}")
+
+    def _load_usage(self) -> Dict[str, Any]:
+        """Soma o arquivo base e os shards dos processos em execução"""
+        self.compact_shards()
+        usage = _merge_usage(_empty_usage(), self._read(self.usage_file))
+        for shard, _ in self._shards():
+            _merge_usage(usage, self._read(shard))
+        return _merge_usage(usage, self.daily_usage)
+
+    def _write(self, payload: str, path: Path | None = None) -> bool:
+        path = path or self.shard_file
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
         except Exception as e:
             logger.error(f"Erro ao salvar uso: {e}")
+            return False
+        return True
+
+    def _mark_dirty(self) -> None:
+        self._pending += 1
+        if self._pending >= self._flush_every and self._flush_event is not None:
+            self._flush_event.set()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        self._pending = 0
+        self._write(json.dumps(self.daily_usage, separators=(",", ":")))
+
+    async def flush_async(self) -> None:
+        if not self._pending:
+            return
+        self._pending = 0
+        payload = json.dumps(self.daily_usage, separators=(",", ":"))
+        await asyncio.to_thread(self._write, payload)
+
+    def start(self) -> None:
+        if self._flusher is not None and not self._flusher.done():
+            return
+        self._flush_event = asyncio.Event()
+        self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        self._flusher = None
+        self._flush_event = None
+        await self.flush_async()
+
+    async def _run_flusher(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_event.wait(), timeout=self._flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self.flush_async()
 
     def track_ai_call(
         self,
@@ -58,8 +209,9 @@ class TokenMonitor:
                 "ai_calls": 0,
             }
 
-        input_cost = (input_tokens / 1000) * self.costs[model]["input"]
-        output_cost = (output_tokens / 1000) * self.costs[model]["output"]
+        prices = self.costs.get(model, {"input": 0.0, "output": 0.0})
+        input_cost = (input_tokens / 1000) * prices["input"]
+        output_cost = (output_tokens / 1000) * prices["output"]
         total_cost = input_cost + output_cost
 
         self.daily_usage["daily"][today]["input_tokens"] += input_tokens
@@ -70,7 +222,7 @@ class TokenMonitor:
         self.daily_usage["total_spent"] += total_cost
         self.daily_usage["ai_calls"] += 1
 
-        self._save_usage()
+        self._mark_dirty()
 
         remaining = 10.0 - self.daily_usage["total_spent"]
         logger.info(
@@ -81,29 +233,74 @@ class TokenMonitor:
 
         return total_cost
 
-    def track_cache_hit(self):
+    def track_llm_call(
+        self,
+        model: str,
+        prompt_type: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency_ms: float,
+    ) -> float:
+        cost = self.track_ai_call(model, input_tokens, output_tokens)
+
+        for bucket in self._breakdown_buckets(prompt_type):
+            bucket["calls"] = bucket.get("calls", 0) + 1
+            bucket["input_tokens"] = bucket.get("input_tokens", 0) + input_tokens
+            bucket["output_tokens"] = bucket.get("output_tokens", 0) + output_tokens
+            bucket["cost"] = bucket.get("cost", 0.0) + cost
+            bucket["latency_ms"] = bucket.get("latency_ms", 0.0) + latency_ms
+
+        return cost
+
+    def track_cache_hit(self, prompt_type: str | None = None):
         self.daily_usage["cache_hits"] += 1
-        self._save_usage()
+        if prompt_type is not None:
+            for bucket in self._breakdown_buckets(prompt_type):
+                bucket["cache_hits"] = bucket.get("cache_hits", 0) + 1
+        self._mark_dirty()
         logger.info("🎯 Cache hit - tokens economizados!")
 
+    def _breakdown_buckets(self, prompt_type: str) -> list[Dict[str, Any]]:
+        keys = {
+            "by_endpoint": current_endpoint.get(),
+            "by_state": current_state.get(),
+            "by_prompt": prompt_type,
+        }
+        return [
+            self.daily_usage.setdefault(dimension, {}).setdefault(key, {})
+            for dimension, key in keys.items()
+        ]
+
     def get_summary(self) -> Dict[str, Any]:
-        remaining = 10.0 - self.daily_usage["total_spent"]
+        usage = self._load_usage()
+        remaining = 10.0 - usage["total_spent"]
         today = str(date.today())
-        today_usage = self.daily_usage["daily"].get(today, {})
+        today_usage = usage["daily"].get(today, {})
 
         return {
             "budget_total": 10.0,
-            "spent": self.daily_usage["total_spent"],
+            "spent": usage["total_spent"],
             "remaining": remaining,
-            "percentage_used": (self.daily_usage["total_spent"] / 10.0) * 100,
+            "percentage_used": (usage["total_spent"] / 10.0) * 100,
             "today": today_usage,
-            "cache_hits": self.daily_usage["cache_hits"],
-            "ai_calls": self.daily_usage["ai_calls"],
+            "cache_hits": usage["cache_hits"],
+            "ai_calls": usage["ai_calls"],
             "cache_efficiency": (
-                self.daily_usage["cache_hits"]
-                / max(1, self.daily_usage["cache_hits"] + self.daily_usage["ai_calls"])
+                usage["cache_hits"]
+                / max(1, usage["cache_hits"] + usage["ai_calls"])
                 * 100
             ),
+            "breakdown": {
+                dimension: {
+                    key: {
+                        **bucket,
+                        "avg_latency_ms": bucket.get("latency_ms", 0.0)
+                        / max(1, bucket.get("calls", 0)),
+                    }
+                    for key, bucket in usage.get(dimension, {}).items()
+                }
+                for dimension in ("by_endpoint", "by_state", "by_prompt")
+            },
         }
 
     def print_summary(self):
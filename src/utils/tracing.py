@@ -0,0 +1,138 @@
+import json
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar, Token
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start", "end", "attributes")
+
+    def __init__(
+        self, name: str, span_id: int, parent_id: int | None, attributes: dict
+    ) -> None:
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+
+class Trace:
+    def __init__(self, name: str) -> None:
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.start = time.perf_counter()
+        self.spans: list[Span] = []
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "duration_ms": round((time.perf_counter() - self.start) * 1000, 3),
+            "spans": [
+                {
+                    "id": s.span_id,
+                    "parent": s.parent_id,
+                    "name": s.name,
+                    "start_ms": round((s.start - self.start) * 1000, 3),
+                    "duration_ms": round(s.duration_ms, 3),
+                    "attributes": s.attributes,
+                }
+                for s in self.spans
+            ],
+        }
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f'{s.name.replace(".", "_")}_{s.span_id};dur={s.duration_ms:.2f}'
+            for s in self.spans
+        )
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[int | None] = ContextVar("current_span", default=None)
+
+_otel_tracer: Any = None
+
+
+def enable_opentelemetry() -> bool:
+    """Espelha os spans no OpenTelemetry quando o pacote está instalado"""
+    global _otel_tracer
+    try:
+        from opentelemetry import trace as otel_trace
+    except ImportError:
+        logger.warning("opentelemetry not installed, spans stay local")
+        return False
+
+    _otel_tracer = otel_trace.get_tracer("agente-bancario-ia")
+    return True
+
+
+def start_trace(name: str) -> tuple[Trace, Token]:
+    trace = Trace(name)
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token: Token) -> None:
+    _current_trace.reset(token)
+
+
+def current_trace() -> Trace | None:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    current = Span(name, len(trace.spans), _current_span.get(), attributes)
+    trace.spans.append(current)
+    token = _current_span.set(current.span_id)
+
+    with ExitStack() as stack:
+        if _otel_tracer is not None:
+            stack.enter_context(
+                _otel_tracer.start_as_current_span(name, attributes=attributes)
+            )
+        try:
+            yield current
+        finally:
+            current.end = time.perf_counter()
+            _current_span.reset(token)
+
+
+def traced(name: str) -> Callable:
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def export_trace(trace: Trace, path: Path) -> None:
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(trace.to_dict(), ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.error(f"Failed to export trace: {e}")
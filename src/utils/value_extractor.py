@@ -1,5 +1,5 @@
 import re
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
 from src.utils.text_normalizer import normalize_text
 
@@ -22,6 +22,32 @@ EMPLOYMENT_SYNONYMS = [
     ("CLT", ["clt", "carteira assinada", "carteira", "registrado", "empregado", "contratado", "assalariado", "trabalhador formal", "regime clt", "emprego fixo", "funcionario"]),
 ]
 
+INTERVIEW_CUES = {
+    "tem_dividas": ["divida", "devendo", "devo", "emprestimo", "financiamento", "inadimplente"],
+    "num_dependentes": ["dependente", "filho", "filha", "crianca", "sustento"],
+    "despesas": ["gasto", "despesa", "pago", "custo", "conta"],
+    "renda_mensal": ["ganho", "recebo", "renda", "salario", "faturo", "ganhando", "recebendo"],
+}
+
+NO_DEBT_PATTERNS = [
+    "sem",
+    "nao",
+    "nada",
+    "nenhuma",
+    "nenhum",
+    "ninguem",
+    "zero",
+    "quitei",
+    "quitada",
+    "livre",
+]
+
+# "e" só separa orações antes de remover acentos, para não quebrar "renda é 5 mil";
+# "com" e "mas" separam campos diferentes na mesma frase ("ganho 5 mil com 2 filhos")
+CLAUSE_SPLIT = re.compile(
+    r"[;\n]|,(?!\d)|\.(?!\d)|\s+e\s+(?!meio\b)|\s+(?:com|mas)\s+"
+)
+
 CURRENCY_MAP = {
     "BRL": ["brl", "real", "reais", "brasileiro"],
     "USD": ["usd", "dolar", "dollar", "dolares"],
@@ -136,3 +162,60 @@ def extract_currency_code(text: str) -> Optional[str]:
         return match.group(1)
 
     return None
+
+
+def _employment_in_clause(clause: str) -> Optional[str]:
+    # Palavra inteira: numa frase longa "mei" não pode casar com "meio"
+    for emp_type, synonyms in EMPLOYMENT_SYNONYMS:
+        for synonym in synonyms:
+            if re.search(rf"\b{synonym}\b", clause):
+                return emp_type
+    return None
+
+
+def extract_interview_slots(text: str) -> dict[str, Any]:
+    """Extrai todos os campos da entrevista presentes numa mensagem.
+
+    A mensagem é dividida em orações (vírgula, ponto e vírgula, "e") e cada
+    oração é associada a um campo pelas palavras-chave de INTERVIEW_CUES; o
+    tipo de emprego é reconhecido pelos próprios sinônimos. Orações sem
+    palavra-chave, ou com palavras-chave de mais de um campo, são ignoradas:
+    o valor não pode ser atribuído com segurança e o campo volta a ser
+    perguntado no seu estado.
+    """
+    if not text:
+        return {}
+
+    slots: dict[str, Any] = {}
+    for raw_clause in CLAUSE_SPLIT.split(text.lower()):
+        clause = normalize_text(raw_clause)
+        if not clause:
+            continue
+
+        matches = [
+            name
+            for name, cues in INTERVIEW_CUES.items()
+            if any(cue in clause for cue in cues)
+        ]
+        slot = matches[0] if len(matches) == 1 else None
+
+        if slot == "tem_dividas":
+            value: Any = not any(
+                re.search(rf"\b{p}\b", clause) for p in NO_DEBT_PATTERNS
+            )
+        elif slot == "num_dependentes":
+            value = extract_integer(clause)
+        elif slot in ("despesas", "renda_mensal"):
+            value = extract_monetary_value(clause)
+        else:
+            value = None
+
+        if value is not None:
+            slots.setdefault(slot, value)
+
+        if slot not in ("tem_dividas", "num_dependentes"):
+            employment = _employment_in_clause(clause)
+            if employment is not None:
+                slots.setdefault("tipo_emprego", employment)
+
+    return slots
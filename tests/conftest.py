@@ -85,6 +85,16 @@ def test_settings(temp_data_dir: Path) -> Settings:
     )
 
 
+@pytest.fixture
+def isolated_settings(
+    temp_data_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> Settings:
+    monkeypatch.setenv("DATA_DIR", str(temp_data_dir))
+    get_settings.cache_clear()
+    yield get_settings()
+    get_settings.cache_clear()
+
+
 @pytest.fixture
 def auth_service(test_settings: Settings) -> AuthService:
     return AuthService(test_settings)
@@ -0,0 +1,162 @@
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+
+HEADER = "cpf_cliente,data_hora_solicitacao,limite_atual,novo_limite_solicitado,status_pedido\n"
+
+
+def _write_requests(path, rows: list[str]) -> None:
+    path.write_text(HEADER + "".join(f"{row}\n" for row in rows))
+
+
+def _append_requests(path, rows: list[str]) -> None:
+    with open(path, "a") as f:
+        f.write("".join(f"{row}\n" for row in rows))
+
+
+@pytest.fixture
+def analytics(isolated_settings):
+    from src.services.analytics_service import AnalyticsService
+
+    _write_requests(
+        isolated_settings.limit_requests_csv_path,
+        [
+            "12345678901,2026-01-10T10:00:00+00:00,15000.0,20000.0,approved",
+            "12345678901,2026-01-20T10:00:00+00:00,15000.0,60000.0,denied",
+            "98765432100,2026-02-05T10:00:00+00:00,8000.0,8000.0,approved",
+            "00000000191,2026-02-06T10:00:00+00:00,1000.0,3000.0,denied",
+        ],
+    )
+    return AnalyticsService(isolated_settings)
+
+
+@pytest.mark.asyncio
+async def test_summary_joins_scores_and_groups_by_status(analytics) -> None:
+    summary = await analytics.summarize("status")
+
+    assert summary["rows"] == 4
+    total = summary["total"]
+    assert total["approval_rate"] == 0.5
+    assert total["avg_requested_limit"] == (20000 + 60000 + 8000 + 3000) / 4
+    assert total["avg_score"] == (750 + 750 + 600) / 3
+
+    groups = {g["group"]: g for g in summary["groups"]}
+    assert groups["denied"]["count"] == 2
+    assert groups["approved"]["avg_current_limit"] == (15000 + 8000) / 2
+
+
+@pytest.mark.asyncio
+async def test_score_bands_and_months(analytics) -> None:
+    bands = {g["group"]: g["count"] for g in (await analytics.summarize("score_band"))["groups"]}
+    assert bands == {"600-699": 1, "700-799": 2, "unknown": 1}
+
+    months = await analytics.summarize(
+        "month", start=datetime(2026, 2, 1, tzinfo=timezone.utc)
+    )
+    assert [(g["group"], g["count"]) for g in months["groups"]] == [("2026-02", 2)]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_updated_incrementally(analytics, isolated_settings) -> None:
+    await analytics.summarize()
+    consumed = dict(analytics._snapshot.sources)
+
+    _append_requests(
+        isolated_settings.limit_requests_csv_path,
+        ["98765432100,2026-03-01T10:00:00+00:00,8000.0,9000.0,denied", "9876"],
+    )
+    summary = await analytics.summarize("status")
+
+    assert summary["rows"] == 5
+    path = str(isolated_settings.limit_requests_csv_path)
+    assert analytics._snapshot.sources[path][1] > consumed[path][1]
+    assert isolated_settings.analytics_snapshot_path.exists()
+
+    from src.services.analytics_service import AnalyticsService
+
+    reloaded = AnalyticsService(isolated_settings)
+    assert (await reloaded.summarize())["total"] == summary["total"]
+
+
+@pytest.mark.asyncio
+async def test_score_change_is_rejoined(analytics, isolated_settings) -> None:
+    await analytics.summarize()
+
+    from src.services.csv_service import CSVService
+
+    await CSVService().update_client_score("98765432100", 950)
+    total = (await analytics.summarize())["total"]
+
+    assert total["avg_score"] == (750 + 750 + 950) / 3
+
+
+@pytest.mark.asyncio
+async def test_same_length_score_change_is_rejoined(analytics, isolated_settings) -> None:
+    from src.services.analytics_service import AnalyticsService
+    from src.services.csv_service import CSVService
+
+    csv_service = CSVService()
+    # A primeira reescrita normaliza as quebras de linha; a seguinte mantém o tamanho
+    await csv_service.update_client_score("12345678901", 720)
+    await analytics.summarize("score_band")
+    size = isolated_settings.clients_csv_path.stat().st_size
+    await csv_service.update_client_score("12345678901", 650)
+    assert isolated_settings.clients_csv_path.stat().st_size == size
+
+    for service in (analytics, AnalyticsService(isolated_settings)):
+        bands = {
+            g["group"]: g["count"]
+            for g in (await service.summarize("score_band"))["groups"]
+        }
+        assert bands == {"600-699": 3, "unknown": 1}
+
+
+@pytest.mark.asyncio
+async def test_analytics_endpoint(
+    client: AsyncClient, test_settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = test_settings.model_copy(update={"analytics_api_key": "risk-team-key"})
+    monkeypatch.setattr("src.api.dependencies.get_settings", lambda: settings)
+
+    response = await client.get(
+        "/analytics/limit-requests",
+        params={"group_by": "status"},
+        headers={"X-API-Key": "risk-team-key"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["group_by"] == "status"
+    assert data["total"]["count"] == data["rows"]
+
+
+@pytest.mark.asyncio
+async def test_analytics_endpoint_requires_configured_key(
+    client: AsyncClient, test_settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = test_settings.model_copy(update={"analytics_api_key": "risk-team-key"})
+    monkeypatch.setattr("src.api.dependencies.get_settings", lambda: settings)
+
+    denied = await client.get("/analytics/limit-requests")
+    allowed = await client.get(
+        "/analytics/limit-requests", headers={"X-API-Key": "risk-team-key"}
+    )
+
+    assert denied.status_code == 401
+    assert allowed.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_analytics_endpoint_is_closed_without_configured_key(
+    client: AsyncClient, test_settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = test_settings.model_copy(update={"analytics_api_key": None})
+    monkeypatch.setattr("src.api.dependencies.get_settings", lambda: settings)
+
+    anonymous = await client.get("/analytics/limit-requests")
+    with_key = await client.get(
+        "/analytics/limit-requests", headers={"X-API-Key": "anything"}
+    )
+
+    assert anonymous.status_code == 503
+    assert with_key.status_code == 503
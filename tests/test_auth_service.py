@@ -0,0 +1,109 @@
+import pytest
+
+from src.config import Settings
+from src.services import auth_service as auth_module
+from src.services.auth_service import AuthService
+
+
+def test_verify_token_uses_cache(auth_service: AuthService, monkeypatch) -> None:
+    token = auth_service.create_token("12345678901")
+    assert auth_service.verify_token(token) == "12345678901"
+
+    def fail_decode(token):
+        raise AssertionError("signature verified twice")
+
+    monkeypatch.setattr(auth_service._codec, "decode", fail_decode)
+    assert auth_service.verify_token(token) == "12345678901"
+
+
+def test_verify_token_cache_is_bounded(test_settings: Settings) -> None:
+    service = AuthService(test_settings.model_copy(update={"jwt_cache_size": 2}))
+    tokens = [service.create_token(f"1234567890{i}") for i in range(3)]
+
+    for token in tokens:
+        service.verify_token(token)
+
+    assert len(service._verified) == 2
+
+
+def test_expired_cache_entry_is_reverified(auth_service: AuthService) -> None:
+    token = auth_service.create_token("12345678901")
+    assert auth_service.verify_token(token) == "12345678901"
+
+    digest = next(iter(auth_service._verified))
+    auth_service._verified[digest] = ("12345678901", 1)
+
+    assert auth_service.verify_token(token) == "12345678901"
+    assert auth_service._verified[digest][1] > 1
+
+
+def test_cached_cpf_never_decodes(auth_service: AuthService, monkeypatch) -> None:
+    token = auth_service.create_token("12345678901")
+
+    def fail_decode(token):
+        raise AssertionError("cached lookup decoded the token")
+
+    monkeypatch.setattr(auth_service._codec, "decode", fail_decode)
+    assert auth_service.cached_cpf(token) is None
+
+    monkeypatch.undo()
+    auth_service.verify_token(token)
+    monkeypatch.setattr(auth_service._codec, "decode", fail_decode)
+    assert auth_service.cached_cpf(token) == "12345678901"
+
+
+def test_invalid_token_is_not_cached(auth_service: AuthService) -> None:
+    assert auth_service.verify_token("invalid-token") is None
+    assert len(auth_service._verified) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_auth_service_is_singleton() -> None:
+    assert auth_module.get_auth_service() is auth_module.get_auth_service()
+
+
+def test_get_auth_service_supports_override(test_settings: Settings) -> None:
+    from src.api import dependencies
+
+    stub = AuthService(test_settings)
+    auth_module.get_auth_service.override(stub)
+    try:
+        assert dependencies.get_triage_agent.__wrapped__()._auth_service is stub
+    finally:
+        auth_module.get_auth_service.cache_clear()
+
+    assert auth_module.get_auth_service() is not stub
+
+
+def test_codec_rejects_tampered_and_foreign_tokens(test_settings: Settings) -> None:
+    service = AuthService(test_settings)
+    token = service.create_token("12345678901")
+    header, payload, signature = token.split(".")
+
+    assert service.verify_token(f"{header}.{payload}.{signature[:-2]}AA") is None
+    assert service.verify_token(f"{header}.{payload}") is None
+
+    other = AuthService(test_settings.model_copy(update={"jwt_secret_key": "other"}))
+    assert other.verify_token(token) is None
+
+
+def test_codec_rejects_expired_token(test_settings: Settings) -> None:
+    service = AuthService(
+        test_settings.model_copy(update={"jwt_expiration_minutes": -1})
+    )
+    assert service.verify_token(service.create_token("12345678901")) is None
+
+
+def test_codec_wire_compatible_with_python_jose(test_settings: Settings) -> None:
+    jose_jwt = pytest.importorskip("jose.jwt")
+    from datetime import datetime, timedelta, timezone
+
+    from src.services.token_codec import HMACTokenCodec
+
+    codec = HMACTokenCodec(test_settings.jwt_secret_key, "HS256")
+    now = datetime.now(timezone.utc)
+    claims = {"sub": "12345678901", "exp": now + timedelta(minutes=5), "iat": now}
+
+    issued = jose_jwt.encode(claims, test_settings.jwt_secret_key, algorithm="HS256")
+    assert codec.encode(claims) == issued
+    assert codec.decode(issued)["sub"] == "12345678901"
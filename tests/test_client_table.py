@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+
+from src.services.client_table import ClientTable
+
+CLIENTS_HEADER = "cpf,nome,data_nascimento,score,limite_atual\n"
+
+
+@pytest.fixture
+def clients_csv(tmp_path: Path) -> Path:
+    path = tmp_path / "clientes.csv"
+    path.write_text(
+        CLIENTS_HEADER
+        + "98765432100,Maria Souza,1985-03-22,600,3000.0\n"
+        + "123.456.789-01,João da Silva,1990-05-15,750,5000.0\n"
+        + "00012345678,Ana Lima,2000-01-01,500,1000.0\n"
+        + "98765432100,Maria Duplicada,1985-03-22,100,100.0\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_lookup_by_binary_search(clients_csv: Path, tmp_path: Path) -> None:
+    table = ClientTable(clients_csv, tmp_path / "clientes.bin")
+    table.refresh()
+
+    client = table.get("12345678901")
+    assert client.nome == "João da Silva"
+    assert client.cpf == "123.456.789-01"
+    assert client.score == 750
+    assert client.limite_atual == 5000.0
+
+    assert table.get("000.123.456-78").nome == "Ana Lima"
+    assert table.get("98765432100").nome == "Maria Souza"
+    assert table.get("12345678900") is None
+    assert table.get("12345678") is None
+    assert table.get("abc") is None
+
+
+def test_snapshot_is_reused_and_rebuilt_when_csv_changes(
+    clients_csv: Path, tmp_path: Path
+) -> None:
+    table_path = tmp_path / "clientes.bin"
+    ClientTable(clients_csv, table_path).refresh()
+    built = table_path.stat().st_ino
+
+    reopened = ClientTable(clients_csv, table_path)
+    reopened.refresh()
+    assert table_path.stat().st_ino == built
+    assert reopened.is_current()
+
+    clients_csv.write_text(
+        CLIENTS_HEADER + "12345678901,João da Silva,1990-05-15,810,5000.0\n",
+        encoding="utf-8",
+    )
+    assert not reopened.is_current()
+    reopened.refresh()
+    assert reopened.get("12345678901").score == 810
+    assert reopened.get("98765432100") is None
+
+
+@pytest.mark.asyncio
+async def test_csv_service_serves_lookups_from_table(
+    isolated_settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from src.config import get_settings
+    from src.services.csv_service import CSVService
+
+    monkeypatch.setenv("CLIENT_TABLE_ENABLED", "true")
+    get_settings.cache_clear()
+
+    service = CSVService()
+    client = await service.get_client_by_cpf("123.456.789-01")
+    assert client.score == 750
+    assert get_settings().client_table_path.exists()
+
+    assert await service.update_client_score("12345678901", 800)
+    assert (await service.get_client_by_cpf("12345678901")).score == 800
+    assert await service.get_client_by_cpf("00000000000") is None
@@ -0,0 +1,71 @@
+import asyncio
+import csv
+from datetime import datetime, timezone
+
+import pytest
+
+from src.services.group_commit import GroupCommitWriter
+
+
+def _request(index: int) -> dict:
+    return {
+        "cpf_cliente": "12345678901",
+        "data_hora_solicitacao": datetime.now(timezone.utc).isoformat(),
+        "limite_atual": 5000.0,
+        "novo_limite_solicitado": 5000.0 + index,
+        "status_pedido": "pending",
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_share_batches(isolated_settings) -> None:
+    from src.services.csv_service import CSVService
+
+    service = CSVService()
+    await asyncio.gather(*(service.append_limit_request(_request(i)) for i in range(50)))
+
+    writer = service._limit_request_writer
+    assert writer.items_written == 50
+    assert writer.batches_written < 50
+
+    with open(isolated_settings.limit_requests_csv_path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(float(r["novo_limite_solicitado"]) for r in rows) == [
+        5000.0 + i for i in range(50)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_append_returns_after_write() -> None:
+    written: list[int] = []
+    writer = GroupCommitWriter(written.extend)
+
+    await writer.submit(1)
+    assert written == [1]
+
+    await asyncio.gather(writer.submit(2), writer.submit(3))
+    assert written == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_max_batch_splits_writes() -> None:
+    batches: list[list[int]] = []
+    writer = GroupCommitWriter(batches.append, window_seconds=0.01, max_batch=4)
+
+    await asyncio.gather(*(writer.submit(i) for i in range(10)))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_write_error_reaches_every_caller_in_batch() -> None:
+    def failing_write(items: list[int]) -> None:
+        raise OSError("disk full")
+
+    writer = GroupCommitWriter(failing_write, window_seconds=0.01)
+    results = await asyncio.gather(
+        writer.submit(1), writer.submit(2), return_exceptions=True
+    )
+
+    assert all(isinstance(result, OSError) for result in results)
+    assert writer.items_written == 0
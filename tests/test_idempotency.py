@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from src.services.idempotency import IdempotencyStore
+
+
+@pytest.mark.asyncio
+async def test_duplicate_key_replays_stored_response() -> None:
+    store = IdempotencyStore()
+    calls = 0
+
+    async def handler() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await store.run("key", "body", handler) == (1, False)
+    assert await store.run("key", "body", handler) == (1, True)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_in_flight_duplicates_wait_for_first_result() -> None:
+    store = IdempotencyStore()
+    calls = 0
+
+    async def handler() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "limite atualizado"
+
+    results = await asyncio.gather(*(store.run("key", "body", handler) for _ in range(5)))
+
+    assert calls == 1
+    assert [replayed for _, replayed in results].count(False) == 1
+    assert {result for result, _ in results} == {"limite atualizado"}
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_other_request_is_rejected() -> None:
+    store = IdempotencyStore()
+
+    async def handler() -> str:
+        return "ok"
+
+    await store.run("key", "body-1", handler)
+    with pytest.raises(HTTPException) as exc_info:
+        await store.run("key", "body-2", handler)
+    assert exc_info.value.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached_and_store_is_bounded() -> None:
+    store = IdempotencyStore(max_entries=2)
+
+    async def failing() -> str:
+        raise RuntimeError("timeout")
+
+    async def handler() -> str:
+        return "ok"
+
+    with pytest.raises(RuntimeError):
+        await store.run("key", "body", failing)
+    assert await store.run("key", "body", handler) == ("ok", False)
+
+    for key in ("other-1", "other-2"):
+        await store.run(key, "body", handler)
+    assert len(store) == 2
+    assert await store.run("key", "body", handler) == ("ok", False)
+
+
+@pytest.mark.asyncio
+async def test_unified_chat_replays_with_idempotency_key(client: AsyncClient) -> None:
+    headers = {"Idempotency-Key": "retry-abc"}
+    first = await client.post("/unified/chat", json={"message": "olá"}, headers=headers)
+    retry = await client.post("/unified/chat", json={"message": "olá"}, headers=headers)
+    other = await client.post("/unified/chat", json={"message": "oi"}, headers=headers)
+
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert other.status_code == 422
+
+    fresh = await client.post("/unified/chat", json={"message": "olá"})
+    assert fresh.json()["session_id"] != first.json()["session_id"]
+
+
+@pytest.mark.asyncio
+async def test_anonymous_sessions_do_not_share_idempotency_keys(
+    client: AsyncClient,
+) -> None:
+    headers = {"Idempotency-Key": "retry-1"}
+    sessions = [
+        (await client.post("/unified/init")).json()["session_id"] for _ in range(2)
+    ]
+
+    first = await client.post(
+        "/unified/chat",
+        json={"session_id": sessions[0], "message": "12345678901"},
+        headers=headers,
+    )
+    second = await client.post(
+        "/unified/chat",
+        json={"session_id": sessions[1], "message": "98765432100"},
+        headers=headers,
+    )
+
+    assert second.status_code == 200
+    assert "Idempotent-Replayed" not in second.headers
+    assert second.json()["session_id"] == sessions[1]
+    assert first.json()["session_id"] == sessions[0]
@@ -0,0 +1,174 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from src.services.limit_request_log import LimitRequestLog
+
+CPF_A = "12345678901"
+CPF_B = "98765432100"
+
+
+def _row(cpf: str, timestamp: str, status: str = "approved") -> dict:
+    return {
+        "cpf_cliente": cpf,
+        "data_hora_solicitacao": timestamp,
+        "limite_atual": 5000.0,
+        "novo_limite_solicitado": 8000.0,
+        "status_pedido": status,
+    }
+
+
+@pytest.fixture
+def log(tmp_path: Path) -> LimitRequestLog:
+    log = LimitRequestLog(tmp_path / "solicitacoes")
+    log.append(
+        [
+            _row(CPF_A, "2026-01-10T10:00:00+00:00"),
+            _row(CPF_B, "2026-01-11T10:00:00+00:00", "denied"),
+            _row(CPF_A, "2026-02-03T10:00:00+00:00", "denied"),
+            _row(CPF_A, "2026-01-05T10:00:00+00:00"),
+        ]
+    )
+    return log
+
+
+def test_rows_split_into_time_segments(log: LimitRequestLog) -> None:
+    assert log.segments() == ["2026-01", "2026-02"]
+
+
+def test_query_by_cpf_uses_index_and_sorts(log: LimitRequestLog) -> None:
+    history = log.query(cpf=CPF_A)
+
+    assert [r.data_hora_solicitacao[:10] for r in history] == [
+        "2026-01-05",
+        "2026-01-10",
+        "2026-02-03",
+    ]
+    assert log._indexes["2026-01"].entries[CPF_A] != []
+
+
+def test_query_by_range_and_status(log: LimitRequestLog) -> None:
+    february = log.query(start=datetime(2026, 2, 1, tzinfo=timezone.utc))
+    assert [r.cpf_cliente for r in february] == [CPF_A]
+
+    denied = log.query(status="denied", end=datetime(2026, 2, 1, tzinfo=timezone.utc))
+    assert [r.cpf_cliente for r in denied] == [CPF_B]
+
+
+def test_index_is_reloaded_from_disk(log: LimitRequestLog) -> None:
+    reopened = LimitRequestLog(log.directory)
+    assert len(reopened.query(cpf=CPF_A)) == 3
+
+
+def test_unindexed_and_torn_rows_are_recovered(log: LimitRequestLog) -> None:
+    segment = log.directory / "solicitacoes_2026-01.csv"
+    with open(segment, "ab") as f:
+        f.write(f"{CPF_B},2026-01-20T10:00:00+00:00,5000.0,9000.0,pending\r\n".encode())
+        f.write(b"987654")
+
+    reopened = LimitRequestLog(log.directory)
+    assert [r.status_pedido for r in reopened.query(cpf=CPF_B)] == [
+        "denied",
+        "pending",
+    ]
+
+    reopened.append([_row(CPF_B, "2026-01-21T10:00:00+00:00")])
+    assert len(LimitRequestLog(log.directory).query(cpf=CPF_B)) == 3
+    assert len(reopened.query()) == 6
+
+
+def test_retention_drops_old_segments(tmp_path: Path) -> None:
+    log = LimitRequestLog(tmp_path, granularity="day", retention_days=30)
+    log.append(
+        [
+            _row(CPF_A, "2026-01-01T10:00:00+00:00"),
+            _row(CPF_A, "2026-03-01T10:00:00+00:00"),
+        ]
+    )
+
+    removed = log.apply_retention(now=datetime(2026, 3, 2, tzinfo=timezone.utc))
+
+    assert removed == ["2026-01-01"]
+    assert [r.data_hora_solicitacao[:10] for r in log.query(cpf=CPF_A)] == [
+        "2026-03-01"
+    ]
+
+
+def test_compaction_groups_rows_and_keeps_results(log: LimitRequestLog) -> None:
+    before = log.query()
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    assert log.compact(now=now) == ["2026-01", "2026-02"]
+    assert log.compact(now=now) == []
+
+    lines = (log.directory / "solicitacoes_2026-01.csv").read_text().splitlines()
+    assert [line[:11] for line in lines] == [CPF_A, CPF_A, CPF_B]
+    assert log.query() == before
+    assert LimitRequestLog(log.directory).query(cpf=CPF_A) == log.query(cpf=CPF_A)
+
+
+@pytest.mark.asyncio
+async def test_csv_service_migrates_and_queries_segmented_log(
+    isolated_settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from src.config import get_settings
+    from src.services.csv_service import CSVService
+
+    isolated_settings.limit_requests_csv_path.write_text(
+        "cpf_cliente,data_hora_solicitacao,limite_atual,novo_limite_solicitado,status_pedido\n"
+        f"{CPF_A},2026-01-10T10:00:00+00:00,5000.0,8000.0,denied\n"
+    )
+    monkeypatch.setenv("LIMIT_REQUEST_LOG_SEGMENTED", "true")
+    get_settings.cache_clear()
+
+    service = CSVService()
+    await service.append_limit_request(_row(CPF_A, "2026-02-10T10:00:00+00:00"))
+    history = await service.query_limit_requests(cpf=CPF_A)
+
+    assert [r.status_pedido for r in history] == ["denied", "approved"]
+    assert (get_settings().limit_requests_log_dir / "solicitacoes_2026-01.idx").exists()
+
+
+@pytest.mark.asyncio
+async def test_csv_service_queries_single_file_log(isolated_settings) -> None:
+    from src.services.csv_service import CSVService
+
+    service = CSVService()
+    await service.append_limit_request(_row(CPF_A, "2026-01-10T10:00:00+00:00"))
+    await service.append_limit_request(_row(CPF_B, "2026-01-11T10:00:00+00:00"))
+
+    history = await service.query_limit_requests(cpf=CPF_B)
+    assert [r.cpf_cliente for r in history] == [CPF_B]
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_segment_maintenance(
+    isolated_settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import asyncio
+
+    from src.api.dependencies import get_csv_service
+    from src.config import get_settings
+    from src.main import app
+    from src.services.csv_service import CSVService
+
+    calls = []
+
+    async def maintain(self):
+        calls.append(self)
+        return {"removed": [], "compacted": []}
+
+    monkeypatch.setattr(CSVService, "maintain_limit_requests", maintain)
+    monkeypatch.setenv("LIMIT_REQUEST_LOG_SEGMENTED", "true")
+    monkeypatch.setenv("LIMIT_REQUEST_MAINTENANCE_INTERVAL_SECONDS", "0.01")
+    get_settings.cache_clear()
+
+    async with app.router.lifespan_context(app):
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if len(calls) >= 2:
+                break
+
+    assert len(calls) >= 2
+    assert calls[0] is get_csv_service()
@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+
+from src.config import Settings
+from src.services.llm_service import LLMService
+
+
+@pytest.fixture
+def llm_service() -> LLMService:
+    service = LLMService()
+    service._settings = Settings(
+        use_langchain=True,
+        openai_api_key="test-key",
+        intent_rule_confidence=2,
+        intent_llm_timeout_seconds=0.05,
+    )
+    return service
+
+
+@pytest.mark.asyncio
+async def test_confident_rule_skips_llm(llm_service: LLMService, monkeypatch) -> None:
+    finished = asyncio.Event()
+
+    async def slow_llm(message: str):
+        await asyncio.sleep(10)
+        finished.set()
+        return "other"
+
+    monkeypatch.setattr(llm_service, "_classify_with_langchain", slow_llm)
+
+    intent = await asyncio.wait_for(
+        llm_service.classify_intent("qual a cotação do dólar?"), timeout=1
+    )
+    assert intent == "exchange_rate"
+
+    await asyncio.sleep(0.01)
+    assert not finished.is_set()
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_rule_waits_for_llm(llm_service: LLMService, monkeypatch) -> None:
+    async def llm(message: str):
+        return "interview"
+
+    monkeypatch.setattr(llm_service, "_classify_with_langchain", llm)
+
+    intent = await llm_service.classify_intent("quero ver meu perfil")
+    assert intent == "interview"
+
+    intent = await llm_service.classify_intent("me ajuda com algo")
+    assert intent == "interview"
+
+
+@pytest.mark.asyncio
+async def test_llm_deadline_falls_back_to_rules(
+    llm_service: LLMService, monkeypatch
+) -> None:
+    started = asyncio.Event()
+
+    async def slow_llm(message: str):
+        started.set()
+        await asyncio.sleep(10)
+        return "exchange_rate"
+
+    monkeypatch.setattr(llm_service, "_classify_with_langchain", slow_llm)
+    assert llm_service._confident_intent(llm_service._score_intents("saldo")) is None
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    intent = await llm_service.classify_intent("saldo")
+
+    assert intent == "credit_limit"
+    assert started.is_set()
+    assert loop.time() - start >= llm_service._settings.intent_llm_timeout_seconds
+
+
+def test_overlapping_keywords_count_once(llm_service: LLMService) -> None:
+    assert llm_service._score_intents("limite")["credit_limit"] == 1
+    assert llm_service._score_intents("meu limite")["credit_limit"] == 1
+    assert llm_service._score_intents("meu limite e saldo")["credit_limit"] == 2
+
+
+@pytest.mark.asyncio
+async def test_rules_only_without_langchain() -> None:
+    service = LLMService()
+    service._settings = Settings(use_langchain=False)
+
+    assert await service.classify_intent("quero aumentar meu limite") == "request_increase"
+    assert await service.classify_intent("") is None
+
+
+@pytest.mark.asyncio
+async def test_invoke_records_token_usage(
+    llm_service: LLMService, monkeypatch, tmp_path
+) -> None:
+    from types import SimpleNamespace
+
+    from src.utils.request_context import current_endpoint, current_state
+    from src.utils.token_monitor import TokenMonitor
+
+    monitor = TokenMonitor(usage_file=str(tmp_path / "token_usage.json"))
+    monkeypatch.setattr("src.services.llm_service.token_monitor", monitor)
+
+    class FakeChain:
+        async def ainvoke(self, inputs):
+            return SimpleNamespace(
+                content="credit_limit",
+                usage_metadata={"input_tokens": 12, "output_tokens": 3},
+            )
+
+    current_endpoint.set("/api/unified/chat")
+    current_state.set("authenticated")
+    await llm_service._invoke(FakeChain(), {"message": "limite"}, "intent")
+
+    breakdown = monitor.get_summary()["breakdown"]
+    for dimension, key in [
+        ("by_prompt", "intent"),
+        ("by_state", "authenticated"),
+        ("by_endpoint", "/api/unified/chat"),
+    ]:
+        bucket = breakdown[dimension][key]
+        assert bucket["calls"] == 1
+        assert bucket["input_tokens"] == 12
+        assert bucket["output_tokens"] == 3
+        assert bucket["cost"] > 0
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_timeout_and_shedding() -> None:
+    from src.services.llm_admission import AdmissionController, LLMSaturatedError
+
+    admission = AdmissionController(
+        max_concurrent=1, max_queue=1, queue_timeout_seconds=0.05
+    )
+    await admission.acquire("intent")
+    assert admission.in_flight == 1
+
+    waiter = asyncio.create_task(admission.acquire("intent"))
+    await asyncio.sleep(0)
+    assert admission.queue_depth == 1
+    assert admission.saturated()
+
+    with pytest.raises(LLMSaturatedError) as shed:
+        await admission.acquire("intent")
+    assert shed.value.reason == "queue_full"
+
+    with pytest.raises(LLMSaturatedError) as timed_out:
+        await waiter
+    assert timed_out.value.reason == "queue_timeout"
+    assert admission.queue_depth == 0
+
+    queued = asyncio.create_task(admission.acquire("intent"))
+    await asyncio.sleep(0)
+    admission.release()
+    await queued
+    assert admission.in_flight == 1
+    admission.release()
+    assert admission.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_saturated_llm_degrades_to_rules(llm_service: LLMService) -> None:
+    from src.services.llm_admission import AdmissionController
+
+    release = asyncio.Event()
+
+    class SlowChain:
+        async def ainvoke(self, inputs):
+            await release.wait()
+            return "ok"
+
+    llm_service._admission = AdmissionController(
+        max_concurrent=1, max_queue=1, queue_timeout_seconds=5
+    )
+    running = asyncio.create_task(llm_service._invoke(SlowChain(), {}, "humanize"))
+    queued = asyncio.create_task(llm_service._invoke(SlowChain(), {}, "humanize"))
+    await asyncio.sleep(0)
+    assert llm_service._admission.saturated()
+
+    async def unexpected(*args):
+        raise AssertionError("LLM path should be skipped while saturated")
+
+    llm_service._humanize_with_langchain = unexpected
+    llm_service._classify_with_langchain = unexpected
+
+    reply = await asyncio.wait_for(
+        llm_service.humanize_response("oi", "Seu limite é R$ 5.000,00", None, "Ana"),
+        timeout=0.5,
+    )
+    assert "R$ 5.000,00" in reply
+    assert await llm_service.classify_intent("me ajuda com algo") is None
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert llm_service._admission.in_flight == 0
@@ -0,0 +1,118 @@
+import re
+
+import pytest
+from httpx import AsyncClient
+
+from src.utils.metrics import (
+    MetricsRegistry,
+    rate_limit_rejections,
+    record_cache,
+)
+from src.utils.metrics import registry as default_registry
+
+_SAMPLE = re.compile(r"([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})? (\S+)")
+_SUFFIXES = {"counter": ("",), "gauge": ("",), "histogram": ("_bucket", "_sum", "_count")}
+
+
+def _parse_exposition(text: str) -> dict[str, str]:
+    """Valida o formato texto do Prometheus e devolve amostra -> tipo declarado"""
+    types: dict[str, str] = {}
+    helped: set[str] = set()
+    samples: dict[str, str] = {}
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            helped.add(line.split(" ")[2])
+        elif line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name in helped, f"TYPE without HELP for {name}"
+            assert name not in types, f"{name} declared twice"
+            types[name] = kind
+        else:
+            match = _SAMPLE.fullmatch(line)
+            assert match, f"malformed sample: {line!r}"
+            sample = match.group(1)
+            family = next(
+                (
+                    name
+                    for name, kind in types.items()
+                    for suffix in _SUFFIXES[kind]
+                    if sample == name + suffix
+                ),
+                None,
+            )
+            assert family is not None, f"{sample} has no matching TYPE line"
+            float(match.group(3))
+            samples[sample] = types[family]
+    return samples
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)
+    )
+    histogram.labels("/a").observe(0.05)
+    histogram.labels("/a").observe(0.5)
+    histogram.labels("/a").observe(5)
+
+    output = registry.render()
+    assert '# TYPE latency_seconds histogram' in output
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in output
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+    assert 'latency_seconds_count{route="/a"} 3' in output
+
+
+def test_counter_and_callback_gauge() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("lookups", "Lookups", ("result",))
+    counter.labels("hit").inc()
+    counter.labels("hit").inc()
+    gauge = registry.gauge("sessions", "Sessions", ("agent",))
+    gauge.set_function(lambda: {("chat",): 7})
+
+    output = registry.render()
+    assert "# TYPE lookups_total counter" in output
+    assert 'lookups_total{result="hit"} 2' in output
+    assert 'sessions{agent="chat"} 7' in output
+
+
+def test_exposition_names_match_type_lines() -> None:
+    registry = MetricsRegistry()
+    registry.counter("lookups", "Lookups", ("result",)).labels("hit").inc()
+    registry.counter("errors_total", "Errors").inc()
+    registry.gauge("sessions", "Sessions").set(3)
+    registry.histogram("latency_seconds", "Latency", buckets=(0.1,)).observe(0.05)
+
+    samples = _parse_exposition(registry.render())
+
+    assert samples == {
+        "lookups_total": "counter",
+        "errors_total": "counter",
+        "sessions": "gauge",
+        "latency_seconds_bucket": "histogram",
+        "latency_seconds_sum": "histogram",
+        "latency_seconds_count": "histogram",
+    }
+
+
+def test_default_registry_exposition_is_consistent() -> None:
+    record_cache("client", hit=True)
+    rate_limit_rejections.labels("chat", "ip").inc(0)
+
+    samples = _parse_exposition(default_registry.render())
+
+    assert samples["cache_requests_total"] == "counter"
+    assert samples["rate_limit_rejections_total"] == "counter"
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_routes(client: AsyncClient) -> None:
+    await client.post("/unified/init")
+
+    response = await client.get("http://test/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'route="/api/unified/init"' in body
+    assert 'active_sessions{agent="orchestrator"}' in body
@@ -19,6 +19,7 @@ from src.utils.value_extractor import (
     extract_integer,
     extract_employment_type,
     extract_currency_code,
+    extract_interview_slots,
 )
 from src.services.llm_service import NaturalLanguageParser
 
@@ -230,6 +231,51 @@ class TestValueExtractor:
         assert extract_currency_code("não sei") is None
         assert extract_currency_code("moeda") is None
 
+    def test_extract_interview_slots_all_in_one_message(self):
+        slots = extract_interview_slots(
+            "ganho 5k, sou CLT, gasto 2 mil, 2 filhos, sem dívidas"
+        )
+        assert slots == {
+            "renda_mensal": 5000.0,
+            "tipo_emprego": "CLT",
+            "despesas": 2000.0,
+            "num_dependentes": 2,
+            "tem_dividas": False,
+        }
+
+    def test_extract_interview_slots_partial(self):
+        assert extract_interview_slots(
+            "Minha renda é R$ 5.000,00; trabalho como autônomo e tenho 1 filho"
+        ) == {"renda_mensal": 5000.0, "tipo_emprego": "AUTONOMO", "num_dependentes": 1}
+        assert extract_interview_slots("ganho 5 mil e meio e gasto 3 mil") == {
+            "renda_mensal": 5500.0,
+            "despesas": 3000.0,
+        }
+        assert extract_interview_slots("devo o financiamento do carro") == {
+            "tem_dividas": True
+        }
+
+    def test_extract_interview_slots_mixed_and_ambiguous(self):
+        assert extract_interview_slots("ganho 5 mil com 2 filhos") == {
+            "renda_mensal": 5000.0,
+            "num_dependentes": 2,
+        }
+        assert extract_interview_slots("ganho 5k mas devo 10 mil no cartão") == {
+            "renda_mensal": 5000.0,
+            "tem_dividas": True,
+        }
+        # Duas palavras-chave na mesma oração: nada é preenchido
+        assert extract_interview_slots("5 mil de renda 2 filhos") == {}
+
+    def test_extract_interview_slots_colloquial_denials(self):
+        for message in ["devo nada", "não devo nada", "devo nenhum centavo"]:
+            assert extract_interview_slots(message) == {"tem_dividas": False}
+
+    def test_extract_interview_slots_requires_cue(self):
+        assert extract_interview_slots("5000") == {}
+        assert extract_interview_slots("não") == {}
+        assert extract_interview_slots("") == {}
+
 
 class TestNaturalLanguageParser:
     """Testes para a classe NaturalLanguageParser."""
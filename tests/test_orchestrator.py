@@ -1,6 +1,13 @@
+import asyncio
+import gc
+import random
+
 import pytest
 from httpx import AsyncClient
 
+from src.agents.orchestrator import Orchestrator, OrchestratorState, Transition
+from src.models.schemas import UnifiedChatRequest
+
 
 @pytest.mark.asyncio
 async def test_unified_init_session(client: AsyncClient) -> None:
@@ -618,3 +625,343 @@ async def test_unified_second_client(client: AsyncClient) -> None:
     assert response.status_code == 200
     data = response.json()
     assert data["authenticated"] is True
+
+
+@pytest.mark.asyncio
+async def test_client_snapshot_reused_across_turns(isolated_settings, monkeypatch) -> None:
+    from src.agents.orchestrator import Orchestrator
+    from src.models.schemas import UnifiedChatRequest
+    from src.services.csv_service import CSVService
+
+    orchestrator = Orchestrator()
+    init = await orchestrator.init_session()
+    session_id = init.session_id
+
+    calls = {"clients": 0, "limits": 0}
+    original_get_client = CSVService.get_client_by_cpf
+    original_read_limits = CSVService.read_score_limits
+
+    async def counting_get_client(self, cpf):
+        calls["clients"] += 1
+        return await original_get_client(self, cpf)
+
+    async def counting_read_limits(self):
+        calls["limits"] += 1
+        return await original_read_limits(self)
+
+    monkeypatch.setattr(CSVService, "get_client_by_cpf", counting_get_client)
+    monkeypatch.setattr(CSVService, "read_score_limits", counting_read_limits)
+
+    for message in ["12345678901", "15/05/1990", "qual meu limite"]:
+        response = await orchestrator.process_message(
+            UnifiedChatRequest(session_id=session_id, message=message)
+        )
+
+    assert "R$ 15.000,00" in response.message
+    assert calls == {"clients": 1, "limits": 1}
+
+
+@pytest.mark.asyncio
+async def test_client_snapshot_consumes_unawaited_limit_errors(caplog) -> None:
+    import asyncio
+    import gc
+
+    from src.models.domain import Client
+    from src.services.client_snapshot import ClientSnapshot
+
+    class FailingScoreService:
+        async def get_limit_for_score(self, score: int) -> float:
+            raise OSError("score_limite.csv indisponível")
+
+    unhandled = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+    try:
+        client = Client("12345678901", "Maria Silva", "1990-05-15", 750, 15000.0)
+        snapshot = ClientSnapshot(client, FailingScoreService())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        del snapshot
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+
+    assert unhandled == []
+    assert "Background limit lookup failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_score_update_invalidates_session_snapshot(isolated_settings) -> None:
+    from src.agents.orchestrator import Orchestrator
+    from src.models.schemas import UnifiedChatRequest
+
+    orchestrator = Orchestrator()
+    session_id = (await orchestrator.init_session()).session_id
+    for message in ["12345678901", "15/05/1990"]:
+        await orchestrator.process_message(
+            UnifiedChatRequest(session_id=session_id, message=message)
+        )
+    stale = orchestrator._sessions[session_id].client_snapshot
+
+    await orchestrator._csv_service.update_client_score("12345678901", 850)
+    response = await orchestrator.process_message(
+        UnifiedChatRequest(session_id=session_id, message="qual meu limite?")
+    )
+
+    snapshot = orchestrator._sessions[session_id].client_snapshot
+    assert snapshot is not stale
+    assert snapshot.client.score == 850
+    assert "R$ 25.000,00" in response.message
+
+
+def test_dependency_container_shares_services() -> None:
+    from src.api import dependencies
+
+    orchestrator = dependencies.get_orchestrator()
+
+    assert orchestrator is dependencies.get_orchestrator()
+    assert orchestrator._credit_agent is dependencies.get_credit_agent()
+    assert orchestrator._csv_service is dependencies.get_csv_service()
+    assert orchestrator._llm_service is dependencies.get_chat_agent()._llm_service
+    assert dependencies.get_score_service()._csv_service is orchestrator._csv_service
+
+
+def test_session_is_slotted_with_bounded_history(isolated_settings) -> None:
+    from src.agents.orchestrator import OrchestratorSession
+    from src.models.domain import ConversationMessage, MessageRole
+
+    session = OrchestratorSession()
+    assert not hasattr(session, "__dict__")
+
+    limit = isolated_settings.conversation_history_limit
+    for turn in range(limit + 5):
+        session.conversation_history.append(
+            ConversationMessage(MessageRole.USER, f"mensagem {turn}")
+        )
+
+    assert len(session.conversation_history) == limit
+    assert session.conversation_history[0].content == "mensagem 5"
+
+
+def test_transition_table_covers_conversation_states() -> None:
+    from src.agents.orchestrator import TRANSITIONS, OrchestratorState
+
+    unrouted = {OrchestratorState.WELCOME, OrchestratorState.GOODBYE}
+    assert set(TRANSITIONS) == set(OrchestratorState) - unrouted
+
+    for transition in TRANSITIONS.values():
+        if transition.extractor is not None:
+            assert transition.slot and transition.retry
+            assert (transition.next_state is None) != (transition.complete is None)
+
+
+@pytest.mark.asyncio
+async def test_registered_transition_is_dispatched(isolated_settings) -> None:
+    from src.agents.orchestrator import Orchestrator, OrchestratorState, Transition
+
+    async def statement(orchestrator, session_id, session, message):
+        return orchestrator._build_response(
+            session_id, session, f"Extrato de {message}", authenticated=True
+        )
+
+    orchestrator = Orchestrator()
+    orchestrator.register_transition(OrchestratorState.GOODBYE, Transition(statement))
+    session = orchestrator._get_session("session-1")
+    session.state = OrchestratorState.GOODBYE
+
+    response = await orchestrator._dispatch_state("session-1", session, "abril")
+
+    assert response.message == "Extrato de abril"
+
+
+async def _start_interview(orchestrator) -> str:
+    from src.models.schemas import UnifiedChatRequest
+
+    session_id = (await orchestrator.init_session()).session_id
+    for message in ["12345678901", "15/05/1990", "quero atualizar meu perfil"]:
+        await orchestrator.process_message(
+            UnifiedChatRequest(session_id=session_id, message=message)
+        )
+    return session_id
+
+
+@pytest.mark.asyncio
+async def test_interview_single_message_fills_all_slots(isolated_settings) -> None:
+    from src.agents.orchestrator import Orchestrator
+    from src.models.schemas import UnifiedChatRequest
+
+    orchestrator = Orchestrator()
+    session_id = await _start_interview(orchestrator)
+
+    response = await orchestrator.process_message(
+        UnifiedChatRequest(
+            session_id=session_id,
+            message="ganho 5k, sou CLT, gasto 2 mil, 2 filhos, sem dívidas",
+        )
+    )
+
+    assert "Entrevista concluída" in response.message
+    assert response.state == "authenticated"
+
+
+@pytest.mark.asyncio
+async def test_interview_skips_satisfied_states(isolated_settings) -> None:
+    from src.agents.orchestrator import Orchestrator
+    from src.models.schemas import UnifiedChatRequest
+
+    orchestrator = Orchestrator()
+    session_id = await _start_interview(orchestrator)
+
+    states = []
+    for message in ["ganho 8 mil e tenho 1 filho", "autônomo", "3000"]:
+        response = await orchestrator.process_message(
+            UnifiedChatRequest(session_id=session_id, message=message)
+        )
+        states.append(response.state)
+
+    assert states == ["interview_employment", "interview_expenses", "interview_debts"]
+
+
+@pytest.mark.asyncio
+async def test_interview_keeps_current_slot_when_other_slot_is_filled(
+    isolated_settings,
+) -> None:
+    from src.agents.orchestrator import Orchestrator
+    from src.models.schemas import UnifiedChatRequest
+
+    orchestrator = Orchestrator()
+    session_id = await _start_interview(orchestrator)
+
+    response = await orchestrator.process_message(
+        UnifiedChatRequest(
+            session_id=session_id, message="ganho 5k mas devo 10 mil no cartão"
+        )
+    )
+
+    session = orchestrator._sessions[session_id]
+    assert session.collected_data == {"renda_mensal": 5000.0, "tem_dividas": True}
+    assert response.state == "interview_employment"
+
+
+@pytest.mark.asyncio
+async def test_interview_ambiguous_clause_does_not_skip_questions(
+    isolated_settings,
+) -> None:
+    from src.agents.orchestrator import Orchestrator
+    from src.models.schemas import UnifiedChatRequest
+
+    orchestrator = Orchestrator()
+    session_id = await _start_interview(orchestrator)
+
+    states = []
+    for message in ["5 mil de renda 2 filhos", "CLT", "2000"]:
+        response = await orchestrator.process_message(
+            UnifiedChatRequest(session_id=session_id, message=message)
+        )
+        states.append(response.state)
+
+    assert states == [
+        "interview_employment",
+        "interview_expenses",
+        "interview_dependents",
+    ]
+    assert orchestrator._sessions[session_id].collected_data["renda_mensal"] == 5000.0
+
+
+@pytest.mark.asyncio
+async def test_unified_chat_batch_endpoint(client: AsyncClient) -> None:
+    response = await client.post(
+        "/unified/chat:batch",
+        json={"items": [{"message": "olá"}, {"message": "oi"}]},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == [0, 1]
+    assert results[0]["response"]["session_id"] != results[1]["response"]["session_id"]
+
+    empty = await client.post("/unified/chat:batch", json={"items": []})
+    assert empty.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_sessions_concurrently_in_order(isolated_settings) -> None:
+    seen: list[tuple[str, str]] = []
+    started = {"a": asyncio.Event(), "b": asyncio.Event()}
+
+    async def wait_for_other_session(orchestrator, session_id, session, message):
+        # O turno de uma sessão só termina se o da outra já começou
+        started[session_id].set()
+        other = "b" if session_id == "a" else "a"
+        await asyncio.wait_for(started[other].wait(), timeout=1)
+        seen.append((session_id, message))
+        return orchestrator._build_response(session_id, session, message)
+
+    orchestrator = Orchestrator()
+    orchestrator.register_transition(
+        OrchestratorState.GOODBYE, Transition(wait_for_other_session)
+    )
+    for session_id in ("a", "b"):
+        orchestrator._get_session(session_id).state = OrchestratorState.GOODBYE
+
+    items = [
+        UnifiedChatRequest(session_id=session_id, message=message)
+        for session_id, message in [("a", "1"), ("b", "1"), ("a", "2"), ("b", "2")]
+    ]
+    results = await orchestrator.process_batch(items)
+
+    assert [r.error for r in results] == [None] * 4
+    assert [(r.response.session_id, r.response.message) for r in results] == [
+        ("a", "1"),
+        ("b", "1"),
+        ("a", "2"),
+        ("b", "2"),
+    ]
+    assert [m for s, m in seen if s == "a"] == ["1", "2"]
+    assert [m for s, m in seen if s == "b"] == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_turns_of_a_session_are_serialized(isolated_settings) -> None:
+    events: list[tuple[str, str]] = []
+
+    async def read_modify_write(orchestrator, session_id, session, message):
+        events.append(("enter", session_id))
+        count = session.collected_data.get("turns", 0)
+        await asyncio.sleep(random.uniform(0, 0.002))
+        session.collected_data["turns"] = count + 1
+        events.append(("exit", session_id))
+        return orchestrator._build_response(session_id, session, message)
+
+    orchestrator = Orchestrator()
+    orchestrator.register_transition(
+        OrchestratorState.GOODBYE, Transition(read_modify_write)
+    )
+    sessions = [f"session-{i}" for i in range(10)]
+    for session_id in sessions:
+        orchestrator._get_session(session_id).state = OrchestratorState.GOODBYE
+
+    turns = [
+        UnifiedChatRequest(session_id=session_id, message=str(turn))
+        for turn in range(20)
+        for session_id in sessions
+    ]
+    random.shuffle(turns)
+
+    await asyncio.gather(*(orchestrator.process_message(t) for t in turns))
+
+    active: set[str] = set()
+    max_active = 0
+    for kind, session_id in events:
+        if kind == "enter":
+            assert session_id not in active, f"{session_id} entered twice"
+            active.add(session_id)
+            max_active = max(max_active, len(active))
+        else:
+            active.remove(session_id)
+    for session_id in sessions:
+        assert orchestrator._get_session(session_id).collected_data["turns"] == 20
+    # Sessões distintas continuam rodando em paralelo
+    assert max_active > 1
+
+    gc.collect()
+    assert len(orchestrator._session_locks) == 0
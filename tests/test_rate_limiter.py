@@ -0,0 +1,173 @@
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from src.services.rate_limiter import InMemoryBucketStore, RateLimit, RateLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr("src.services.rate_limiter.time.monotonic", clock)
+    return clock
+
+
+def test_parse_rate_limit() -> None:
+    assert RateLimit.parse("30/minute") == RateLimit(30, 0.5)
+    assert RateLimit.parse("5 / second") == RateLimit(5, 5)
+    with pytest.raises(ValueError):
+        RateLimit.parse("30 per minute")
+
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_refills(clock: FakeClock) -> None:
+    store = InMemoryBucketStore()
+    limit = RateLimit.parse("3/minute")
+
+    assert [await store.take("k", limit) for _ in range(3)] == [0, 0, 0]
+    assert await store.take("k", limit) == pytest.approx(20.0)
+
+    clock.now += 20
+    assert await store.take("k", limit) == 0
+    assert await store.take("k", limit) > 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_checks_ip_and_cpf_buckets(clock: FakeClock) -> None:
+    limiter = RateLimiter(InMemoryBucketStore(), {"credit": RateLimit.parse("2/minute")})
+
+    await limiter.check("credit", "10.0.0.1", "12345678901")
+    await limiter.check("credit", "10.0.0.2", "12345678901")
+    with pytest.raises(HTTPException) as exc_info:
+        await limiter.check("credit", "10.0.0.3", "12345678901")
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "30"
+    await limiter.check("credit", "10.0.0.3", "98765432100")
+    await limiter.check("unlimited_route", "10.0.0.3", "12345678901")
+
+
+@pytest.mark.asyncio
+async def test_limiter_charges_cost_to_every_cpf(clock: FakeClock) -> None:
+    limiter = RateLimiter(InMemoryBucketStore(), {"chat": RateLimit.parse("3/minute")})
+
+    await limiter.check("chat", "10.0.0.1", cost=2, cpf_costs={"111": 2})
+    with pytest.raises(HTTPException):
+        await limiter.check("chat", "10.0.0.2", cost=2, cpf_costs={"111": 2})
+    with pytest.raises(HTTPException):
+        await limiter.check("chat", "10.0.0.1", cost=2, cpf_costs={"222": 2})
+
+
+@pytest.mark.asyncio
+async def test_route_answers_429_before_handler(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    limiter = RateLimiter(
+        InMemoryBucketStore(), {"session_init": RateLimit.parse("2/minute")}
+    )
+    monkeypatch.setattr("src.api.dependencies.get_rate_limiter", lambda: limiter)
+
+    statuses = [(await client.post("/unified/init")).status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_charged_per_item(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    limiter = RateLimiter(
+        InMemoryBucketStore(), {"unified_chat": RateLimit.parse("3/minute")}
+    )
+    monkeypatch.setattr("src.api.dependencies.get_rate_limiter", lambda: limiter)
+    items = [{"session_id": "s", "message": "oi"}] * 2
+
+    first = await client.post("/unified/chat:batch", json={"items": items})
+    second = await client.post("/unified/chat:batch", json={"items": items})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_auth_attempts_decay_after_window(
+    isolated_settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from datetime import date
+
+    from src.agents.triagem import TriageAgent
+    from src.models.schemas import AuthRequest
+
+    now = [1000.0]
+    monkeypatch.setattr("src.agents.triagem.time.monotonic", lambda: now[0])
+    agent = TriageAgent()
+    wrong = AuthRequest(cpf="12345678901", birthdate=date(2000, 1, 1))
+
+    for _ in range(isolated_settings.max_auth_attempts):
+        with pytest.raises(HTTPException):
+            await agent.authenticate(wrong)
+    with pytest.raises(HTTPException) as exc_info:
+        await agent.authenticate(wrong)
+    assert exc_info.value.status_code == 429
+
+    now[0] += isolated_settings.auth_attempt_window_seconds
+    with pytest.raises(HTTPException) as exc_info:
+        await agent.authenticate(wrong)
+    assert exc_info.value.detail["remaining_attempts"] == 2
+
+
+def test_auth_attempts_evict_expired_and_oldest(
+    isolated_settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from src.agents.triagem import TriageAgent
+
+    now = [1000.0]
+    monkeypatch.setattr("src.agents.triagem.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(isolated_settings, "auth_attempt_max_keys", 2)
+    agent = TriageAgent()
+
+    agent._record_failure("111")
+    now[0] += isolated_settings.auth_attempt_window_seconds
+    agent._record_failure("222")
+    assert list(agent._failed_attempts) == ["222"]
+
+    agent._record_failure("333")
+    agent._record_failure("444")
+    assert list(agent._failed_attempts) == ["333", "444"]
+
+
+def test_unified_chat_charges_the_session_cpf(
+    isolated_settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import json
+
+    from src.agents.orchestrator import Orchestrator
+    from src.api.dependencies import _session_charges
+
+    orchestrator = Orchestrator()
+    authenticated = orchestrator._get_session("auth")
+    authenticated.cpf, authenticated.token = "12345678901", "token"
+    orchestrator._get_session("anon").cpf = "98765432100"
+    monkeypatch.setattr("src.api.dependencies.get_orchestrator", lambda: orchestrator)
+
+    single = json.dumps({"session_id": "auth", "message": "oi"}).encode()
+    batch = json.dumps(
+        {
+            "items": [
+                {"session_id": sid, "message": "oi"}
+                for sid in ("auth", "auth", "anon", "missing")
+            ]
+        }
+    ).encode()
+
+    assert _session_charges(single) == (1, {"12345678901": 1})
+    assert _session_charges(batch) == (4, {"12345678901": 2})
+    assert "missing" not in orchestrator._sessions
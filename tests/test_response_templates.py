@@ -0,0 +1,73 @@
+import pytest
+from httpx import AsyncClient
+
+from src.api.dependencies import get_chat_agent, get_orchestrator
+from src.models.schemas import ChatResponse, UnifiedChatResponse
+from src.utils.response_templates import MESSAGES, Template, format_brl, render
+
+
+def test_format_brl() -> None:
+    assert format_brl(15000) == "R$ 15.000,00"
+    assert format_brl(1234567.891) == "R$ 1.234.567,89"
+    assert format_brl(0.5) == "R$ 0,50"
+
+
+def test_template_render() -> None:
+    template = Template("Limite: {limit:brl} | score {score} | taxa {rate:.2f} {{ok}}")
+    assert template.fields == {"limit", "score", "rate"}
+    assert (
+        template.render(limit=5000, score=700, rate=5.4321)
+        == "Limite: R$ 5.000,00 | score 700 | taxa 5.43 {ok}"
+    )
+
+    static = Template("Como posso ajudar?")
+    assert static.render() is static.text
+
+    with pytest.raises(ValueError):
+        Template("Olá, {client.nome}")
+
+    assert "R$ 20.000,00" in render("credit.increase_approved", requested_limit=20000)
+
+
+@pytest.mark.asyncio
+async def test_prepared_init_responses_match_models(client: AsyncClient) -> None:
+    response = await client.post("/unified/init")
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    session_id = data["session_id"]
+    session = get_orchestrator()._sessions[session_id]
+    expected = get_orchestrator()._build_response(
+        session_id, session, data["message"]
+    )
+    assert UnifiedChatResponse.model_validate(data) == expected
+
+    response = await client.post("/chat/init")
+    data = response.json()
+    assert data["session_id"] in get_chat_agent()._sessions
+    assert ChatResponse.model_validate(data) == ChatResponse(
+        session_id=data["session_id"],
+        message=MESSAGES["chat.welcome"].text,
+        state="collecting_data",
+    )
+
+
+def test_default_response_class_selection(monkeypatch) -> None:
+    from fastapi.datastructures import DefaultPlaceholder
+
+    from src.api import responses
+    from src.config import Settings
+
+    monkeypatch.setattr(responses, "NATIVE_JSON_SERIALIZATION", False)
+    if responses.orjson is not None:
+        assert (
+            responses.default_response_class(Settings())
+            is responses.FastJSONResponse
+        )
+        body = responses.FastJSONResponse({"mensagem": "Olá", "valor": 1.5}).body
+        assert body == '{"mensagem":"Olá","valor":1.5}'.encode()
+
+    disabled = responses.default_response_class(Settings(fast_json_enabled=False))
+    assert isinstance(disabled, DefaultPlaceholder)
+
+    monkeypatch.setattr(responses, "NATIVE_JSON_SERIALIZATION", True)
+    assert isinstance(responses.default_response_class(Settings()), DefaultPlaceholder)
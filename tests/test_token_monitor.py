@@ -0,0 +1,88 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils.token_monitor import TokenMonitor
+
+
+@pytest.fixture
+def monitor(tmp_path: Path) -> TokenMonitor:
+    return TokenMonitor(usage_file=str(tmp_path / "token_usage.json"))
+
+
+def test_tracking_does_not_touch_disk(monitor: TokenMonitor) -> None:
+    monitor.track_cache_hit()
+    monitor.track_ai_call(input_tokens=100, output_tokens=20)
+
+    assert not monitor.shard_file.exists()
+    assert monitor.get_summary()["cache_hits"] == 1
+
+
+def test_flush_writes_process_shard(monitor: TokenMonitor) -> None:
+    monitor.track_cache_hit()
+    monitor.flush()
+
+    data = json.loads(monitor.shard_file.read_text())
+    assert data["cache_hits"] == 1
+    assert list(monitor.shard_file.parent.glob("*.tmp")) == []
+
+
+def test_summary_merges_other_shards(monitor: TokenMonitor) -> None:
+    other = monitor.usage_file.with_name("token_usage.99999.json")
+    other.write_text(json.dumps({"total_spent": 1.5, "ai_calls": 3, "cache_hits": 2}))
+    monitor.usage_file.write_text(json.dumps({"total_spent": 0.5, "cache_hits": 1}))
+
+    monitor.track_cache_hit()
+    summary = monitor.get_summary()
+
+    assert summary["cache_hits"] == 4
+    assert summary["ai_calls"] == 3
+    assert summary["spent"] == pytest.approx(2.0)
+
+
+def test_dead_process_shards_are_compacted(tmp_path: Path) -> None:
+    import os
+
+    live = tmp_path / f"token_usage.{os.getppid()}.json"
+    live.write_text(json.dumps({"ai_calls": 1}))
+    dead = tmp_path / "token_usage.99999999.json"
+    dead.write_text(json.dumps({"ai_calls": 2, "total_spent": 1.0}))
+    (tmp_path / "token_usage.json").write_text(json.dumps({"ai_calls": 4}))
+
+    monitor = TokenMonitor(usage_file=str(tmp_path / "token_usage.json"))
+
+    assert not dead.exists()
+    assert live.exists()
+    assert json.loads(monitor.usage_file.read_text())["ai_calls"] == 6
+    assert monitor.get_summary()["ai_calls"] == 7
+
+
+def test_default_usage_file_is_under_data_dir(isolated_settings) -> None:
+    monitor = TokenMonitor()
+    assert monitor.usage_file == isolated_settings.data_dir / "token_usage.json"
+    assert monitor.shard_file.parent == isolated_settings.data_dir
+
+
+@pytest.mark.asyncio
+async def test_background_flusher_flushes_every_n_events(
+    monitor: TokenMonitor,
+) -> None:
+    monitor._flush_every = 3
+    monitor._flush_interval = 60
+    monitor.start()
+
+    for _ in range(3):
+        monitor.track_cache_hit()
+
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if monitor.shard_file.exists():
+            break
+
+    assert json.loads(monitor.shard_file.read_text())["cache_hits"] == 3
+
+    monitor.track_cache_hit()
+    await monitor.stop()
+    assert json.loads(monitor.shard_file.read_text())["cache_hits"] == 4
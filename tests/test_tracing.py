@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from src.utils.tracing import end_trace, export_trace, span, start_trace, traced
+
+
+@traced("inner.work")
+async def _inner_work() -> str:
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_under_current_span() -> None:
+    trace, token = start_trace("test")
+    try:
+        with span("outer", state="inicio"):
+            assert await _inner_work() == "ok"
+        with span("sibling"):
+            pass
+    finally:
+        end_trace(token)
+
+    outer, inner, sibling = trace.spans
+    assert outer.parent_id is None
+    assert inner.name == "inner.work" and inner.parent_id == outer.span_id
+    assert sibling.parent_id is None
+    assert outer.attributes == {"state": "inicio"}
+    assert all(s.end is not None for s in trace.spans)
+
+
+def test_span_without_trace_is_noop() -> None:
+    with span("orphan") as current:
+        assert current is None
+
+
+def test_export_trace_appends_jsonl(tmp_path: Path) -> None:
+    trace, token = start_trace("export")
+    with span("step"):
+        pass
+    end_trace(token)
+
+    path = tmp_path / "traces.jsonl"
+    export_trace(trace, path)
+    export_trace(trace, path)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[0])
+    assert record["trace_id"] == trace.trace_id
+    assert record["spans"][0]["name"] == "step"
+
+
+@pytest.mark.asyncio
+async def test_debug_header_returns_server_timing(client: AsyncClient) -> None:
+    init = await client.post("/unified/init")
+    session_id = init.json()["session_id"]
+
+    response = await client.post(
+        "/unified/chat",
+        json={"session_id": session_id, "message": "12345678901"},
+        headers={"X-Debug-Trace": "1"},
+    )
+    assert response.status_code == 200
+    assert response.headers["x-trace-id"]
+    assert "orchestrator_route_message_0;dur=" in response.headers["server-timing"]
+
+
+@pytest.mark.asyncio
+async def test_no_trace_headers_by_default(client: AsyncClient) -> None:
+    response = await client.post("/unified/init")
+    assert "server-timing" not in response.headers